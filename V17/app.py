@@ -1,5 +1,5 @@
 from flask import Flask, render_template, jsonify, request, send_file
-from flask_socketio import SocketIO, emit
+from flask_socketio import SocketIO, emit, join_room, leave_room
 from flask_cors import CORS
 import random
 from datetime import datetime, timedelta
@@ -11,7 +11,10 @@ import pandas as pd
 import logging
 from trading_engine.indicators import Indicators
 from trading_engine.exchange_connector import exchange_manager
-from realtime_streamer import RealtimeStreamer
+from realtime_streamer import RealtimeStreamer, candle_room
+from data_store import ProcessedDataStore
+from trading_engine.timeframe_resampler import TimeframePyramid, resample_data
+from result_cache import BacktestResultCache
 import numpy as np
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
@@ -58,6 +61,12 @@ socketio = SocketIO(app, cors_allowed_origins="*", max_http_buffer_size=100 * 10
 # Initialize real-time streamer
 realtime_streamer = RealtimeStreamer(socketio, exchange_manager)
 
+# Binary columnar cache of parsed uploads (uploads/processed/<name>_tz<offset>/)
+processed_store = ProcessedDataStore(os.path.join(app.config['UPLOAD_FOLDER'], 'processed'))
+
+# /run_backtest responses keyed by dataset/strategy contents and run parameters (uploads/results/)
+backtest_cache = BacktestResultCache(os.path.join(app.config['UPLOAD_FOLDER'], 'results'))
+
 # Mock data storage
 positions = []
 orders = []
@@ -90,6 +99,117 @@ def generate_ohlc_data(days=1):
     
     return data
 
+# Standard OHLCV columns returned by parse_csv_data
+CANDLE_COLUMNS = ['time', 'open', 'high', 'low', 'close', 'volume']
+
+# Encodings tried when reading uploaded CSV files
+CSV_ENCODINGS = ['utf-8', 'utf-8-sig', 'latin1', 'cp1252']
+
+# Column mapping (flexible, case-insensitive)
+CSV_COLUMN_MAPPING = {
+    'ticker': ['ticker', 'symbol', 'code', 'stock'],
+    'date': ['date', 'ngay', 'datetime'],
+    'time': ['time', 'gio', 'hour'],
+    'open': ['open', 'o', 'mo', 'mo_cua'],
+    'high': ['high', 'h', 'cao', 'cao_nhat'],
+    'low': ['low', 'l', 'thap', 'thap_nhat'],
+    'close': ['close', 'c', 'dong', 'dong_cua'],
+    'volume': ['volume', 'vol', 'v', 'klgd', 'kl']
+}
+
+# Explicit datetime formats tried before falling back to pandas inference
+CSV_DATETIME_FORMATS = {
+    'Python (YYYY-MM-DD)': ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M'],
+    'AmiBroker (DD/MM/YYYY)': ['%d/%m/%Y %H:%M:%S', '%d/%m/%Y %H:%M']
+}
+
+
+def _match_csv_columns(columns):
+    """
+    Match normalized CSV columns to standard names
+
+    Returns:
+        (matched_cols, missing_cols)
+    """
+    matched_cols = {}
+    missing_cols = []
+    for standard_name, possible_names in CSV_COLUMN_MAPPING.items():
+        found = False
+        for col in columns:
+            if col in possible_names:
+                matched_cols[standard_name] = col
+                found = True
+                logger.info(f"✅ '{standard_name}' → '{col}'")
+                break
+        if not found:
+            missing_cols.append(standard_name)
+    return matched_cols, missing_cols
+
+
+def _validate_candle_row(open_, high, low, close, volume):
+    """Convert and validate one OHLCV row, raising on invalid values"""
+    open_val = float(open_)
+    high_val = float(high)
+    low_val = float(low)
+    close_val = float(close)
+    volume_val = int(float(volume))
+
+    # Basic validation
+    if high_val < low_val:
+        raise ValueError(f"High ({high_val}) < Low ({low_val})")
+    if volume_val < 0:
+        raise ValueError(f"Volume âm: {volume_val}")
+
+    return open_val, high_val, low_val, close_val, volume_val
+
+
+def _parse_csv_datetime(date_col, time_col, date_sample, time_sample):
+    """
+    Vectorized Date + Time parsing
+
+    Returns:
+        (DatetimeIndex-like Series, format label) or (None, None) for unsupported formats
+    """
+    text = date_col + ' ' + time_col
+    if '-' in date_sample:
+        label, dayfirst = 'Python (YYYY-MM-DD)', False
+    elif '/' in date_sample:
+        label, dayfirst = 'AmiBroker (DD/MM/YYYY)', True
+    else:
+        return None, None
+
+    sample = f"{date_sample} {time_sample}"
+    for fmt in CSV_DATETIME_FORMATS[label]:
+        try:
+            datetime.strptime(sample, fmt)
+        except ValueError:
+            continue
+        try:
+            return pd.to_datetime(text, format=fmt), label
+        except ValueError:
+            break
+
+    return pd.to_datetime(text, dayfirst=dayfirst), label
+
+
+def candles_from_columns(columns):
+    """Convert parse_csv_data column arrays to a list of candle dicts (JSON/chart format)"""
+    values = [np.asarray(columns[key]).tolist() for key in CANDLE_COLUMNS]
+    return [dict(zip(CANDLE_COLUMNS, row)) for row in zip(*values)]
+
+
+def columns_from_candles(candles):
+    """Convert a list of candle dicts to parse_csv_data column arrays"""
+    return {
+        'time': np.array([c['time'] for c in candles], dtype=np.int64),
+        'open': np.array([c['open'] for c in candles], dtype=np.float64),
+        'high': np.array([c['high'] for c in candles], dtype=np.float64),
+        'low': np.array([c['low'] for c in candles], dtype=np.float64),
+        'close': np.array([c['close'] for c in candles], dtype=np.float64),
+        'volume': np.array([c['volume'] for c in candles], dtype=np.int64)
+    }
+
+
 def parse_csv_data(filepath, timezone_offset=0):
     """
     Parse CSV file and auto-detect format
@@ -97,8 +217,297 @@ def parse_csv_data(filepath, timezone_offset=0):
     1. Python format: Ticker,Date,Time,Open,High,Low,Close,Volume (YYYY-MM-DD)
     2. AmiBroker format: Ticker,Date,Open,High,Low,Close,Volume,Time (DD/MM/YYYY)
     
+    Flexible column matching (case-insensitive). The file is read column-wise
+    with explicit dtypes and validated with array operations; the row-by-row
+    parser is only used when column detection fails.
+    
+    Args:
+        filepath: Path to CSV file
+        timezone_offset: Timezone offset in hours (e.g. +7 for Vietnam)
+    
+    Returns:
+        {'success': True, 'columns': {time, open, high, low, close, volume arrays}, 'info': {...}}
+        or {'success': False, 'error': str, 'debug_info': {...}}
+    """
+    debug_info = {}
+    try:
+        logger.info(f"📂 Parsing CSV: {filepath} (timezone: {timezone_offset:+d}h)")
+        
+        df = None
+        for encoding in CSV_ENCODINGS:
+            try:
+                # Detect columns from the first rows only
+                head = pd.read_csv(filepath, encoding=encoding, nrows=3)
+                normalized = [str(col).strip().lower() for col in head.columns]
+                matched_cols, missing_cols = _match_csv_columns(normalized)
+                if missing_cols:
+                    break
+                
+                df = _read_csv_columns(filepath, encoding, head.columns, normalized, matched_cols)
+                debug_info['encoding'] = encoding
+                debug_info['original_columns'] = list(head.columns)
+                debug_info['normalized_columns'] = normalized
+                debug_info['first_rows'] = head.set_axis(normalized, axis=1).to_dict('records')
+                debug_info['matched_columns'] = matched_cols
+                debug_info['missing_columns'] = []
+                logger.info(f"✅ Read {len(df)} rows with encoding: {encoding}")
+                break
+            except UnicodeDecodeError:
+                continue
+        
+        if df is None:
+            logger.warning("⚠️ Column detection failed, using row-by-row parser")
+            result = _parse_csv_data_rows(filepath, timezone_offset)
+            if result['success']:
+                result['columns'] = columns_from_candles(result.pop('data'))
+            return result
+        
+        return _build_csv_columns(df, debug_info, timezone_offset)
+        
+    except Exception as e:
+        error = f'Parse error: {str(e)}'
+        logger.error(f"❌ {error}")
+        logger.exception(e)  # Full traceback
+        return {'success': False, 'error': error, 'debug_info': debug_info}
+
+
+def _read_csv_columns(filepath, encoding, original_columns, normalized, matched_cols):
+    """
+    Read only the matched columns with explicit dtypes
+
+    Returns:
+        DataFrame with standard column names (Ticker, Date, Time, Open, ...).
+        OHLCV columns are float64, or object when the file has non-numeric cells.
+    """
+    positions = {name: normalized.index(col) for name, col in matched_cols.items()}
+    names = {original_columns[pos]: name.capitalize() for name, pos in positions.items()}
+    text_cols = [original_columns[positions[name]] for name in ('ticker', 'date', 'time')]
+    
+    dtypes = {col: str for col in text_cols}
+    try:
+        df = pd.read_csv(filepath, encoding=encoding, usecols=sorted(positions.values()),
+                         dtype={**dtypes, **{col: np.float64 for col in names if col not in dtypes}})
+    except ValueError:
+        # Non-numeric cells - keep raw text, rows are rejected during validation
+        df = pd.read_csv(filepath, encoding=encoding, usecols=sorted(positions.values()),
+                         dtype={col: object for col in names})
+    
+    return df.rename(columns=names)
+
+
+def _build_csv_columns(df, debug_info, timezone_offset):
+    """Validate, sort and convert a standard-column DataFrame to column arrays"""
+    debug_info['total_rows'] = len(df)
+    
+    if len(df) == 0:
+        return {
+            'success': False, 
+            'error': 'File CSV không có dữ liệu',
+            'debug_info': debug_info
+        }
+    
+    # Clean data - remove rows with NaN values
+    initial_count = len(df)
+    df = df.dropna(subset=['Date', 'Time', 'Open', 'High', 'Low', 'Close', 'Volume'])
+    if len(df) < initial_count:
+        logger.warning(f"⚠️ Removed {initial_count - len(df)} rows with missing data")
+        debug_info['removed_rows'] = initial_count - len(df)
+    
+    if len(df) == 0:
+        return {
+            'success': False, 
+            'error': 'Không có dòng dữ liệu hợp lệ sau khi lọc (tất cả rows có NaN)',
+            'debug_info': debug_info
+        }
+    
+    # Parse datetime
+    date_sample = str(df['Date'].iloc[0]).strip()
+    time_sample = str(df['Time'].iloc[0]).strip()
+    debug_info['date_sample'] = date_sample
+    debug_info['time_sample'] = time_sample
+    logger.info(f"📅 Sample: Date='{date_sample}', Time='{time_sample}'")
+    
+    try:
+        date_times, date_format = _parse_csv_datetime(df['Date'].astype(str), df['Time'].astype(str),
+                                                      date_sample, time_sample)
+        if date_times is None:
+            return {
+                'success': False, 
+                'error': f"❌ Định dạng ngày không được hỗ trợ: '{date_sample}'\n\nChỉ hỗ trợ: YYYY-MM-DD hoặc DD/MM/YYYY",
+                'debug_info': debug_info
+            }
+        df['DateTime'] = date_times
+        debug_info['date_format'] = date_format
+        logger.info(f"✅ {date_format} format")
+    except Exception as e:
+        return {
+            'success': False, 
+            'error': f"❌ Không parse được datetime:\n{str(e)}\n\nMẫu: {date_sample} {time_sample}",
+            'debug_info': debug_info
+        }
+    
+    # Apply timezone offset
+    if timezone_offset != 0:
+        df['DateTime'] = df['DateTime'] + pd.Timedelta(hours=timezone_offset)
+        logger.info(f"🌍 Applied timezone offset: {timezone_offset:+d} hours")
+    
+    # Sort by datetime
+    df = df.sort_values('DateTime')
+    
+    # Convert and validate OHLCV values
+    raw = {name: df[name].to_numpy() for name in ('Open', 'High', 'Low', 'Close', 'Volume')}
+    values = {name: pd.to_numeric(column, errors='coerce').astype(np.float64) if column.dtype == object
+              else column for name, column in raw.items()}
+    volume = values['Volume']
+    
+    with np.errstate(invalid='ignore'):
+        invalid = np.isnan(np.stack(list(values.values()))).any(axis=0)
+        invalid |= np.isinf(volume)
+        invalid |= values['High'] < values['Low']
+        invalid |= np.trunc(volume) < 0
+    
+    conversion_errors = int(invalid.sum())
+    if conversion_errors > 0:
+        # Same messages as the per-row conversion, for the first 5 rejected rows
+        error_samples = []
+        for pos in np.flatnonzero(invalid)[:5]:
+            idx = df.index[pos]
+            try:
+                _validate_candle_row(*(raw[name][pos] for name in raw))
+            except Exception as e:
+                error_samples.append(f"Row {idx}: {str(e)}")
+                logger.warning(f"⚠️ Skip row {idx}: {str(e)}")
+        debug_info['conversion_errors'] = conversion_errors
+        debug_info['error_samples'] = error_samples
+        logger.warning(f"⚠️ Total conversion errors: {conversion_errors}")
+    
+    valid = ~invalid
+    total_candles = int(valid.sum())
+    
+    if total_candles == 0:
+        error_msg = 'Không có dòng dữ liệu hợp lệ sau khi convert sang chart format\n\n'
+        error_msg += f'📊 Thông tin debug:\n'
+        error_msg += f'- Số dòng ban đầu: {debug_info["total_rows"]}\n'
+        error_msg += f'- Số dòng sau khi lọc NaN: {len(df)}\n'
+        if conversion_errors > 0:
+            error_msg += f'- Lỗi convert: {conversion_errors} dòng\n\n'
+        error_msg += f'💡 Kiểm tra:\n'
+        error_msg += f'- Các cột OHLCV phải chứa số hợp lệ\n'
+        error_msg += f'- Cột DateTime phải có format đúng\n'
+        error_msg += f'- Volume phải là số nguyên dương'
+        
+        return {
+            'success': False, 
+            'error': error_msg,
+            'debug_info': debug_info
+        }
+    
+    date_times = df['DateTime'].to_numpy()
+    columns = {
+        'time': date_times[valid].astype('datetime64[s]').astype(np.int64),
+        'open': values['Open'][valid],
+        'high': values['High'][valid],
+        'low': values['Low'][valid],
+        'close': values['Close'][valid],
+        'volume': np.trunc(volume[valid]).astype(np.int64)
+    }
+    
+    # Stats
+    ticker = str(df['Ticker'].iloc[0]).strip()
+    start_date = df['DateTime'].min().strftime('%Y-%m-%d %H:%M')
+    end_date = df['DateTime'].max().strftime('%Y-%m-%d %H:%M')
+    
+    logger.info(f"✅ {ticker}: {total_candles} candles ({start_date} → {end_date})")
+    
+    return {
+        'success': True,
+        'columns': columns,
+        'info': {
+            'ticker': ticker,
+            'start_date': start_date,
+            'end_date': end_date,
+            'total_candles': total_candles,
+            'timeframe': '1M',
+            'timezone_offset': timezone_offset
+        }
+    }
+
+
+def load_processed_columns(csv_path, timezone_offset=0):
+    """
+    Parsed columns of an uploaded CSV, memory-mapped from the processed store
+    when it is still valid for the file, otherwise parsed and stored
+    
+    Args:
+        csv_path: Path to CSV file in uploads
+        timezone_offset: Timezone offset in hours
+    
+    Returns:
+        Same result dict as parse_csv_data
+    """
+    cached = processed_store.load(csv_path, timezone_offset)
+    if cached is not None:
+        columns, meta = cached
+        logger.info(f"⚡ Processed cache hit: {os.path.basename(csv_path)} ({meta['info']['total_candles']} candles)")
+        return {'success': True, 'columns': columns, 'info': meta['info']}
+    
+    result = parse_csv_data(csv_path, timezone_offset)
+    if result['success']:
+        try:
+            processed_store.save(csv_path, result['columns'], result['info'], timezone_offset, source='parse',
+                                 levels=TimeframePyramid(result['columns']).levels())
+        except OSError as e:
+            logger.warning(f"⚠️ Could not cache processed columns: {str(e)}")
+    return result
+
+
+def timeframe_columns(csv_path, columns, timeframe, timezone_offset=0):
+    """
+    Columns of a CSV file at a timeframe: the stored pyramid level when there
+    is one, otherwise resampled from the base columns
+    
+    Args:
+        csv_path: Path to CSV file in uploads
+        columns: Base columns (load_processed_columns result)
+        timeframe: Target timeframe (e.g. '5m', '1D')
+        timezone_offset: Timezone offset in hours
+    
+    Returns:
+        Column dict with parse_csv_data keys
+    """
+    level = processed_store.load_level(csv_path, timeframe, timezone_offset)
+    if level is not None:
+        return level
+    
+    resampled_data = resample_data({
+        'times': columns['time'],
+        'opens': columns['open'],
+        'highs': columns['high'],
+        'lows': columns['low'],
+        'closes': columns['close'],
+        'volumes': columns['volume']
+    }, timeframe)
+    return {
+        'time': resampled_data['times'],
+        'open': resampled_data['opens'],
+        'high': resampled_data['highs'],
+        'low': resampled_data['lows'],
+        'close': resampled_data['closes'],
+        'volume': resampled_data['volumes']
+    }
+
+
+def _parse_csv_data_rows(filepath, timezone_offset=0):
+    """
+    Parse CSV file and auto-detect format
+    Supports:
+    1. Python format: Ticker,Date,Time,Open,High,Low,Close,Volume (YYYY-MM-DD)
+    2. AmiBroker format: Ticker,Date,Open,High,Low,Close,Volume,Time (DD/MM/YYYY)
+    
     Flexible column matching (case-insensitive)
     
+    Row-by-row fallback for parse_csv_data, returns a list of candle dicts in 'data'
+    
     Args:
         filepath: Path to CSV file
         timezone_offset: Timezone offset in hours (e.g. +7 for Vietnam)
@@ -108,7 +517,7 @@ def parse_csv_data(filepath, timezone_offset=0):
         logger.info(f"📂 Parsing CSV: {filepath} (timezone: {timezone_offset:+d}h)")
         
         # Read CSV with multiple encoding fallbacks
-        encodings = ['utf-8', 'utf-8-sig', 'latin1', 'cp1252']
+        encodings = CSV_ENCODINGS
         df = None
         used_encoding = None
         for encoding in encodings:
@@ -149,32 +558,9 @@ def parse_csv_data(filepath, timezone_offset=0):
         logger.info(f"📋 Original columns: {original_columns}")
         logger.info(f"📋 Normalized columns: {list(df.columns)}")
         
-        # Column mapping (flexible)
-        column_mapping = {
-            'ticker': ['ticker', 'symbol', 'code', 'stock'],
-            'date': ['date', 'ngay', 'datetime'],
-            'time': ['time', 'gio', 'hour'],
-            'open': ['open', 'o', 'mo', 'mo_cua'],
-            'high': ['high', 'h', 'cao', 'cao_nhat'],
-            'low': ['low', 'l', 'thap', 'thap_nhat'],
-            'close': ['close', 'c', 'dong', 'dong_cua'],
-            'volume': ['volume', 'vol', 'v', 'klgd', 'kl']
-        }
-        
         # Find matching columns
-        matched_cols = {}
-        missing_cols = []
-        for standard_name, possible_names in column_mapping.items():
-            found = False
-            for col in df.columns:
-                if col in possible_names:
-                    matched_cols[standard_name] = col
-                    found = True
-                    logger.info(f"✅ '{standard_name}' → '{col}'")
-                    break
-            if not found:
-                missing_cols.append(standard_name)
-                
+        matched_cols, missing_cols = _match_csv_columns(df.columns)
+        
         debug_info['matched_columns'] = matched_cols
         debug_info['missing_columns'] = missing_cols
         
@@ -256,18 +642,9 @@ def parse_csv_data(filepath, timezone_offset=0):
         error_samples = []
         for idx, row in df.iterrows():
             try:
-                # Validate OHLCV values
-                open_val = float(row['Open'])
-                high_val = float(row['High'])
-                low_val = float(row['Low'])
-                close_val = float(row['Close'])
-                volume_val = int(float(row['Volume']))
-                
-                # Basic validation
-                if high_val < low_val:
-                    raise ValueError(f"High ({high_val}) < Low ({low_val})")
-                if volume_val < 0:
-                    raise ValueError(f"Volume âm: {volume_val}")
+                open_val, high_val, low_val, close_val, volume_val = _validate_candle_row(
+                    row['Open'], row['High'], row['Low'], row['Close'], row['Volume']
+                )
                 
                 chart_data.append({
                     'time': int(row['DateTime'].timestamp()),
@@ -334,159 +711,7 @@ def parse_csv_data(filepath, timezone_offset=0):
         logger.error(f"❌ {error}")
         logger.exception(e)  # Full traceback
         return {'success': False, 'error': error, 'debug_info': debug_info}
-    """
-    Parse CSV file and auto-detect format
-    Supports:
-    1. Python format: Ticker,Date,Time,Open,High,Low,Close,Volume (YYYY-MM-DD)
-    2. AmiBroker format: Ticker,Date,Open,High,Low,Close,Volume,Time (DD/MM/YYYY)
-    
-    Flexible column matching (case-insensitive)
-    """
-    try:
-        logger.info(f"📂 Parsing CSV: {filepath}")
-        
-        # Read CSV with multiple encoding fallbacks
-        encodings = ['utf-8', 'utf-8-sig', 'latin1', 'cp1252']
-        df = None
-        for encoding in encodings:
-            try:
-                df = pd.read_csv(filepath, encoding=encoding)
-                logger.info(f"✅ Read {len(df)} rows with encoding: {encoding}")
-                break
-            except UnicodeDecodeError:
-                continue
-        
-        if df is None:
-            return {'success': False, 'error': 'Cannot decode file with supported encodings'}
-        
-        if len(df) == 0:
-            return {'success': False, 'error': 'File CSV không có dữ liệu'}
-        
-        # Normalize column names
-        original_columns = list(df.columns)
-        df.columns = df.columns.str.strip().str.lower()
-        logger.info(f"📋 Original columns: {original_columns}")
-        logger.info(f"📋 Normalized columns: {list(df.columns)}")
-        
-        # Column mapping (flexible)
-        column_mapping = {
-            'ticker': ['ticker', 'symbol', 'code', 'stock'],
-            'date': ['date', 'ngay', 'datetime'],
-            'time': ['time', 'gio', 'hour'],
-            'open': ['open', 'o', 'mo', 'mo_cua'],
-            'high': ['high', 'h', 'cao', 'cao_nhat'],
-            'low': ['low', 'l', 'thap', 'thap_nhat'],
-            'close': ['close', 'c', 'dong', 'dong_cua'],
-            'volume': ['volume', 'vol', 'v', 'klgd', 'kl']
-        }
-        
-        # Find matching columns
-        matched_cols = {}
-        for standard_name, possible_names in column_mapping.items():
-            found = False
-            for col in df.columns:
-                if col in possible_names:
-                    matched_cols[standard_name] = col
-                    found = True
-                    logger.info(f"✅ '{standard_name}' → '{col}'")
-                    break
-            if not found:
-                error = f'❌ Không tìm thấy cột [{standard_name}]\n\n'
-                error += f'Cột hiện có: {original_columns}\n\n'
-                error += f'Cột được hỗ trợ cho {standard_name}: {possible_names}'
-                logger.error(f"❌ {error}")
-                return {'success': False, 'error': error}
-        
-        # Rename to standard
-        df = df.rename(columns={
-            matched_cols['ticker']: 'Ticker',
-            matched_cols['date']: 'Date',
-            matched_cols['time']: 'Time',
-            matched_cols['open']: 'Open',
-            matched_cols['high']: 'High',
-            matched_cols['low']: 'Low',
-            matched_cols['close']: 'Close',
-            matched_cols['volume']: 'Volume'
-        })
-        
-        # Clean data - remove rows with NaN values
-        initial_count = len(df)
-        df = df.dropna(subset=['Date', 'Time', 'Open', 'High', 'Low', 'Close', 'Volume'])
-        if len(df) < initial_count:
-            logger.warning(f"⚠️ Removed {initial_count - len(df)} rows with missing data")
-        
-        if len(df) == 0:
-            error = f'❌ Không có dòng dữ liệu hợp lệ sau khi lọc!\n\n'
-            error += f'Đã đọc {initial_count} dòng nhưng tất cả có giá trị null/NaN.\n'
-            error += f'Kiểm tra lại file CSV.'
-            return {'success': False, 'error': error}
-        
-        # Parse datetime
-        date_sample = str(df['Date'].iloc[0]).strip()
-        time_sample = str(df['Time'].iloc[0]).strip()
-        logger.info(f"📅 Sample: Date='{date_sample}', Time='{time_sample}'")
-        
-        try:
-            if '-' in date_sample:
-                # Python format: YYYY-MM-DD
-                df['DateTime'] = pd.to_datetime(df['Date'].astype(str) + ' ' + df['Time'].astype(str))
-                logger.info("✅ Python format (YYYY-MM-DD)")
-            elif '/' in date_sample:
-                # AmiBroker format: DD/MM/YYYY
-                df['DateTime'] = pd.to_datetime(df['Date'].astype(str) + ' ' + df['Time'].astype(str), dayfirst=True)
-                logger.info("✅ AmiBroker format (DD/MM/YYYY)")
-            else:
-                return {'success': False, 'error': f'Unknown date format: {date_sample}'}
-        except Exception as e:
-            return {'success': False, 'error': f'Cannot parse datetime: {str(e)}\nSample: {date_sample} {time_sample}'}
-        
-        # Sort by datetime
-        df = df.sort_values('DateTime')
-        
-        # Convert to chart format
-        chart_data = []
-        for idx, row in df.iterrows():
-            try:
-                chart_data.append({
-                    'time': int(row['DateTime'].timestamp()),
-                    'open': float(row['Open']),
-                    'high': float(row['High']),
-                    'low': float(row['Low']),
-                    'close': float(row['Close']),
-                    'volume': int(float(row['Volume']))
-                })
-            except Exception as e:
-                logger.warning(f"⚠️ Skip row {idx}: {str(e)}")
-                continue
-        
-        if len(chart_data) == 0:
-            return {'success': False, 'error': 'Không convert được dữ liệu sang chart format'}
-        
-        # Stats
-        ticker = str(df['Ticker'].iloc[0]).strip()
-        start_date = df['DateTime'].min().strftime('%Y-%m-%d')
-        end_date = df['DateTime'].max().strftime('%Y-%m-%d')
-        total_candles = len(chart_data)
-        
-        logger.info(f"✅ {ticker}: {total_candles} candles ({start_date} → {end_date})")
-        
-        return {
-            'success': True,
-            'data': chart_data,
-            'info': {
-                'ticker': ticker,
-                'start_date': start_date,
-                'end_date': end_date,
-                'total_candles': total_candles,
-                'timeframe': '1M'
-            }
-        }
-        
-    except Exception as e:
-        error = f'Parse error: {str(e)}'
-        logger.error(f"❌ {error}")
-        logger.exception(e)  # Full traceback
-        return {'success': False, 'error': error}
+
 
 @app.route('/')
 def index():
@@ -727,6 +952,8 @@ def upload_csv():
             if os.path.exists(filepath):
                 logger.info(f"🔄 Overwriting: {filename}")
                 os.remove(filepath)
+                processed_store.invalidate(filepath)
+                backtest_cache.invalidate(filepath)
             
             file.save(filepath)
             logger.info(f"💾 Saved: {filepath} (original: {original_filename})")
@@ -735,28 +962,26 @@ def upload_csv():
             result = parse_csv_data(filepath, timezone_offset)
             
             if result['success']:
-                # Save processed data as JSON for persistence
-                processed_filename = filename.replace('.csv', '_processed.json')
-                processed_filepath = os.path.join(app.config['UPLOAD_FOLDER'], processed_filename)
+                candles = candles_from_columns(result['columns'])
                 
-                processed_data = {
-                    'original_filename': original_filename,
-                    'processed_at': datetime.now().isoformat(),
-                    'timezone_offset': timezone_offset,
-                    'data': result['data'],
-                    'info': result['info']
-                }
-                
-                with open(processed_filepath, 'w', encoding='utf-8') as f:
-                    json.dump(processed_data, f, ensure_ascii=False)
-                logger.info(f"💾 Saved processed file: {processed_filename}")
+                # Save processed columns for persistence (backtest/optimize/chart reload)
+                processed_filename = None
+                try:
+                    # Standard timeframes are resampled once here, backtests/charts pick a level
+                    pyramid = TimeframePyramid(result['columns'])
+                    processed_store.save(filepath, result['columns'], result['info'], timezone_offset,
+                                         original_filename=original_filename, source='upload',
+                                         levels=pyramid.levels())
+                    processed_filename = os.path.basename(processed_store.entry_dir(filepath, timezone_offset))
+                except OSError as e:
+                    logger.warning(f"⚠️ Could not save processed columns: {str(e)}")
                 
                 return jsonify({
                     'success': True,
                     'filename': filename,
                     'original_filename': original_filename,
                     'processed_filename': processed_filename,
-                    'data': result['data'],
+                    'data': candles,
                     'info': result['info'],
                     'timeframe': timeframe,  # Return selected timeframe
                     'message': f"Loaded {result['info']['total_candles']} candles ({result['info']['start_date']} → {result['info']['end_date']})"
@@ -804,13 +1029,28 @@ def list_csv_files():
 
 @app.route('/api/load-latest-processed')
 def load_latest_processed():
-    """Load latest processed JSON file from uploads"""
+    """Load latest processed upload (columnar store, legacy _processed.json as fallback)"""
     try:
         upload_dir = app.config['UPLOAD_FOLDER']
         if not os.path.exists(upload_dir):
             return jsonify({'success': False, 'error': 'Upload directory not found'})
         
-        # Find all processed JSON files
+        latest = processed_store.latest()
+        if latest is not None:
+            columns, meta = latest
+            logger.info(f"📂 Loaded latest processed entry: {meta['csv_filename']} (tz {meta['timezone_offset']:+d})")
+            
+            return jsonify({
+                'success': True,
+                'filename': meta['csv_filename'],
+                'data': candles_from_columns(columns),
+                'info': meta['info'],
+                'original_filename': meta.get('original_filename', ''),
+                'processed_at': meta.get('processed_at', ''),
+                'timezone_offset': meta.get('timezone_offset', 0)
+            })
+        
+        # Find all processed JSON files (written by older versions)
         processed_files = []
         for filename in os.listdir(upload_dir):
             if filename.endswith('_processed.json'):
@@ -846,6 +1086,32 @@ def load_latest_processed():
         logger.error(f"❌ Load latest processed error: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/processed-timeframe/<filename>')
+def load_processed_timeframe(filename):
+    """Chart candles of an uploaded CSV at a timeframe (stored pyramid level)"""
+    try:
+        timeframe = request.args.get('timeframe', '1m')
+        timezone_offset = int(request.args.get('timezone_offset', 0))
+        csv_path = os.path.join(app.config['UPLOAD_FOLDER'], secure_filename(filename))
+        if not os.path.exists(csv_path):
+            return jsonify({'success': False, 'error': 'CSV file not found'}), 404
+        
+        result = load_processed_columns(csv_path, timezone_offset)
+        if not result['success']:
+            return jsonify(result), 400
+        
+        columns = timeframe_columns(csv_path, result['columns'], timeframe, timezone_offset)
+        return jsonify({
+            'success': True,
+            'filename': os.path.basename(csv_path),
+            'timeframe': timeframe,
+            'data': candles_from_columns(columns),
+            'count': len(columns['time'])
+        })
+    except Exception as e:
+        logger.error(f"❌ Load processed timeframe error: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/load-csv/<filename>')
 def load_csv_file(filename):
     """Load CSV file from server"""
@@ -1158,6 +1424,9 @@ def generate_signals():
                 'volume': chart_data['volume'][i] if i < len(chart_data['volume']) else 0
             })
         
+        # Compute every referenced indicator once over the full series
+        indicator_series = build_indicator_series_python(strategy_config, candlesticks)
+        
         # Initialize signals arrays
         buy_signals = [False] * len(chart_data['close'])
         short_signals = [False] * len(chart_data['close'])
@@ -1172,14 +1441,14 @@ def generate_signals():
             # Check long entry conditions
             if strategy_config.get('entry_conditions', {}).get('long'):
                 for signal in strategy_config['entry_conditions']['long']:
-                    if evaluate_signal_conditions_python(signal, candle, prev_candle, candlesticks, index, strategy_config):
+                    if evaluate_signal_conditions_python(signal, candle, prev_candle, candlesticks, index, strategy_config, indicator_series):
                         buy_signals[index] = True
                         break
             
             # Check short entry conditions
             if strategy_config.get('entry_conditions', {}).get('short'):
                 for signal in strategy_config['entry_conditions']['short']:
-                    if evaluate_signal_conditions_python(signal, candle, prev_candle, candlesticks, index, strategy_config):
+                    if evaluate_signal_conditions_python(signal, candle, prev_candle, candlesticks, index, strategy_config, indicator_series):
                         short_signals[index] = True
                         break
         
@@ -1199,7 +1468,7 @@ def generate_signals():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
-def evaluate_signal_conditions_python(signal, candle, prev_candle, all_candles, current_index, config):
+def evaluate_signal_conditions_python(signal, candle, prev_candle, all_candles, current_index, config, indicator_series=None):
     """Evaluate signal conditions (Python version matching JavaScript logic)"""
     if not signal.get('conditions') or len(signal['conditions']) == 0:
         return False
@@ -1208,7 +1477,7 @@ def evaluate_signal_conditions_python(signal, candle, prev_candle, all_candles,
     current_logic = 'AND'
     
     for i, cond in enumerate(signal['conditions']):
-        cond_result = evaluate_single_condition_python(cond, candle, prev_candle, all_candles, current_index, config)
+        cond_result = evaluate_single_condition_python(cond, candle, prev_candle, all_candles, current_index, config, indicator_series)
         
         if i == 0:
             result = cond_result
@@ -1223,11 +1492,11 @@ def evaluate_signal_conditions_python(signal, candle, prev_candle, all_candles,
     return result
 
 
-def evaluate_single_condition_python(cond, candle, prev_candle, all_candles, current_index, config):
+def evaluate_single_condition_python(cond, candle, prev_candle, all_candles, current_index, config, indicator_series=None):
     """Evaluate single condition (Python version)"""
     try:
         # Get left value
-        left_val = get_operand_value_python(cond['left'], candle, prev_candle, all_candles, current_index, config, cond.get('leftOffset', 0))
+        left_val = get_operand_value_python(cond['left'], candle, prev_candle, all_candles, current_index, config, cond.get('leftOffset', 0), indicator_series)
         
         # Get operator
         operator = cond['operator']
@@ -1243,7 +1512,7 @@ def evaluate_single_condition_python(cond, candle, prev_candle, all_candles, cur
         if isinstance(right, (int, float)):
             right_val = float(right)
         else:
-            right_val = get_operand_value_python(right, candle, prev_candle, all_candles, current_index, config, cond.get('rightOffset', 0))
+            right_val = get_operand_value_python(right, candle, prev_candle, all_candles, current_index, config, cond.get('rightOffset', 0), indicator_series)
         
         if left_val is None or right_val is None:
             return False
@@ -1264,14 +1533,14 @@ def evaluate_single_condition_python(cond, candle, prev_candle, all_candles, cur
         elif operator == 'cross_above':
             if current_index == 0:
                 return False
-            prev_left = get_operand_value_python(cond['left'], prev_candle, None, all_candles, current_index - 1, config, cond.get('leftOffset', 0))
-            prev_right = get_operand_value_python(right, prev_candle, None, all_candles, current_index - 1, config, cond.get('rightOffset', 0)) if not isinstance(right, (int, float)) else right_val
+            prev_left = get_operand_value_python(cond['left'], prev_candle, None, all_candles, current_index - 1, config, cond.get('leftOffset', 0), indicator_series)
+            prev_right = get_operand_value_python(right, prev_candle, None, all_candles, current_index - 1, config, cond.get('rightOffset', 0), indicator_series) if not isinstance(right, (int, float)) else right_val
             return prev_left is not None and prev_right is not None and prev_left <= prev_right and left_val > right_val
         elif operator == 'cross_below':
             if current_index == 0:
                 return False
-            prev_left = get_operand_value_python(cond['left'], prev_candle, None, all_candles, current_index - 1, config, cond.get('leftOffset', 0))
-            prev_right = get_operand_value_python(right, prev_candle, None, all_candles, current_index - 1, config, cond.get('rightOffset', 0)) if not isinstance(right, (int, float)) else right_val
+            prev_left = get_operand_value_python(cond['left'], prev_candle, None, all_candles, current_index - 1, config, cond.get('leftOffset', 0), indicator_series)
+            prev_right = get_operand_value_python(right, prev_candle, None, all_candles, current_index - 1, config, cond.get('rightOffset', 0), indicator_series) if not isinstance(right, (int, float)) else right_val
             return prev_left is not None and prev_right is not None and prev_left >= prev_right and left_val < right_val
         
         return False
@@ -1280,8 +1549,13 @@ def evaluate_single_condition_python(cond, candle, prev_candle, all_candles, cur
         return False
 
 
-def get_operand_value_python(operand, candle, prev_candle, all_candles, current_index, config, offset=0):
-    """Get operand value (Python version)"""
+def get_operand_value_python(operand, candle, prev_candle, all_candles, current_index, config, offset=0, indicator_series=None):
+    """
+    Get operand value (Python version)
+    
+    indicator_series: Optional {indicator position: per-bar values} from
+    build_indicator_series_python, looked up by index instead of recomputing
+    """
     # Basic OHLCV
     if operand == 'open':
         return candle['open']
@@ -1295,14 +1569,118 @@ def get_operand_value_python(operand, candle, prev_candle, all_candles, current_
         return candle.get('volume', 0)
     
     # Check if it's an indicator
-    for ind in config.get('indicators', []):
+    for position, ind in enumerate(config.get('indicators', [])):
         if ind['id'] == operand:
+            index = current_index + offset
+            if indicator_series and position in indicator_series:
+                if index < 0 or index >= len(all_candles):
+                    return None
+                return indicator_series[position][index]
+            
             # Calculate indicator value
-            return calculate_indicator_value_python(ind, all_candles, current_index + offset)
+            return calculate_indicator_value_python(ind, all_candles, index)
     
     return None
 
 
+def build_indicator_series_python(config, all_candles):
+    """
+    Per-bar values of every indicator referenced by the entry conditions
+    
+    Returns:
+        {indicator position: list of values} for get_operand_value_python.
+        Indicators that cannot be computed over the full series are left out
+        and keep using calculate_indicator_value_python.
+    """
+    referenced = set()
+    for side in ('long', 'short'):
+        for signal in config.get('entry_conditions', {}).get(side) or []:
+            for cond in signal.get('conditions') or []:
+                referenced.add(cond.get('left'))
+                right = cond.get('right')
+                if isinstance(right, str):
+                    referenced.add(right)
+    
+    indicator_series = {}
+    for position, ind in enumerate(config.get('indicators', [])):
+        if ind.get('id') in referenced:
+            series = calculate_indicator_series_python(ind, all_candles)
+            if series is not None:
+                indicator_series[position] = series
+    
+    return indicator_series
+
+
+def calculate_indicator_series_python(indicator, all_candles):
+    """
+    Indicator values for every bar, computed once over the full series
+    
+    Gives calculate_indicator_value_python(indicator, all_candles, i) for
+    every i: EMA/RSI are causal recursions, and the SMA of a prefix only
+    depends on its trailing window.
+    
+    Returns:
+        List of float/None per bar, or None when the per-bar path must be used
+    """
+    n_bars = len(all_candles)
+    ind_type = indicator['type']
+    if ind_type not in ('EMA', 'SMA', 'RSI'):
+        return [None] * n_bars
+    
+    params = indicator.get('params', {})
+    period = params.get('period', 14 if ind_type == 'RSI' else 20)
+    min_bars = period + 1 if ind_type == 'RSI' else period
+    
+    close_prices = [c['close'] for c in all_candles]
+    if not all(type(price) in (int, float) for price in close_prices):
+        return None
+    
+    # np.array() of a prefix is int64 until the first float price (EMA keeps that dtype)
+    first_float = next((i for i, price in enumerate(close_prices) if type(price) is float), n_bars)
+    segments = [(0, first_float, close_prices[:first_float]), (first_float, n_bars, close_prices)]
+    
+    values = [None] * n_bars
+    try:
+        for start, end, prices in segments:
+            if start >= end:
+                continue
+            
+            prices = np.array(prices)
+            if ind_type == 'EMA':
+                series = Indicators.ema(prices, period)
+            elif ind_type == 'SMA':
+                series = _trailing_sma_python(prices, period)
+            else:
+                series = Indicators.rsi(prices, period)
+            
+            for i in range(max(start, min_bars - 1), end):
+                values[i] = float(series[i])
+    except Exception as e:
+        logger.error(f"Indicator series error: {e}")
+        return None
+    
+    return values
+
+
+def _trailing_sma_python(prices, period):
+    """
+    Last value of Indicators.sma(prices[:i + 1], period) for every bar i
+    
+    The 'same' convolution zero-pads the end of each prefix, so only the
+    trailing period - (period - 1) // 2 prices contribute to its last value.
+    """
+    if period < 1:
+        raise ValueError(f"Invalid SMA period: {period}")
+    
+    kernel = np.ones(period) / period
+    window = period - (period - 1) // 2
+    
+    sma = np.full(len(prices), np.nan)
+    for i in range(period - 1, len(prices)):
+        sma[i] = np.dot(prices[i - window + 1:i + 1], kernel[:window])
+    return sma
+
+
 def calculate_indicator_value_python(indicator, all_candles, index):
     """Calculate indicator value at specific index (Python version)"""
     if index < 0 or index >= len(all_candles):
@@ -1531,47 +1909,10 @@ def run_backtest():
         if not csv_filename or not strategy_filename:
             return jsonify({'success': False, 'error': 'Missing CSV or strategy file'}), 400
 
-        # Load CSV data
         csv_path = os.path.join('uploads', secure_filename(csv_filename))
         if not os.path.exists(csv_path):
             return jsonify({'success': False, 'error': 'CSV file not found'}), 404
 
-        result = parse_csv_data(csv_path)
-        if not result['success']:
-            return jsonify(result), 400
-
-        chart_data = result['data']
-
-        # Resample data to selected timeframe (if needed)
-        from trading_engine.timeframe_resampler import resample_data
-
-        # Convert chart_data list to dict format for resampling
-        data_dict = {
-            'times': [candle['time'] for candle in chart_data],
-            'opens': [candle['open'] for candle in chart_data],
-            'highs': [candle['high'] for candle in chart_data],
-            'lows': [candle['low'] for candle in chart_data],
-            'closes': [candle['close'] for candle in chart_data],
-            'volumes': [candle['volume'] for candle in chart_data]
-        }
-
-        # Resample if timeframe is not the source timeframe
-        if timeframe and timeframe != '1H':  # Assuming source data is 1H
-            resampled_data = resample_data(data_dict, timeframe)
-
-            # Convert back to chart_data list format
-            chart_data = [
-                {
-                    'time': resampled_data['times'][i],
-                    'open': resampled_data['opens'][i],
-                    'high': resampled_data['highs'][i],
-                    'low': resampled_data['lows'][i],
-                    'close': resampled_data['closes'][i],
-                    'volume': resampled_data['volumes'][i]
-                }
-                for i in range(len(resampled_data['times']))
-            ]
-        
         # Load strategy
         strategy_path = os.path.join('strategies', secure_filename(strategy_filename))
         if not os.path.exists(strategy_path):
@@ -1580,25 +1921,39 @@ def run_backtest():
         with open(strategy_path, 'r') as f:
             strategy_config = json.load(f)
         
+        # Same dataset, strategy and settings as an earlier run -> cached response
+        cache_key = backtest_cache.key(csv_path, secure_filename(strategy_filename), strategy_config, {
+            'initial_capital': initial_capital,
+            'commission': commission,
+            'slippage': slippage,
+            'timeframe': timeframe
+        })
+        cached = backtest_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"⚡ Backtest cache hit: {csv_filename} / {strategy_filename}")
+            return jsonify(cached)
+
+        # Load CSV data
+        result = load_processed_columns(csv_path)
+        if not result['success']:
+            return jsonify(result), 400
+
+        columns = result['columns']
+
+        # Select the timeframe level (stored pyramid, resampled on a miss)
+        if timeframe and timeframe != '1H':  # Assuming source data is 1H
+            columns = timeframe_columns(csv_path, columns, timeframe)
+        
         # Import trading engine
-        from trading_engine.strategy import Strategy
+        from trading_engine.strategy import compile_strategy
         from trading_engine.backtest_engine import BacktestEngine
         
-        # Create strategy and backtest
-        strategy = Strategy(strategy_config)
+        # Create strategy (compiled once per config content) and backtest
+        strategy = compile_strategy(strategy_config).bind()
         backtest = BacktestEngine(strategy, initial_capital, commission, slippage)
         
-        # Convert chart data from list of dicts to dict of numpy arrays
-        # chart_data is a list: [{'time': 123, 'open': 100, ...}, ...]
-        # Need to convert to: {'time': [123, 124, ...], 'open': [100, 101, ...]}
-        bt_data = {
-            'time': np.array([candle['time'] for candle in chart_data]),
-            'open': np.array([candle['open'] for candle in chart_data]),
-            'high': np.array([candle['high'] for candle in chart_data]),
-            'low': np.array([candle['low'] for candle in chart_data]),
-            'close': np.array([candle['close'] for candle in chart_data]),
-            'volume': np.array([candle['volume'] for candle in chart_data])
-        }
+        # Column arrays straight from the parser (or resampler)
+        bt_data = {key: np.asarray(columns[key]) for key in CANDLE_COLUMNS}
         
         # Run backtest
         results = backtest.run(bt_data)
@@ -1656,6 +2011,7 @@ def run_backtest():
             ]
         }
         
+        backtest_cache.put(cache_key, response)
         return jsonify(response)
         
     except Exception as e:
@@ -1889,6 +2245,8 @@ def run_optimize():
         param_ranges = data.get('param_ranges', [])
         population_size = int(data.get('population_size', 50))
         generations = int(data.get('generations', 20))
+        n_workers = int(data.get('n_workers', 1))  # Worker processes for fitness evaluation
+        seed = data.get('seed')  # Optional seed for reproducible runs
         timeframe = data.get('timeframe', '1H')  # Default to 1H if not provided
 
         if not csv_filename or not strategy_filename or not param_ranges:
@@ -1899,47 +2257,15 @@ def run_optimize():
         if not os.path.exists(csv_path):
             return jsonify({'success': False, 'error': 'CSV file not found'}), 404
 
-        result = parse_csv_data(csv_path)
+        result = load_processed_columns(csv_path)
         if not result['success']:
             return jsonify(result), 400
 
-        chart_data = result['data']
-
-        # Resample data to selected timeframe (if needed)
-        from trading_engine.timeframe_resampler import resample_data
-
-        # Convert chart_data list to dict format for resampling
-        data_dict = {
-            'times': [candle['time'] for candle in chart_data],
-            'opens': [candle['open'] for candle in chart_data],
-            'highs': [candle['high'] for candle in chart_data],
-            'lows': [candle['low'] for candle in chart_data],
-            'closes': [candle['close'] for candle in chart_data],
-            'volumes': [candle['volume'] for candle in chart_data]
-        }
+        columns = result['columns']
 
-        # Resample if timeframe is not the source timeframe
+        # Select the timeframe level (stored pyramid, resampled on a miss)
         if timeframe and timeframe != '1H':  # Assuming source data is 1H
-            resampled_data = resample_data(data_dict, timeframe)
-            # Update chart_data dict format (optimizer expects dict not list)
-            chart_data = {
-                'time': resampled_data['times'],
-                'open': resampled_data['opens'],
-                'high': resampled_data['highs'],
-                'low': resampled_data['lows'],
-                'close': resampled_data['closes'],
-                'volume': resampled_data['volumes']
-            }
-        else:
-            # Convert to dict format even if no resampling
-            chart_data = {
-                'time': data_dict['times'],
-                'open': data_dict['opens'],
-                'high': data_dict['highs'],
-                'low': data_dict['lows'],
-                'close': data_dict['closes'],
-                'volume': data_dict['volumes']
-            }
+            columns = timeframe_columns(csv_path, columns, timeframe)
         
         # Load strategy
         strategy_path = os.path.join('strategies', secure_filename(strategy_filename))
@@ -1950,22 +2276,17 @@ def run_optimize():
             strategy_config = json.load(f)
         
         # Import trading engine
-        from trading_engine.strategy import Strategy
+        from trading_engine.strategy import compile_strategy
         from trading_engine.optimizer import GeneticOptimizer
         
-        # Convert chart data to numpy arrays
-        opt_data = {
-            'time': np.array(chart_data['time']),
-            'open': np.array(chart_data['open']),
-            'high': np.array(chart_data['high']),
-            'low': np.array(chart_data['low']),
-            'close': np.array(chart_data['close']),
-            'volume': np.array(chart_data['volume'])
-        }
+        # Convert column data to numpy arrays
+        opt_data = {key: np.asarray(columns[key]) for key in CANDLE_COLUMNS}
         
-        # Create strategy and optimizer
-        strategy = Strategy(strategy_config)
-        optimizer = GeneticOptimizer(strategy, opt_data, population_size, generations)
+        # Create strategy (compiled once per config content) and optimizer
+        strategy = compile_strategy(strategy_config).bind()
+        optimizer = GeneticOptimizer(strategy, opt_data, population_size, generations,
+                                     n_workers=n_workers,
+                                     seed=int(seed) if seed is not None else None)
         
         # Add parameters
         for param in param_ranges:
@@ -2016,6 +2337,32 @@ def handle_connect():
 def handle_disconnect():
     print('Client disconnected')
 
+# Realtime candle deltas (candle_update / candle_closed go to the symbol's room)
+@socketio.on('subscribe_candles')
+def handle_subscribe_candles(data):
+    """Join the candle room of a symbol and send its current snapshot"""
+    symbol = (data or {}).get('symbol')
+    if not symbol:
+        return
+    join_room(candle_room(symbol))
+    emit('candle_snapshot', realtime_streamer.candle_snapshot(symbol))
+
+@socketio.on('unsubscribe_candles')
+def handle_unsubscribe_candles(data):
+    """Leave the candle room of a symbol"""
+    symbol = (data or {}).get('symbol')
+    if symbol:
+        leave_room(candle_room(symbol))
+
+@socketio.on('candle_resync')
+def handle_candle_resync(data):
+    """Resend a candle range after the client detected a sequence gap"""
+    data = data or {}
+    symbol = data.get('symbol')
+    if not symbol:
+        return
+    emit('candle_snapshot', realtime_streamer.candle_snapshot(symbol, data.get('start'), data.get('end')))
+
 # HFT WebSocket handlers
 hft_running = {}  # Dictionary to track HFT sessions per client
 
@@ -0,0 +1,127 @@
+"""
+AFL Engine Benchmark
+Compares the per-bar Python loop with the array backend of
+AFLTradingEngine.run_backtest on the bundled VN30F1M upload
+
+Usage:
+    python benchmarks/bench_afl_engine.py [csv_path] [--repeat N]
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from trading_engine.indicators import Indicators
+from trading_engine.afl_engine import AFLTradingEngine
+from trading_engine.afl_primitives import cross
+from trading_engine import afl_kernel
+
+DEFAULT_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'uploads',
+                           'VN30F1M__31_10_25_14_45_00_Python_format.csv')
+
+
+def load_ohlcv(csv_path: str) -> dict:
+    """Load a Python-format CSV into OHLCV arrays with epoch-second times"""
+    df = pd.read_csv(csv_path)
+    df.columns = df.columns.str.strip().str.lower()
+    timestamps = pd.to_datetime(df['date'].astype(str) + ' ' + df['time'].astype(str))
+    return {
+        'time': (timestamps.astype('int64') // 10**9).to_numpy(),
+        'open': df['open'].to_numpy(dtype=float),
+        'high': df['high'].to_numpy(dtype=float),
+        'low': df['low'].to_numpy(dtype=float),
+        'close': df['close'].to_numpy(dtype=float),
+        'volume': df['volume'].to_numpy(dtype=float)
+    }
+
+
+def ema_cross_signals(data: dict, fast: int = 5, slow: int = 20) -> dict:
+    """Simple EMA crossover entry signals"""
+    ema_fast = Indicators.ema(data['close'], fast)
+    ema_slow = Indicators.ema(data['close'], slow)
+    return {'buy_signal': cross(ema_fast, ema_slow), 'short_signal': cross(ema_slow, ema_fast)}
+
+
+def reentry_case(n_bars: int = 20) -> tuple:
+    """Bars where the stop is hit on every bar and a buy signal re-enters on the same bar"""
+    data = {
+        'time': np.datetime64('2025-01-02T10:00', 's').astype(np.int64) + np.arange(n_bars) * 60,
+        'open': np.full(n_bars, 100.0),
+        'high': np.full(n_bars, 101.0),
+        'low': np.full(n_bars, 80.0),
+        'close': np.full(n_bars, 100.0),
+        'volume': np.ones(n_bars)
+    }
+    signals = {'buy_signal': np.ones(n_bars, dtype=bool), 'short_signal': np.zeros(n_bars, dtype=bool)}
+    return data, signals
+
+
+def backends_identical(config: dict, data: dict, signals: dict) -> tuple:
+    """Run both backends; returns (python result, identical trades/signals/lines)"""
+    # The bar loop only converts Python int/float timestamps
+    python_data = dict(data, time=data['time'].tolist())
+
+    python_result = AFLTradingEngine(config).run_backtest(python_data, signals, backend='python')
+    array_result = AFLTradingEngine(config).run_backtest(data, signals, backend='array')
+
+    identical = python_result['trades'] == array_result['trades'] and all(
+        np.array_equal(python_result[group][key], array_result[group][key], equal_nan=True)
+        for group in ('signals', 'lines') for key in python_result[group]
+    )
+    return python_result, identical
+
+
+def best_time(func, repeat: int) -> float:
+    """Best wall time of several runs"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark AFLTradingEngine backends')
+    parser.add_argument('csv_path', nargs='?', default=DEFAULT_CSV)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    data = load_ohlcv(args.csv_path)
+    signals = ema_cross_signals(data)
+    config = {
+        'settings': {
+            'trading_hours': {'start': '09:00', 'end': '14:30'},
+            'buy_order_limit': len(data['close']),
+            'short_order_limit': len(data['close'])
+        }
+    }
+
+    python_result, identical = backends_identical(config, data, signals)  # also warm-up / JIT
+    python_data = dict(data, time=data['time'].tolist())
+
+    # Exit and re-entry on the same bar: one trade per bar
+    reentry_data, reentry_signals = reentry_case()
+    reentry_result, reentry_identical = backends_identical(config, reentry_data, reentry_signals)
+
+    python_time = best_time(lambda: AFLTradingEngine(config).run_backtest(python_data, signals, backend='python'), args.repeat)
+    array_time = best_time(lambda: AFLTradingEngine(config).run_backtest(data, signals, backend='array'), args.repeat)
+
+    n_bars = len(data['close'])
+    print(f"📊 {os.path.basename(args.csv_path)}: {n_bars} bars, {len(python_result['trades'])} trades")
+    print(f"   numba: {'yes' if afl_kernel.NUMBA_AVAILABLE else 'no (pure Python kernel)'}")
+    print(f"   python backend: {python_time * 1000:8.2f} ms ({n_bars / python_time:,.0f} bars/s)")
+    print(f"   array backend:  {array_time * 1000:8.2f} ms ({n_bars / array_time:,.0f} bars/s)")
+    print(f"   speedup: {python_time / array_time:.1f}x | identical results: {identical}")
+    print(f"   same-bar exit/re-entry: {len(reentry_result['trades'])} trades | identical results: {reentry_identical}")
+
+    return 0 if identical and reentry_identical else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
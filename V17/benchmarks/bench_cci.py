@@ -0,0 +1,84 @@
+"""
+CCI Micro-Benchmark
+Rolling mean absolute deviation in Indicators.cci: sliding-window kernel
+versus the previous pandas rolling().apply(lambda) implementation
+
+Usage:
+    python benchmarks/bench_cci.py [--bars N] [--period P] [--repeat N]
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from trading_engine.indicators import Indicators
+from bench_afl_engine import DEFAULT_CSV, load_ohlcv
+
+
+def rolling_apply_mad(tp: np.ndarray, period: int) -> np.ndarray:
+    """Reference: the pandas rolling().apply() MAD used before"""
+    return pd.Series(tp).rolling(period).apply(lambda x: np.abs(x - x.mean()).mean()).values
+
+
+def synthetic_ohlc(n_bars: int, seed: int = 0):
+    """Random-walk high/low/close"""
+    rng = np.random.default_rng(seed)
+    close = 1300 + np.cumsum(rng.standard_normal(n_bars))
+    high = close + rng.random(n_bars)
+    low = close - rng.random(n_bars)
+    return high, low, close
+
+
+def best_time(func, repeat: int) -> float:
+    """Best wall time of several runs"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CCI mean absolute deviation')
+    parser.add_argument('--bars', type=int, default=200000)
+    parser.add_argument('--period', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    bundled = load_ohlcv(DEFAULT_CSV)
+    datasets = {
+        'VN30F1M CSV': (bundled['high'], bundled['low'], bundled['close']),
+        f'synthetic {args.bars}': synthetic_ohlc(args.bars)
+    }
+
+    all_ok = True
+    for label, (high, low, close) in datasets.items():
+        tp = (high + low + close) / 3
+
+        # The reference is slow - run it once
+        start = time.perf_counter()
+        reference = rolling_apply_mad(tp, args.period)
+        apply_time = time.perf_counter() - start
+
+        identical = np.array_equal(reference, Indicators.rolling_mad(tp, args.period), equal_nan=True)
+        all_ok &= identical
+
+        kernel_time = best_time(lambda: Indicators.rolling_mad(tp, args.period), args.repeat)
+        cci_time = best_time(lambda: Indicators.cci(high, low, close, args.period), args.repeat)
+
+        print(f"📊 {label}: {len(tp)} bars, period {args.period}")
+        print(f"   rolling.apply MAD: {apply_time * 1000:10.1f} ms")
+        print(f"   window kernel MAD: {kernel_time * 1000:10.1f} ms  ({apply_time / kernel_time:.0f}x)")
+        print(f"   Indicators.cci:    {cci_time * 1000:10.1f} ms | identical MAD: {identical}")
+
+    return 0 if all_ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
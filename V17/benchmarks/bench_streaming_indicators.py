@@ -0,0 +1,65 @@
+"""
+Streaming Indicators Benchmark
+Per-bar cost of StreamingIndicator.update() versus recomputing the batch
+indicator over the whole history on every new bar, plus an equivalence check
+
+Usage:
+    python benchmarks/bench_streaming_indicators.py [csv_path] [--history N] [--live N]
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from trading_engine.indicators import calculate_indicator
+from trading_engine.streaming_indicators import STREAMING_INDICATORS, create_streaming_indicator, verify_against_batch
+from bench_afl_engine import DEFAULT_CSV, load_ohlcv
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark streaming indicators')
+    parser.add_argument('csv_path', nargs='?', default=DEFAULT_CSV)
+    parser.add_argument('--history', type=int, default=20000, help='Bars used to seed')
+    parser.add_argument('--live', type=int, default=200, help='Live bars streamed')
+    args = parser.parse_args()
+
+    data = load_ohlcv(args.csv_path)
+    data = {key: np.asarray(values, dtype=float) for key, values in data.items() if key != 'time'}
+    history = {key: values[:args.history] for key, values in data.items()}
+    live_end = min(args.history + args.live, len(data['close']))
+    live_bars = [{key: float(values[i]) for key, values in data.items()} for i in range(args.history, live_end)]
+
+    print(f"📊 {args.history} history bars, {len(live_bars)} live bars")
+    print(f"{'indicator':<16} {'update µs/bar':>14} {'recompute µs/bar':>17} {'speedup':>9}  equivalent")
+
+    all_ok = True
+    for name in STREAMING_INDICATORS:
+        indicator = create_streaming_indicator(name).seed(history)
+        start = time.perf_counter()
+        for bar in live_bars:
+            indicator.update(bar)
+        update_time = (time.perf_counter() - start) / max(len(live_bars), 1)
+
+        # Recompute over the full history for a few live bars
+        samples = range(args.history + 1, live_end + 1, max(len(live_bars) // 10, 1))
+        start = time.perf_counter()
+        for end in samples:
+            calculate_indicator(name, {key: values[:end] for key, values in data.items()}, {}, cache=None)
+        recompute_time = (time.perf_counter() - start) / max(len(samples), 1)
+
+        check = verify_against_batch(name, {key: values[:live_end] for key, values in data.items()},
+                                     seed_bars=args.history, n_checks=50)
+        all_ok &= check['ok']
+
+        print(f"{name:<16} {update_time * 1e6:>14.2f} {recompute_time * 1e6:>17.1f} "
+              f"{recompute_time / update_time:>8.0f}x  {'✅' if check['ok'] else '❌'} (max diff {check['max_abs_diff']:.2e})")
+
+    return 0 if all_ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
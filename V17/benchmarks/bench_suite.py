@@ -0,0 +1,498 @@
+"""
+Trading Engine Benchmark Suite
+Wall time, bars/sec and peak memory of the trading_engine hot paths
+- Every Indicators function and the calculate_indicator dispatch
+- Strategy.generate_signals, BacktestEngine.run, AFLTradingEngine.run_backtest,
+  GeneticOptimizer.optimize (small config), TimeframeResampler.resample
+- parse_csv_data (needs the app.py dependencies, skipped otherwise)
+Datasets are synthetic session-shaped minute bars (10k/100k/1M by default)
+plus the bundled VN30F1M upload. Results are written as JSON and can be
+compared against a previous run with --compare.
+
+Usage:
+    python benchmarks/bench_suite.py [--sizes 10000,100000,1000000] [--only PATTERN]
+                                     [--output FILE] [--compare BASELINE.json]
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import fnmatch
+import inspect
+import logging
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import contextlib
+import subprocess
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..'))
+
+from trading_engine.indicators import Indicators, calculate_indicator, shared_indicator_cache
+from trading_engine.strategy import Strategy
+from trading_engine.backtest_engine import BacktestEngine
+from trading_engine.afl_engine import AFLTradingEngine
+from trading_engine.optimizer import GeneticOptimizer
+from trading_engine.timeframe_resampler import TimeframeResampler
+from bench_afl_engine import DEFAULT_CSV, load_ohlcv, ema_cross_signals
+
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+RESULT_VERSION = 1
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+# Runs are repeated until this much time was spent (at most --repeat runs)
+MIN_MEASURE_SECONDS = 0.5
+
+# VN derivatives sessions: 09:00-11:30 and 13:00-14:45
+SESSION_MINUTES = np.concatenate([np.arange(9 * 60, 11 * 60 + 30), np.arange(13 * 60, 14 * 60 + 45)])
+
+# Names handled by calculate_indicator, with the params used for the dispatch benchmark
+DISPATCH_INDICATORS = {
+    'EMA': {'period': 20},
+    'SMA': {'period': 20},
+    'WMA': {'period': 20},
+    'DEMA': {'period': 20},
+    'TEMA': {'period': 20},
+    'RSI': {'period': 14},
+    'MACD': {'fast': 12, 'slow': 26, 'signal': 9},
+    'Stochastic': {'k_period': 14, 'd_period': 3},
+    'CCI': {'period': 20},
+    'MFI': {'period': 14},
+    'BollingerBands': {'period': 20, 'std_dev': 2.0},
+    'ATR': {'period': 14},
+    'KeltnerChannel': {'period': 20, 'multiplier': 2.0},
+    'DonchianChannel': {'period': 20},
+    'OBV': {},
+    'VWAP': {},
+    'SuperTrend': {'period': 10, 'multiplier': 3.0},
+    'PivotPoints': {},
+    'PeakTrough': {'lookback': 20}
+}
+
+# Indicators arguments filled from the dataset ('data' is the close series)
+SERIES_ARGS = {'data': 'close', 'high': 'high', 'low': 'low', 'close': 'close', 'volume': 'volume'}
+
+# Indicators arguments computed from the dataset
+DERIVED_ARGS = {'atr': lambda data: Indicators.atr(data['high'], data['low'], data['close'], 10)}
+
+# Values for Indicators arguments that have no default
+REQUIRED_ARGS = {'period': 20, 'periods': list(range(5, 55, 5))}
+
+# Strategy used by the signal / backtest / optimizer benchmarks
+BENCH_STRATEGY = {
+    'name': 'Benchmark EMA/RSI',
+    'indicators': [
+        {'id': 'ema_fast', 'type': 'EMA', 'params': {'period': 5}},
+        {'id': 'ema_slow', 'type': 'EMA', 'params': {'period': 20}},
+        {'id': 'rsi_14', 'type': 'RSI', 'params': {'period': 14}}
+    ],
+    'entry_conditions': {
+        'long': [{'name': 'Buy', 'conditions': [
+            {'left': 'ema_fast', 'operator': 'cross_above', 'right': 'ema_slow', 'logic': 'AND'},
+            {'left': 'rsi_14', 'operator': '<', 'right': '70', 'logic': 'AND'}
+        ]}],
+        'short': [{'name': 'Short', 'conditions': [
+            {'left': 'ema_fast', 'operator': 'cross_below', 'right': 'ema_slow', 'logic': 'AND'},
+            {'left': 'rsi_14', 'operator': '>', 'right': '30', 'logic': 'AND'}
+        ]}]
+    },
+    'exit_rules': {'dynamic_tp_sl': True, 'tp_sl_table': []},
+    'settings': {},
+    'risk_management': {'position_size_pct': 10, 'max_positions': 1, 'max_daily_loss': 50}
+}
+
+
+# ==================== DATASETS ====================
+
+def synthetic_ohlcv(n_bars: int, seed: int = 0) -> dict:
+    """
+    Random-walk minute bars laid out on the VN trading sessions
+
+    Returns:
+        OHLCV arrays with epoch-second times, same layout as load_ohlcv
+    """
+    rng = np.random.default_rng(seed)
+    per_day = len(SESSION_MINUTES)
+    bar = np.arange(n_bars)
+    start = int(pd.Timestamp('2020-01-02').timestamp())
+    times = start + (bar // per_day) * 86400 + SESSION_MINUTES[bar % per_day] * 60
+
+    close = np.round(1300 + np.cumsum(rng.normal(0, 0.5, n_bars)), 1)
+    open_ = np.round(np.concatenate([[close[0]], close[:-1]]) + rng.normal(0, 0.2, n_bars), 1)
+    spread = np.round(rng.random((2, n_bars)) * 1.5, 1)
+    return {
+        'time': times.astype(np.int64),
+        'open': open_,
+        'high': np.maximum(open_, close) + spread[0],
+        'low': np.minimum(open_, close) - spread[1],
+        'close': close,
+        'volume': rng.integers(100, 10_000, n_bars).astype(float)
+    }
+
+
+def write_python_format_csv(data: dict, filepath: str):
+    """Write OHLCV arrays as a Python-format upload (Ticker,Date,Time,...)"""
+    stamps = pd.to_datetime(data['time'], unit='s')
+    pd.DataFrame({
+        'Ticker': 'SYNTH',
+        'Date': stamps.strftime('%Y-%m-%d'),
+        'Time': stamps.strftime('%H:%M:%S'),
+        'Open': data['open'],
+        'High': data['high'],
+        'Low': data['low'],
+        'Close': data['close'],
+        'Volume': data['volume'].astype(np.int64)
+    }).to_csv(filepath, index=False)
+
+
+# ==================== BENCHMARK CASES ====================
+
+class BenchCase:
+    """
+    One benchmark: a setup (not timed) returning the callable to time
+
+    Args:
+        name: Benchmark name (used by --only and --compare)
+        group: Report group
+        setup: setup(data, ctx) -> zero-argument callable
+        max_bars: Larger datasets are skipped (slow pure-Python paths)
+    """
+
+    def __init__(self, name: str, group: str, setup, max_bars: int = None):
+        self.name = name
+        self.group = group
+        self.setup = setup
+        self.max_bars = max_bars
+
+
+def _indicator_setup(method_name: str):
+    """Call an Indicators static method with dataset series and default params"""
+    method = getattr(Indicators, method_name)
+
+    def setup(data, ctx):
+        kwargs = {}
+        for param in inspect.signature(method).parameters.values():
+            if param.name in SERIES_ARGS:
+                kwargs[param.name] = data[SERIES_ARGS[param.name]]
+            elif param.name in DERIVED_ARGS:
+                kwargs[param.name] = DERIVED_ARGS[param.name](data)
+            elif param.default is inspect.Parameter.empty:
+                kwargs[param.name] = REQUIRED_ARGS[param.name]
+        return lambda: method(**kwargs)
+
+    return setup
+
+
+def _dispatch_setup(indicator_name: str):
+    """calculate_indicator with the result cache disabled"""
+    params = DISPATCH_INDICATORS[indicator_name]
+    return lambda data, ctx: (lambda: calculate_indicator(indicator_name, data, params, cache=None))
+
+
+def _uncached(func):
+    """Clear the shared indicator cache before each run so indicators are recomputed"""
+    def run():
+        shared_indicator_cache.clear()
+        return func()
+    return run
+
+
+def _signals_setup(data, ctx):
+    strategy = Strategy(strategy_json=json.loads(json.dumps(BENCH_STRATEGY)))
+    return _uncached(lambda: strategy.generate_signals(data))
+
+
+def _backtest_setup(backend: str):
+    def setup(data, ctx):
+        strategy = Strategy(strategy_json=json.loads(json.dumps(BENCH_STRATEGY)))
+        return _uncached(lambda: BacktestEngine(strategy).run(data, backend=backend))
+    return setup
+
+
+def _afl_config(data) -> dict:
+    n_bars = len(data['close'])
+    return {'settings': {'trading_hours': {'start': '09:00', 'end': '14:30'},
+                         'buy_order_limit': n_bars, 'short_order_limit': n_bars}}
+
+
+def _afl_setup(backend: str):
+    def setup(data, ctx):
+        signals = ema_cross_signals(data)
+        config = _afl_config(data)
+        run_data = dict(data, time=data['time'].tolist()) if backend == 'python' else data
+        if backend == 'array':
+            AFLTradingEngine(config).run_backtest(run_data, signals, backend=backend)  # JIT warm-up
+        return lambda: AFLTradingEngine(config).run_backtest(run_data, signals, backend=backend)
+    return setup
+
+
+def _optimizer_setup(data, ctx):
+    def run():
+        strategy = Strategy(strategy_json=json.loads(json.dumps(BENCH_STRATEGY)))
+        optimizer = GeneticOptimizer(strategy, data, population_size=6, generations=2, n_workers=1, seed=42)
+        optimizer.add_parameter('indicators.0.params.period', 3, 10, 1, 'int')
+        optimizer.add_parameter('indicators.1.params.period', 15, 40, 1, 'int')
+        return optimizer.optimize()
+    return _uncached(run)
+
+
+def _resample_setup(timeframe: str):
+    def setup(data, ctx):
+        legacy = {'times': data['time'], 'opens': data['open'], 'highs': data['high'],
+                  'lows': data['low'], 'closes': data['close'], 'volumes': data['volume']}
+        if TimeframeResampler(legacy).resample(timeframe) is legacy:
+            raise RuntimeError(f"resample('{timeframe}') fell back to the source data")
+        return lambda: TimeframeResampler(legacy).resample(timeframe)
+    return setup
+
+
+def _parse_csv_setup(data, ctx):
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            import app
+    except ImportError as e:
+        raise SkipBenchmark(f"app.py not importable: {e}")
+
+    csv_path = ctx.get('csv_path')
+    if csv_path is None:
+        csv_path = os.path.join(ctx['tmp_dir'], f"synthetic_{len(data['close'])}.csv")
+        write_python_format_csv(data, csv_path)
+    return lambda: app.parse_csv_data(csv_path)
+
+
+class SkipBenchmark(Exception):
+    """Raised by a setup when the benchmark cannot run here"""
+
+
+def build_cases() -> list:
+    """All benchmark cases in report order"""
+    cases = []
+
+    indicator_methods = [
+        name for name, attr in vars(Indicators).items()
+        if isinstance(attr, staticmethod) and not name.startswith('_')
+    ]
+    for name in indicator_methods:
+        cases.append(BenchCase(f"indicators.{name}", 'Indicators', _indicator_setup(name)))
+
+    for name in DISPATCH_INDICATORS:
+        cases.append(BenchCase(f"calculate_indicator.{name}", 'calculate_indicator', _dispatch_setup(name)))
+
+    cases += [
+        BenchCase('strategy.generate_signals', 'Strategy', _signals_setup),
+        BenchCase('backtest_engine.run', 'BacktestEngine', _backtest_setup('python'), max_bars=100_000),
+        BenchCase('backtest_engine.run[event]', 'BacktestEngine', _backtest_setup('event')),
+        BenchCase('afl_engine.run_backtest[python]', 'AFLTradingEngine', _afl_setup('python'), max_bars=100_000),
+        BenchCase('afl_engine.run_backtest[array]', 'AFLTradingEngine', _afl_setup('array')),
+        BenchCase('optimizer.optimize[pop6,gen2]', 'GeneticOptimizer', _optimizer_setup, max_bars=100_000),
+        BenchCase('timeframe_resampler.resample[5m]', 'TimeframeResampler', _resample_setup('5m')),
+        BenchCase('timeframe_resampler.resample[1D]', 'TimeframeResampler', _resample_setup('1D')),
+        BenchCase('app.parse_csv_data', 'parse_csv_data', _parse_csv_setup)
+    ]
+    return cases
+
+
+# ==================== MEASUREMENT ====================
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the engine's progress prints and info logging"""
+    logging.disable(logging.WARNING)
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            yield
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def measure(func, repeat: int, track_memory: bool) -> dict:
+    """
+    Best wall time of up to `repeat` runs, then one traced run for peak memory
+
+    Returns:
+        Dict with wall_time, runs and peak_memory_bytes (None when not tracked)
+    """
+    times = []
+    while len(times) < repeat:
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+        if sum(times) >= MIN_MEASURE_SECONDS:
+            break
+
+    peak = None
+    if track_memory:
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {'wall_time': min(times), 'runs': len(times), 'peak_memory_bytes': peak}
+
+
+def run_case(case: BenchCase, dataset: str, data: dict, ctx: dict, repeat: int, track_memory: bool) -> dict:
+    """Run one benchmark on one dataset"""
+    n_bars = len(data['close'])
+    result = {'benchmark': case.name, 'group': case.group, 'dataset': dataset, 'bars': n_bars}
+
+    if case.max_bars is not None and n_bars > case.max_bars:
+        result.update(status='skipped', reason=f"more than {case.max_bars} bars")
+        return result
+
+    try:
+        with quiet():
+            func = case.setup(data, ctx)
+            stats = measure(func, repeat, track_memory)
+    except SkipBenchmark as e:
+        result.update(status='skipped', reason=str(e))
+        return result
+    except Exception as e:
+        result.update(status='error', reason=f"{type(e).__name__}: {e}")
+        return result
+
+    result.update(status='ok', **stats)
+    result['bars_per_sec'] = n_bars / stats['wall_time'] if stats['wall_time'] > 0 else None
+    return result
+
+
+def environment_info() -> dict:
+    """Interpreter / library versions recorded with the results"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR,
+                                capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    try:
+        import numba
+        numba_version = numba.__version__
+    except ImportError:
+        numba_version = None
+
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'numba': numba_version,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'git_commit': commit
+    }
+
+
+# ==================== REPORTING ====================
+
+def format_row(result: dict) -> str:
+    label = f"{result['benchmark']:<40} {result['dataset']:<14}"
+    if result['status'] != 'ok':
+        return f"   {label} {result['status']}: {result['reason']}"
+    peak = result['peak_memory_bytes']
+    peak_str = f"{peak / 2**20:9.1f} MB" if peak is not None else '        -'
+    return (f"   {label} {result['wall_time'] * 1000:11.2f} ms "
+            f"{result['bars_per_sec']:15,.0f} bars/s {peak_str}")
+
+
+def compare_results(current: list, baseline: list, threshold: float) -> int:
+    """
+    Print wall-time ratios against a previous run
+
+    Returns:
+        Number of benchmarks slower than baseline by more than `threshold`
+    """
+    previous = {(r['benchmark'], r['dataset'], r['bars']): r for r in baseline if r.get('status') == 'ok'}
+    regressions = 0
+
+    print(f"\n📈 Comparison with baseline (threshold {threshold:.0%})")
+    for result in current:
+        key = (result['benchmark'], result['dataset'], result['bars'])
+        if result['status'] != 'ok' or key not in previous:
+            continue
+        ratio = result['wall_time'] / previous[key]['wall_time']
+        if ratio > 1 + threshold:
+            marker = '🔴 slower'
+            regressions += 1
+        elif ratio < 1 - threshold:
+            marker = '🟢 faster'
+        else:
+            marker = '   same'
+        print(f"   {result['benchmark']:<40} {result['dataset']:<14} "
+              f"{previous[key]['wall_time'] * 1000:11.2f} -> {result['wall_time'] * 1000:11.2f} ms "
+              f"({ratio:5.2f}x) {marker}")
+
+    print(f"   {regressions} regression(s)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the trading_engine package')
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help='Comma-separated synthetic dataset sizes (bars)')
+    parser.add_argument('--csv', default=DEFAULT_CSV, help="Real upload to benchmark ('' to skip)")
+    parser.add_argument('--only', action='append', default=[],
+                        help='Glob on benchmark names (repeatable), e.g. "indicators.*"')
+    parser.add_argument('--repeat', type=int, default=5, help='Max timed runs per benchmark')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the traced peak-memory run')
+    parser.add_argument('--output', help='Result JSON path (default: benchmarks/results/<timestamp>.json)')
+    parser.add_argument('--compare', help='Previous result JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Relative slowdown counted as a regression')
+    args = parser.parse_args()
+
+    cases = build_cases()
+    if args.only:
+        cases = [c for c in cases if any(fnmatch.fnmatch(c.name, pattern) for pattern in args.only)]
+
+    datasets = [('synthetic', n) for n in (int(s) for s in args.sizes.split(',') if s.strip())]
+    if args.csv:
+        datasets.append(('VN30F1M', args.csv))
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for dataset, source in datasets:
+            if dataset == 'VN30F1M':
+                data = load_ohlcv(source)
+                ctx = {'tmp_dir': tmp_dir, 'csv_path': source}
+            else:
+                data = synthetic_ohlcv(source)
+                ctx = {'tmp_dir': tmp_dir}
+
+            print(f"\n📊 {dataset}: {len(data['close']):,} bars")
+            for case in cases:
+                result = run_case(case, dataset, data, ctx, args.repeat, not args.no_memory)
+                results.append(result)
+                print(format_row(result))
+
+    report = {
+        'version': RESULT_VERSION,
+        'created_at': datetime.now().isoformat(),
+        'environment': environment_info(),
+        'results': results
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"bench_{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results saved to {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare_results(results, baseline['results'], args.threshold):
+            return 1
+
+    return 1 if any(r['status'] == 'error' for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""
+Processed Data Store
+Binary columnar cache for parsed CSV uploads
+- One directory per (CSV file, timezone offset) with a .npy file per column
+- Columns are memory-mapped on read (no JSON decoding, no re-parsing)
+- Resampled timeframe levels (the upload pyramid) are stored next to the
+  base columns, one sub-directory per timeframe
+- Entries are invalidated when the source CSV changes (mtime/size, then content hash)
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import logging
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+STORE_VERSION = 1
+
+# Column layout of parse_csv_data output
+COLUMN_DTYPES = {
+    'time': np.int64,
+    'open': np.float64,
+    'high': np.float64,
+    'low': np.float64,
+    'close': np.float64,
+    'volume': np.int64
+}
+
+META_FILENAME = 'meta.json'
+
+
+def file_hash(filepath: str, chunk_size: int = 1 << 20) -> str:
+    """BLAKE2b hash of a file's contents"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ProcessedDataStore:
+    """
+    Columnar store for processed uploads
+
+    Layout:
+        <root>/<csv name>_tz<offset>/meta.json
+        <root>/<csv name>_tz<offset>/<column>.npy
+        <root>/<csv name>_tz<offset>/tf_<timeframe>/<column>.npy
+    """
+
+    def __init__(self, root: str):
+        """
+        Args:
+            root: Directory holding the store entries (e.g. uploads/processed)
+        """
+        self.root = root
+
+    def entry_dir(self, csv_path: str, timezone_offset: int = 0) -> str:
+        """Directory of the entry for a CSV file and timezone offset"""
+        name = os.path.splitext(os.path.basename(csv_path))[0]
+        return os.path.join(self.root, f"{name}_tz{int(timezone_offset):+d}")
+
+    def save(self, csv_path: str, columns: Dict, info: Dict, timezone_offset: int = 0,
+             original_filename: Optional[str] = None, source: str = 'upload',
+             levels: Optional[Dict[str, Dict]] = None) -> Dict:
+        """
+        Write parsed columns for a CSV file
+
+        Args:
+            csv_path: Source CSV path
+            columns: Column arrays from parse_csv_data
+            info: Info dict from parse_csv_data
+            timezone_offset: Timezone offset the columns were parsed with
+            original_filename: Filename shown in the UI
+            source: 'upload' for entries written by upload_csv, 'parse' for on-demand entries
+            levels: Resampled columns per timeframe {timeframe: columns} (e.g. TimeframePyramid.levels())
+
+        Returns:
+            Entry metadata
+        """
+        stat = os.stat(csv_path)
+        meta = {
+            'version': STORE_VERSION,
+            'csv_filename': os.path.basename(csv_path),
+            'csv_mtime_ns': stat.st_mtime_ns,
+            'csv_size': stat.st_size,
+            'csv_hash': file_hash(csv_path),
+            'timezone_offset': int(timezone_offset),
+            'original_filename': original_filename or os.path.basename(csv_path),
+            'processed_at': datetime.now().isoformat(),
+            'source': source,
+            'info': info,
+            'timeframes': {timeframe: len(level['time']) for timeframe, level in (levels or {}).items()}
+        }
+
+        entry_dir = self.entry_dir(csv_path, timezone_offset)
+        tmp_dir = f"{entry_dir}.tmp{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        try:
+            self._write_columns(tmp_dir, columns)
+            for timeframe, level in (levels or {}).items():
+                level_dir = os.path.join(tmp_dir, self._level_dirname(timeframe))
+                os.makedirs(level_dir)
+                self._write_columns(level_dir, level)
+            with open(os.path.join(tmp_dir, META_FILENAME), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+
+            # Swap in the new entry
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        logger.info(f"💾 Saved processed columns: {entry_dir}")
+        return meta
+
+    def load(self, csv_path: str, timezone_offset: int = 0) -> Optional[Tuple[Dict, Dict]]:
+        """
+        Open the entry for a CSV file if it is still valid
+
+        Returns:
+            (columns, meta) with read-only memory-mapped columns, or None on miss
+        """
+        entry_dir = self.entry_dir(csv_path, timezone_offset)
+        meta = self._read_meta(entry_dir)
+        if meta is None or not self._is_fresh(entry_dir, meta, csv_path):
+            return None
+
+        try:
+            columns = self._open_columns(entry_dir)
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Unreadable processed entry {entry_dir}: {str(e)}")
+            return None
+
+        return columns, meta
+
+    def load_level(self, csv_path: str, timeframe: str, timezone_offset: int = 0) -> Optional[Dict]:
+        """
+        Open one stored timeframe level of a CSV file
+
+        Returns:
+            Read-only memory-mapped columns, or None when the entry is stale
+            or was saved without that level
+        """
+        entry_dir = self.entry_dir(csv_path, timezone_offset)
+        meta = self._read_meta(entry_dir)
+        if meta is None or timeframe not in meta.get('timeframes', {}) or not self._is_fresh(entry_dir, meta, csv_path):
+            return None
+
+        try:
+            return self._open_columns(os.path.join(entry_dir, self._level_dirname(timeframe)))
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Unreadable {timeframe} level in {entry_dir}: {str(e)}")
+            return None
+
+    def latest(self, source: str = 'upload') -> Optional[Tuple[Dict, Dict]]:
+        """
+        Most recently processed valid entry
+
+        Args:
+            source: Only consider entries written by this source (None = any)
+
+        Returns:
+            (columns, meta) or None
+        """
+        if not os.path.isdir(self.root):
+            return None
+
+        entries = []
+        for name in os.listdir(self.root):
+            entry_dir = os.path.join(self.root, name)
+            meta = self._read_meta(entry_dir)
+            if meta is None or (source is not None and meta.get('source') != source):
+                continue
+            entries.append((meta.get('processed_at', ''), entry_dir, meta))
+
+        for _, entry_dir, meta in sorted(entries, key=lambda e: e[0], reverse=True):
+            csv_path = os.path.join(os.path.dirname(self.root), meta['csv_filename'])
+            if not self._is_fresh(entry_dir, meta, csv_path):
+                continue
+            try:
+                return self._open_columns(entry_dir), meta
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ Unreadable processed entry {entry_dir}: {str(e)}")
+
+        return None
+
+    def invalidate(self, csv_path: str):
+        """Remove every entry (all timezone offsets) of a CSV file"""
+        if not os.path.isdir(self.root):
+            return
+
+        prefix = f"{os.path.splitext(os.path.basename(csv_path))[0]}_tz"
+        for name in os.listdir(self.root):
+            if name.startswith(prefix) and name[len(prefix):].lstrip('+-').isdigit():
+                shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+
+    def _read_meta(self, entry_dir: str) -> Optional[Dict]:
+        """Entry metadata, None if missing or from another store version"""
+        try:
+            with open(os.path.join(entry_dir, META_FILENAME), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get('version') != STORE_VERSION:
+            return None
+        return meta
+
+    def _is_fresh(self, entry_dir: str, meta: Dict, csv_path: str) -> bool:
+        """Check the source CSV: cheap stat first, content hash only when the stat changed"""
+        try:
+            stat = os.stat(csv_path)
+        except OSError:
+            return False
+
+        if stat.st_mtime_ns == meta['csv_mtime_ns'] and stat.st_size == meta['csv_size']:
+            return True
+
+        if stat.st_size != meta['csv_size'] or file_hash(csv_path) != meta['csv_hash']:
+            logger.info(f"🔄 Source CSV changed, processed entry is stale: {entry_dir}")
+            return False
+
+        # Touched but identical - remember the new mtime
+        meta['csv_mtime_ns'] = stat.st_mtime_ns
+        try:
+            with open(os.path.join(entry_dir, META_FILENAME), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+        except OSError:
+            pass
+        return True
+
+    @staticmethod
+    def _level_dirname(timeframe: str) -> str:
+        return f"tf_{timeframe}"
+
+    @staticmethod
+    def _write_columns(directory: str, columns: Dict):
+        for key, dtype in COLUMN_DTYPES.items():
+            np.save(os.path.join(directory, f"{key}.npy"), np.ascontiguousarray(columns[key], dtype=dtype))
+
+    def _open_columns(self, entry_dir: str) -> Dict:
+        """Memory-map every column of an entry"""
+        return {
+            key: np.load(os.path.join(entry_dir, f"{key}.npy"), mmap_mode='r')
+            for key in COLUMN_DTYPES
+        }
@@ -1,17 +1,75 @@
 """
 Real-time Streaming Module
 Streams MQTT data from DNSE/Entrade to WebSocket clients via Flask-SocketIO
+- Push-based: the MQTT connectors call the streamer on every message
+  (no polling of get_ticker / get_historical_data)
+- Updates of a symbol are coalesced: the first one after a quiet window is
+  emitted at once, a burst is sent as its latest value once per window
+- Unchanged data is not re-emitted; tick-to-emit latency is recorded
+- Candles are sent as deltas to the symbol's room: 'candle_update' (forming
+  candle changed) and 'candle_closed' (bar completed), each with a
+  per-symbol sequence number; candle_snapshot() serves gap resyncs
+- Candle state is kept per symbol on the streamer, so the sequence survives
+  a stream restart and profiles carrying the same symbol share one room
 """
 
 import logging
 import time
 import threading
+from collections import deque
 from typing import Dict, Optional
 from datetime import datetime
 import json
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Fields ignored when deciding whether a ticker changed (local receive stamps)
+VOLATILE_TICK_FIELDS = ('time',)
+
+# Latency samples kept per profile for the stats
+LATENCY_SAMPLES = 1000
+
+# Closed candles kept per symbol for resync snapshots
+CANDLE_HISTORY = 1000
+
+
+def candle_room(symbol: str) -> str:
+    """Socket.IO room receiving the candle deltas of a symbol"""
+    return f"candles:{symbol}"
+
+
+class ProfileStream:
+    """Coalescing state of one streamed profile"""
+    
+    def __init__(self, connector, symbols: list, interval: float):
+        self.connector = connector
+        self.symbols = set(symbols)
+        self.interval = interval
+        self.running = True
+        self.condition = threading.Condition()
+        self.pending = {}      # (symbol, event) -> (data, received_at, due_at)
+        self.closed = deque()  # (symbol, candle, received_at) completed bars, never coalesced
+        self.last_emit = {}    # (symbol, event) -> perf_counter of the last emit
+        self.last_sent = {}    # (symbol, event) -> data of the last emit
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)  # seconds, MQTT message -> emit
+        self.counts = {'received': 0, 'coalesced': 0, 'unchanged': 0, 'emitted': 0}
+        self.listener = None
+    
+    def stats(self) -> Dict:
+        """Counters plus tick-to-emit latency percentiles (ms)"""
+        latency = {}
+        if self.latencies:
+            samples = np.array(self.latencies) * 1000.0
+            latency = {
+                'mean': round(float(samples.mean()), 3),
+                'p50': round(float(np.percentile(samples, 50)), 3),
+                'p95': round(float(np.percentile(samples, 95)), 3),
+                'max': round(float(samples.max()), 3)
+            }
+        return dict(self.counts, latency_ms=latency)
+
 
 class RealtimeStreamer:
     """
@@ -31,12 +89,24 @@ class RealtimeStreamer:
         self.exchange_manager = exchange_manager
         
         # Streaming state
-        self.active_streams = {}  # {profile_name: {symbol: thread}}
-        self.stream_config = {}   # {profile_name: {symbols: [], interval: 0.1}}
+        self.active_streams = {}  # {profile_name: emit thread}
+        self.streams = {}         # {profile_name: ProfileStream}
         self.running = {}         # {profile_name: bool}
         
+        # Candle delta state per symbol (written by the emit threads, read by snapshots)
+        self.candle_lock = threading.Lock()
+        self.candles = {}         # {symbol: {seq, forming, closed_time, history}}
+        
         logger.info("📡 RealtimeStreamer initialized")
     
+    def _candle_state(self, symbol: str) -> Dict:
+        """Delta state of a symbol (caller holds candle_lock)"""
+        state = self.candles.get(symbol)
+        if state is None:
+            state = {'seq': 0, 'forming': None, 'closed_time': None, 'history': deque(maxlen=CANDLE_HISTORY)}
+            self.candles[symbol] = state
+        return state
+    
     def start_stream(self, profile_name: str, symbols: list, interval: float = 0.1) -> Dict:
         """
         Start real-time streaming for a profile
@@ -44,7 +114,8 @@ class RealtimeStreamer:
         Args:
             profile_name: Profile name to stream
             symbols: List of symbols to stream
-            interval: Update interval in seconds (default 0.1s = 100ms)
+            interval: Coalescing window in seconds (default 0.1s = 100ms): at most
+                      one emit per symbol and data type per window
         
         Returns:
             Dict with success status and message
@@ -62,22 +133,22 @@ class RealtimeStreamer:
             if not hasattr(connector, 'mqtt_client'):
                 return {'success': False, 'error': 'Profile is not MQTT-based'}
             
+            stream = ProfileStream(connector, symbols, float(interval))
+            stream.listener = lambda event, symbol, data, received_at: self._on_market_data(
+                stream, event, symbol, data, received_at)
+            connector.add_listener(stream.listener)
+            
             # Subscribe to symbols
             for symbol in symbols:
                 connector.subscribe_symbol(symbol, 'tick')
                 connector.subscribe_symbol(symbol, 'stockinfo')
             
-            # Store config
-            self.stream_config[profile_name] = {
-                'symbols': symbols,
-                'interval': interval
-            }
-            
-            # Start streaming thread
+            # Start emit thread (sleeps until the connector pushes data)
+            self.streams[profile_name] = stream
             self.running[profile_name] = True
             thread = threading.Thread(
                 target=self._stream_worker,
-                args=(profile_name, connector),
+                args=(profile_name, stream),
                 daemon=True
             )
             thread.start()
@@ -113,6 +184,12 @@ class RealtimeStreamer:
             
             # Stop thread
             self.running[profile_name] = False
+            stream = self.streams.pop(profile_name, None)
+            if stream is not None:
+                stream.connector.remove_listener(stream.listener)
+                with stream.condition:
+                    stream.running = False
+                    stream.condition.notify()
             
             # Wait for thread to finish
             if profile_name in self.active_streams:
@@ -121,10 +198,6 @@ class RealtimeStreamer:
                     thread.join(timeout=2)
                 del self.active_streams[profile_name]
             
-            # Clean up config
-            if profile_name in self.stream_config:
-                del self.stream_config[profile_name]
-            
             logger.info(f"🛑 Stopped streaming {profile_name}")
             return {'success': True, 'message': 'Stream stopped'}
             
@@ -132,77 +205,198 @@ class RealtimeStreamer:
             logger.error(f"❌ Stop stream error: {e}")
             return {'success': False, 'error': str(e)}
     
-    def _stream_worker(self, profile_name: str, connector):
+    def _on_market_data(self, stream: ProfileStream, event: str, symbol: str, data: Dict, received_at: float):
         """
-        Worker thread to stream data
+        Connector callback (MQTT network thread): queue the update for the emit thread
+        
+        Completed candles are queued in order and sent at once. For ticks and
+        forming candles, a symbol that has not been emitted within the window is due at once;
+        otherwise the latest data replaces the pending one and is sent when
+        the window ends. The receive time of the oldest pending update is
+        kept, so the latency covers the coalescing delay.
+        """
+        if symbol not in stream.symbols or data is None:
+            return
+        
+        key = (symbol, event)
+        with stream.condition:
+            stream.counts['received'] += 1
+            if event == 'candle':
+                stream.closed.append((symbol, data, received_at))
+                stream.condition.notify()
+                return
+            
+            pending = stream.pending.get(key)
+            if pending is not None:
+                stream.pending[key] = (data, pending[1], pending[2])
+                stream.counts['coalesced'] += 1
+                return
+            
+            due_at = max(received_at, stream.last_emit.get(key, float('-inf')) + stream.interval)
+            stream.pending[key] = (data, received_at, due_at)
+            stream.condition.notify()
+    
+    def _stream_worker(self, profile_name: str, stream: ProfileStream):
+        """
+        Emit thread: waits for pushed updates and emits them when due
         
         Args:
             profile_name: Profile name
-            connector: MQTT connector instance
+            stream: Coalescing state of the profile
         """
         logger.info(f"🚀 Stream worker started for {profile_name}")
         
-        config = self.stream_config[profile_name]
-        symbols = config['symbols']
-        interval = config['interval']
-        
-        # Initialize last update times
-        last_tick_update = {symbol: 0 for symbol in symbols}
-        last_candle_update = {symbol: 0 for symbol in symbols}
-        
-        while self.running.get(profile_name, False):
-            try:
-                current_time = time.time()
+        while True:
+            with stream.condition:
+                if not stream.running:
+                    break
                 
-                for symbol in symbols:
-                    # Stream tick data (high frequency)
-                    if current_time - last_tick_update[symbol] >= interval:
-                        ticker_data = connector.get_ticker(symbol)
-                        if ticker_data:
-                            self.socketio.emit('realtime_tick', {
-                                'profile': profile_name,
-                                'symbol': symbol,
-                                'data': ticker_data,
-                                'timestamp': datetime.now().isoformat()
-                            })
-                            last_tick_update[symbol] = current_time
-                    
-                    # Stream candle data (lower frequency - every 1 second)
-                    if current_time - last_candle_update[symbol] >= 1.0:
-                        candle_data = connector.get_historical_data(symbol, '1m', 100)
-                        if candle_data:
-                            self.socketio.emit('realtime_candle', {
-                                'profile': profile_name,
-                                'symbol': symbol,
-                                'data': candle_data[-50:],  # Send last 50 candles
-                                'timestamp': datetime.now().isoformat()
-                            })
-                            last_candle_update[symbol] = current_time
+                now = time.perf_counter()
+                due = [key for key, (_, _, due_at) in stream.pending.items() if due_at <= now]
+                if not due and not stream.closed:
+                    next_due = min((due_at for _, _, due_at in stream.pending.values()), default=None)
+                    stream.condition.wait(None if next_due is None else next_due - now)
+                    continue
                 
-                # Sleep to control update frequency
-                time.sleep(interval)
-                
-            except Exception as e:
-                logger.error(f"❌ Stream worker error: {e}")
-                time.sleep(1)  # Prevent rapid error loops
+                # Closed bars first, so a forming update never precedes the close of its bar
+                batch = [((symbol, 'candle'), (candle, received_at, now)) for symbol, candle, received_at in stream.closed]
+                stream.closed.clear()
+                batch += [(key, stream.pending.pop(key)) for key in due]
+                for key in due:
+                    stream.last_emit[key] = now
+            
+            for (symbol, event), (data, received_at, _) in batch:
+                try:
+                    self._emit(profile_name, stream, symbol, event, data, received_at)
+                except Exception as e:
+                    logger.error(f"❌ Stream worker error: {e}")
         
         logger.info(f"🛑 Stream worker stopped for {profile_name}")
     
+    def _emit(self, profile_name: str, stream: ProfileStream, symbol: str, event: str,
+              data: Dict, received_at: float):
+        """Send one coalesced update unless it equals the last one sent"""
+        if event != 'tick':
+            self._emit_candle(profile_name, stream, symbol, data, received_at, closed=event == 'candle')
+            return
+        
+        key = (symbol, event)
+        content = {k: v for k, v in data.items() if k not in VOLATILE_TICK_FIELDS}
+        if stream.last_sent.get(key) == content:
+            stream.counts['unchanged'] += 1
+            return
+        
+        self.socketio.emit('realtime_tick', {
+            'profile': profile_name,
+            'symbol': symbol,
+            'data': data,
+            'timestamp': datetime.now().isoformat()
+        })
+        
+        stream.last_sent[key] = content
+        stream.latencies.append(time.perf_counter() - received_at)
+        stream.counts['emitted'] += 1
+    
+    def _emit_candle(self, profile_name: str, stream: ProfileStream, symbol: str, candle: Dict,
+                     received_at: float, closed: bool):
+        """
+        Send candle deltas to the symbol's room
+        
+        A forming candle is sent only when it differs from the last one; a
+        forming candle with a new time closes the previous one when its close
+        was not reported (MQTT OHLC feeds). Candles not newer than the last
+        closed one (or older than the forming one) are dropped, so several
+        profiles can feed the same symbol. Every event gets the next sequence
+        number of the symbol.
+        """
+        with self.candle_lock:
+            state = self._candle_state(symbol)
+            forming = state['forming']
+            closed_time = state['closed_time']
+            is_new = closed_time is None or candle['time'] > closed_time
+            events = []
+            
+            if closed:
+                if is_new:
+                    events.append(('candle_closed', candle))
+                    if forming is not None and forming['time'] <= candle['time']:
+                        state['forming'] = None
+            elif is_new and candle != forming and (forming is None or candle['time'] >= forming['time']):
+                if forming is not None and forming['time'] != candle['time']:
+                    events.append(('candle_closed', forming))
+                events.append(('candle_update', candle))
+                state['forming'] = candle
+            
+            payloads = []
+            for name, bar in events:
+                state['seq'] += 1
+                if name == 'candle_closed':
+                    state['closed_time'] = bar['time']
+                    state['history'].append(bar)
+                payloads.append((name, {
+                    'profile': profile_name,
+                    'symbol': symbol,
+                    'seq': state['seq'],
+                    'candle': bar
+                }))
+        
+        if not payloads:
+            stream.counts['unchanged'] += 1
+            return
+        
+        for name, payload in payloads:
+            self.socketio.emit(name, payload, to=candle_room(symbol))
+        stream.latencies.append(time.perf_counter() - received_at)
+        stream.counts['emitted'] += len(payloads)
+    
+    def candle_snapshot(self, symbol: str, start=None, end=None) -> Dict:
+        """
+        Closed candles of a symbol plus the forming one (gap resync)
+        
+        Args:
+            symbol: Streamed symbol
+            start: First candle time to include (None = oldest kept)
+            end: Last candle time to include (None = newest)
+        
+        Returns:
+            Dict with seq (deltas with a higher seq follow the snapshot),
+            candles and forming
+        """
+        streamed = any(symbol in stream.symbols for stream in list(self.streams.values()))
+        with self.candle_lock:
+            state = self.candles.get(symbol)
+            if state is None:
+                result = {'success': streamed, 'symbol': symbol, 'seq': 0, 'candles': [], 'forming': None}
+                if not streamed:
+                    result['error'] = 'Symbol is not streamed'
+                return result
+            
+            candles = [bar for bar in state['history']
+                       if (start is None or bar['time'] >= start) and (end is None or bar['time'] <= end)]
+            return {
+                'success': True,
+                'symbol': symbol,
+                'seq': state['seq'],
+                'candles': candles,
+                'forming': state['forming']
+            }
+    
     def get_active_streams(self) -> Dict:
         """
         Get list of active streams
         
         Returns:
-            Dict with active streams info
+            Dict with active streams info (emit counters and tick-to-emit latency)
         """
         result = {}
         for profile_name, running in self.running.items():
-            if running:
-                config = self.stream_config.get(profile_name, {})
+            stream = self.streams.get(profile_name)
+            if running and stream is not None:
                 result[profile_name] = {
-                    'symbols': config.get('symbols', []),
-                    'interval': config.get('interval', 0.1),
-                    'running': True
+                    'symbols': sorted(stream.symbols),
+                    'interval': stream.interval,
+                    'running': True,
+                    'stats': stream.stats()
                 }
         return result
     
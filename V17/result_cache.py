@@ -0,0 +1,217 @@
+"""
+Backtest Result Cache
+Memory LRU + on-disk store of /run_backtest responses
+- Keyed by content hashes of the dataset and the strategy JSON plus the run
+  parameters (capital, commission, slippage, timeframe, ...)
+- The key also covers a hash of the trading_engine sources: results of an
+  older engine are never served after the engine code changes
+- Dataset hashes are remembered per (path, mtime, size): a repeated request
+  costs a stat, not a re-read of the CSV
+- A changed CSV or strategy gives a new key; the entry of the previous
+  contents for the same request is dropped when the new one is stored
+"""
+
+import os
+import json
+import gzip
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from data_store import file_hash
+
+logger = logging.getLogger(__name__)
+
+# Bump when the response layout or the data loading (outside trading_engine)
+# changes; engine changes are covered by the engine source hash
+CACHE_VERSION = 3
+
+ENGINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'trading_engine')
+
+ENTRY_SUFFIX = '.json.gz'
+
+
+def _digest(value) -> str:
+    """Short BLAKE2b hash of a JSON-serializable value (key order independent)"""
+    payload = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=12).hexdigest()
+
+
+def engine_hash(engine_dir: str = ENGINE_DIR) -> str:
+    """Hash of the engine's Python sources (file names and contents)"""
+    digest = hashlib.blake2b(digest_size=12)
+    for name in sorted(os.listdir(engine_dir)):
+        if name.endswith('.py'):
+            digest.update(name.encode('utf-8'))
+            digest.update(file_hash(os.path.join(engine_dir, name)).encode('ascii'))
+    return digest.hexdigest()
+
+
+class BacktestResultCache:
+    """
+    Cache of backtest responses
+
+    Layout:
+        <root>/<csv name>__<request hash>_<content hash>.json.gz
+
+    The request hash covers the file names and run parameters, the content
+    hash the dataset and strategy contents.
+    """
+
+    def __init__(self, root: str, max_memory_entries: int = 16, max_disk_entries: int = 64,
+                 engine_dir: str = ENGINE_DIR):
+        """
+        Args:
+            root: Directory holding the on-disk entries (e.g. uploads/results)
+            max_memory_entries: Responses kept in memory
+            max_disk_entries: Entry files kept on disk (least recently used removed first)
+            engine_dir: Engine package whose sources are hashed into the keys
+                        (hashed once: the running process does not reload the engine)
+        """
+        self.root = root
+        self.engine_hash = engine_hash(engine_dir)
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self._entries = OrderedDict()   # key -> response
+        self._file_hashes = {}          # path -> (mtime_ns, size, hash)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def dataset_hash(self, csv_path: str) -> str:
+        """Content hash of a dataset file, recomputed only when its mtime/size change"""
+        stat = os.stat(csv_path)
+        with self._lock:
+            known = self._file_hashes.get(csv_path)
+        if known is not None and known[:2] == (stat.st_mtime_ns, stat.st_size):
+            return known[2]
+
+        digest = file_hash(csv_path)
+        with self._lock:
+            self._file_hashes[csv_path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    def key(self, csv_path: str, strategy_name: str, strategy_config: Dict, params: Dict) -> str:
+        """
+        Cache key of a backtest request
+
+        Args:
+            csv_path: Dataset file
+            strategy_name: Strategy file name
+            strategy_config: Loaded strategy JSON
+            params: Run parameters (capital, commission, slippage, timeframe, ...)
+
+        Returns:
+            Key string (also the entry file name without suffix)
+        """
+        name = os.path.splitext(os.path.basename(csv_path))[0]
+        request_hash = _digest({'strategy': strategy_name, 'params': params})
+        content_hash = _digest({
+            'version': CACHE_VERSION,
+            'engine': self.engine_hash,
+            'dataset': self.dataset_hash(csv_path),
+            'strategy': _digest(strategy_config)
+        })
+        return f"{name}__{request_hash}_{content_hash}"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Cached response, from memory or disk (None on miss)"""
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return response
+
+        path = self._path(key)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                response = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self._remember(key, response)
+        return response
+
+    def put(self, key: str, response: Dict):
+        """Store a response in memory and on disk, replacing older contents of the same request"""
+        request_prefix = key.rsplit('_', 1)[0] + '_'
+        with self._lock:
+            for stale in [k for k in self._entries if k.startswith(request_prefix) and k != key]:
+                del self._entries[stale]
+            self._remember(key, response)
+
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            path = self._path(key)
+            tmp_path = f"{path}.tmp{os.getpid()}"
+            with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=3) as f:
+                json.dump(response, f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+
+            for name in os.listdir(self.root):
+                if name.startswith(request_prefix) and name.endswith(ENTRY_SUFFIX) and name != os.path.basename(path):
+                    os.remove(os.path.join(self.root, name))
+            self._prune()
+        except OSError as e:
+            logger.warning(f"⚠️ Could not store backtest result: {str(e)}")
+
+    def invalidate(self, csv_path: str):
+        """Remove every entry of a dataset file"""
+        prefix = f"{os.path.splitext(os.path.basename(csv_path))[0]}__"
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+            self._file_hashes.pop(csv_path, None)
+
+        if not os.path.isdir(self.root):
+            return
+        for name in os.listdir(self.root):
+            if name.startswith(prefix) and name.endswith(ENTRY_SUFFIX):
+                try:
+                    os.remove(os.path.join(self.root, name))
+                except OSError:
+                    pass
+
+    def clear(self):
+        """Drop the memory entries and counters (disk entries are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._file_hashes.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _remember(self, key: str, response: Dict):
+        """Insert into the memory LRU (caller holds the lock)"""
+        self._entries[key] = response
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_memory_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key + ENTRY_SUFFIX)
+
+    def _prune(self):
+        """Keep the max_disk_entries most recently used entry files"""
+        entries = []
+        for name in os.listdir(self.root):
+            if name.endswith(ENTRY_SUFFIX):
+                path = os.path.join(self.root, name)
+                try:
+                    entries.append((os.stat(path).st_mtime_ns, path))
+                except OSError:
+                    continue
+
+        entries.sort(reverse=True)
+        for _, path in entries[self.max_disk_entries:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -501,58 +501,82 @@ function setupSocketListeners() {
         }
     });
     
-    // Real-time MQTT candle data handler
-    socket.on('realtime_candle', (data) => {
-        console.log('🕯️ Realtime candles:', data.symbol, data.data.length);
-        
-        // Update chart if symbol matches and chart is in online mode
-        const currentSymbol = document.getElementById('symbolInput')?.value;
-        if (data.symbol === currentSymbol && currentDataSource === 'online' && chartInitialized) {
-            try {
-                // Update candlestick series with new data
-                const candles = data.data.map(c => ({
-                    time: c.time,
-                    open: c.open,
-                    high: c.high,
-                    low: c.low,
-                    close: c.close
-                }));
-                
-                if (candles.length > 0) {
-                    candlestickSeries.setData(candles);
-                    
-                    // Update volume series
-                    const volumes = data.data.map(c => ({
-                        time: c.time,
-                        value: c.volume,
-                        color: c.close >= c.open ? '#26a69a80' : '#ef535080'
-                    }));
-                    if (volumeVisible && volumeSeries) volumeSeries.setData(volumes);
-
-                    // Force scale update to ensure volume displays correctly
-                    chart.applyOptions({
-                        leftPriceScale: {
-                            visible: true,
-                            mode: 0,  // 0 = Normal (absolute values), not percentage
-                            autoScale: true,
-                            scaleMargins: {
-                                top: 0.8,  // Volume takes 20% of chart height
-                                bottom: 0,
-                            },
-                        },
-                    });
+    // Real-time candle deltas: forming candle updates, closed bars, sequence gap resyncs
+    let candleSymbol = null;       // Symbol whose candle room we joined
+    let candleSeq = 0;             // Last applied sequence number
+    let candleResyncPending = true;
+    let lastClosedCandleTime = null;
+    let lastAppliedCandleTime = null;
+
+    function subscribeCandles(force) {
+        const symbol = document.getElementById('symbolInput')?.value;
+        if (!symbol || (symbol === candleSymbol && !force)) return;
+        if (candleSymbol && candleSymbol !== symbol) {
+            socket.emit('unsubscribe_candles', { symbol: candleSymbol });
+        }
+        candleSymbol = symbol;
+        candleResyncPending = true;
+        lastClosedCandleTime = null;
+        socket.emit('subscribe_candles', { symbol: symbol });
+    }
 
-                    // Update price display with latest candle
-                    const lastCandle = candles[candles.length - 1];
-                    const lastVolume = data.data[data.data.length - 1].volume;
-                    updatePriceDisplay(lastCandle, lastVolume);
-                    
-                    console.log('✅ Chart updated with real-time data');
-                }
-            } catch (error) {
-                console.error('❌ Error updating chart with realtime data:', error);
+    function applyCandle(c) {
+        if (currentDataSource !== 'online' || !chartInitialized) return;
+        if (lastAppliedCandleTime !== null && c.time < lastAppliedCandleTime) return;
+        try {
+            candlestickSeries.update({ time: c.time, open: c.open, high: c.high, low: c.low, close: c.close });
+            if (volumeVisible && volumeSeries) {
+                volumeSeries.update({
+                    time: c.time,
+                    value: c.volume,
+                    color: c.close >= c.open ? '#26a69a80' : '#ef535080'
+                });
             }
+            lastAppliedCandleTime = c.time;
+            updatePriceDisplay(c, c.volume);
+        } catch (error) {
+            console.error('❌ Error applying realtime candle:', error);
+        }
+    }
+
+    // Returns true when the delta is the next one in sequence; requests a resync on a gap
+    function acceptCandleDelta(data) {
+        if (data.symbol !== candleSymbol || candleResyncPending || data.seq <= candleSeq) return false;
+        if (data.seq !== candleSeq + 1) {
+            console.warn(`⚠️ Candle gap for ${data.symbol}: got seq ${data.seq}, expected ${candleSeq + 1} - resyncing`);
+            candleResyncPending = true;
+            socket.emit('candle_resync', { symbol: data.symbol, start: lastClosedCandleTime });
+            return false;
+        }
+        candleSeq = data.seq;
+        return true;
+    }
+
+    // Listeners are set up after the socket may already be connected: subscribe now,
+    // and again on every (re)connect since the server drops room membership
+    socket.on('connect', () => subscribeCandles(true));
+    if (socket.connected) subscribeCandles(true);
+    document.getElementById('symbolInput')?.addEventListener('change', () => subscribeCandles(false));
+
+    socket.on('candle_snapshot', (data) => {
+        if (data.symbol !== candleSymbol) return;
+        (data.candles || []).forEach(applyCandle);
+        if (data.candles && data.candles.length > 0) {
+            lastClosedCandleTime = data.candles[data.candles.length - 1].time;
         }
+        if (data.forming) applyCandle(data.forming);
+        candleSeq = data.seq || 0;
+        candleResyncPending = false;
+    });
+
+    socket.on('candle_update', (data) => {
+        if (acceptCandleDelta(data)) applyCandle(data.candle);
+    });
+
+    socket.on('candle_closed', (data) => {
+        if (!acceptCandleDelta(data)) return;
+        lastClosedCandleTime = data.candle.time;
+        applyCandle(data.candle);
     });
 }
 
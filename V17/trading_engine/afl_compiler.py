@@ -0,0 +1,481 @@
+"""
+AFL Compiler
+Compiles AmiBroker AFL scripts into vectorized NumPy evaluation plans
+- Supported subset: numbers, OHLCV arrays, variables, arithmetic / comparison /
+  logical operators, IIf, Ref, Cross, MA, EMA, HHV, LLV, Param/Optimize and the
+  other afl_primitives functions
+- Buy / Short assignments become the buy_signal / short_signal arrays consumed
+  by AFLTradingEngine.run_backtest
+- Each statement compiles once into a closure over whole arrays; compiled
+  programs are cached by script hash
+"""
+
+import re
+import hashlib
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Optional, Callable, Any
+
+from .indicators import Indicators
+from . import afl_primitives as afl
+
+
+class AFLCompileError(ValueError):
+    """Script uses syntax or functions outside the supported AFL subset"""
+
+
+# ==================== TOKENIZER ====================
+
+_TOKEN_RE = re.compile(r"""
+    (?P<skip>[ \t\r\f\v]+|//[^\n]*|/\*.*?\*/)
+  | (?P<newline>\n)
+  | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+  | (?P<string>"[^"\n]*")
+  | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<op>==|!=|<=|>=|&&|\|\||[-+*/%^<>=(),;])
+""", re.VERBOSE | re.DOTALL)
+
+_KEYWORDS = {'and': '&&', 'or': '||', 'not': 'not'}
+
+
+def _tokenize(script: str) -> List[Tuple[str, Any, int]]:
+    """Split a script into (kind, value, line) tokens"""
+    tokens = []
+    line = 1
+    pos = 0
+    while pos < len(script):
+        match = _TOKEN_RE.match(script, pos)
+        if match is None:
+            raise AFLCompileError(f"Unexpected character {script[pos]!r} on line {line}")
+        kind = match.lastgroup
+        text = match.group()
+        if kind == 'number':
+            tokens.append(('number', float(text), line))
+        elif kind == 'string':
+            tokens.append(('string', text[1:-1], line))
+        elif kind == 'name':
+            lowered = text.lower()
+            if lowered in _KEYWORDS:
+                tokens.append(('op', _KEYWORDS[lowered], line))
+            else:
+                tokens.append(('name', lowered, line))
+        elif kind == 'op':
+            tokens.append(('op', text, line))
+        line += text.count('\n')
+        pos = match.end()
+    tokens.append(('end', None, line))
+    return tokens
+
+
+# ==================== PARSER ====================
+# AST nodes are tuples: ('num', value) ('str', text) ('var', name)
+# ('call', name, args, line) ('unary', op, operand) ('binop', op, left, right)
+
+# Binary operator levels, lowest precedence first
+_BINARY_LEVELS = (('||',), ('&&',), ('==', '!='), ('<', '>', '<=', '>='), ('+', '-'), ('*', '/', '%'))
+_NOT_LEVEL = 2  # NOT binds looser than comparisons: NOT a > b == NOT (a > b)
+
+
+class _Parser:
+    """Recursive-descent parser for the supported AFL subset"""
+
+    def __init__(self, tokens: List[Tuple[str, Any, int]]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self) -> Tuple[str, Any, int]:
+        return self.tokens[self.pos]
+
+    def take(self) -> Tuple[str, Any, int]:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def expect(self, value: str):
+        kind, text, line = self.take()
+        if kind != 'op' or text != value:
+            found = 'end of script' if kind == 'end' else repr(text)
+            raise AFLCompileError(f"Expected '{value}' on line {line}, found {found}")
+
+    def program(self) -> List[Tuple]:
+        """Statements as ('assign', name, expr, line) or ('expr', expr, line)"""
+        statements = []
+        while self.peek()[0] != 'end':
+            kind, value, line = self.peek()
+            if kind == 'op' and value == ';':
+                self.take()
+                continue
+            if kind == 'name' and self.tokens[self.pos + 1][:2] == ('op', '='):
+                self.pos += 2
+                statements.append(('assign', value, self.expression(), line))
+            else:
+                statements.append(('expr', self.expression(), line))
+            self.expect(';')
+        return statements
+
+    def expression(self, level: int = 0):
+        if level == _NOT_LEVEL and self.peek()[:2] == ('op', 'not'):
+            self.take()
+            return ('unary', 'not', self.expression(level))
+        if level == len(_BINARY_LEVELS):
+            return self.unary()
+
+        left = self.expression(level + 1)
+        while self.peek()[0] == 'op' and self.peek()[1] in _BINARY_LEVELS[level]:
+            op = self.take()[1]
+            left = ('binop', op, left, self.expression(level + 1))
+        return left
+
+    def unary(self):
+        if self.peek()[:2] in (('op', '-'), ('op', '+')):
+            op = self.take()[1]
+            operand = self.unary()
+            return operand if op == '+' else ('unary', '-', operand)
+        return self.power()
+
+    def power(self):
+        base = self.primary()
+        if self.peek()[:2] == ('op', '^'):
+            self.take()
+            return ('binop', '^', base, self.unary())
+        return base
+
+    def primary(self):
+        kind, value, line = self.take()
+        if kind == 'number':
+            return ('num', value)
+        if kind == 'string':
+            return ('str', value)
+        if kind == 'name':
+            if self.peek()[:2] == ('op', '('):
+                self.take()
+                args = []
+                if self.peek()[:2] != ('op', ')'):
+                    args.append(self.expression())
+                    while self.peek()[:2] == ('op', ','):
+                        self.take()
+                        args.append(self.expression())
+                self.expect(')')
+                return ('call', value, args, line)
+            return ('var', value, line)
+        if kind == 'op' and value == '(':
+            inner = self.expression()
+            self.expect(')')
+            return inner
+        found = 'end of script' if kind == 'end' else repr(value)
+        raise AFLCompileError(f"Unexpected {found} on line {line}")
+
+
+# ==================== RUNTIME HELPERS ====================
+
+def _truth(value) -> np.ndarray:
+    """AFL truth value: non-zero and not Null"""
+    value = np.asarray(value, dtype=np.float64)
+    return np.nan_to_num(value, nan=0.0) != 0
+
+
+def _as_number(flags):
+    """Boolean result as AFL number (1 / 0)"""
+    return np.asarray(flags, dtype=np.float64) if np.ndim(flags) else float(flags)
+
+
+def _period(value, function: str) -> int:
+    """Window length argument: a positive whole number"""
+    if np.ndim(value) != 0 or isinstance(value, str) or not np.isfinite(value) or value != int(value) or value < 1:
+        raise AFLCompileError(f"{function}() period must be a positive whole number, got {value!r}")
+    return int(value)
+
+
+def _ma(array, periods):
+    """MA - trailing simple moving average (Null for the first periods-1 bars)"""
+    periods = _period(periods, 'MA')
+    return afl.moving_sum(array, periods) / periods
+
+
+def _ema(array, periods):
+    """EMA - Indicators.ema started at the first non-Null bar"""
+    periods = _period(periods, 'EMA')
+    values = np.asarray(array, dtype=np.float64)
+    result = np.full(len(values), np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid):
+        start = valid[0]
+        result[start:] = Indicators.ema(values[start:], periods)
+    return result
+
+
+def _ref(array, offset):
+    if np.ndim(offset) != 0 or offset != int(offset):
+        raise AFLCompileError(f"Ref() offset must be a whole number, got {offset!r}")
+    return afl.ref(array, int(offset))
+
+
+def _windowed(function, name):
+    return lambda array, periods: function(array, _period(periods, name))
+
+
+def _nth(function, name):
+    return lambda condition, array, n=1: function(condition, array, _period(n, name))
+
+
+# name -> (implementation, min args, max args)
+FUNCTIONS = {
+    'iif': (afl.iif, 3, 3),
+    'ref': (_ref, 2, 2),
+    'cross': (lambda a, b: _as_number(afl.cross(a, b)), 2, 2),
+    'ma': (_ma, 2, 2),
+    'ema': (_ema, 2, 2),
+    'hhv': (_windowed(afl.hhv, 'HHV'), 2, 2),
+    'llv': (_windowed(afl.llv, 'LLV'), 2, 2),
+    'sum': (_windowed(afl.moving_sum, 'Sum'), 2, 2),
+    'barssince': (afl.bars_since, 1, 1),
+    'valuewhen': (_nth(afl.value_when, 'ValueWhen'), 2, 3),
+    'highestsince': (afl.highest_since, 2, 2),
+    'lowestsince': (afl.lowest_since, 2, 2),
+    'cum': (afl.cum, 1, 1),
+    'abs': (np.abs, 1, 1),
+    'max': (np.maximum, 2, 2),
+    'min': (np.minimum, 2, 2)
+}
+
+# Script parameters: Param("name", default, ...) / Optimize("name", default, min, max, step)
+PARAM_FUNCTIONS = ('param', 'optimize')
+
+# Display / setup calls with no effect on signals (skipped when used as statements)
+IGNORED_FUNCTIONS = ('plot', 'plotshapes', 'plotohlc', 'setoption', 'settradedelays',
+                     'setchartoptions', 'setpositionsize', 'setbarsrequired',
+                     '_section_begin', '_section_end', 'printf', '_trace')
+
+# Built-in price arrays -> data keys
+PRICE_ARRAYS = {
+    'open': 'open', 'o': 'open',
+    'high': 'high', 'h': 'high',
+    'low': 'low', 'l': 'low',
+    'close': 'close', 'c': 'close',
+    'volume': 'volume', 'v': 'volume'
+}
+
+CONSTANTS = {'true': 1.0, 'false': 0.0, 'null': np.nan}
+
+_BINARY = {
+    '+': np.add,
+    '-': np.subtract,
+    '*': np.multiply,
+    '/': np.divide,
+    '%': np.fmod,
+    '^': np.power,
+    '<': lambda a, b: _as_number(np.less(a, b)),
+    '>': lambda a, b: _as_number(np.greater(a, b)),
+    '<=': lambda a, b: _as_number(np.less_equal(a, b)),
+    '>=': lambda a, b: _as_number(np.greater_equal(a, b)),
+    '==': lambda a, b: _as_number(np.equal(a, b)),
+    '!=': lambda a, b: _as_number(np.not_equal(a, b)),
+    '&&': lambda a, b: _as_number(_truth(a) & _truth(b)),
+    '||': lambda a, b: _as_number(_truth(a) | _truth(b))
+}
+
+
+# ==================== COMPILER ====================
+
+class AFLProgram:
+    """
+    Compiled AFL script
+
+    Usage:
+        program = compile_afl(script)
+        signals = program.signals(data)               # {'buy_signal', 'short_signal'}
+        result = engine.run_backtest(data, signals)
+    """
+
+    def __init__(self, script: str, script_hash: str):
+        self.script_hash = script_hash
+        self.steps = []        # (variable, evaluate(env, params)) in script order
+        self.params = {}       # Param/Optimize name -> default value
+        self.variables = []    # assigned variable names, first assignment order
+        self._compile(script)
+
+    def _compile(self, script: str):
+        assigned = set()
+        for statement in _Parser(_tokenize(script)).program():
+            if statement[0] == 'assign':
+                _, name, expr, line = statement
+                if name in PRICE_ARRAYS or name in CONSTANTS:
+                    raise AFLCompileError(f"Cannot assign to built-in '{name}' on line {line}")
+                self.steps.append((name, self._expr(expr, assigned)))
+                if name not in assigned:
+                    assigned.add(name)
+                    self.variables.append(name)
+            else:
+                _, expr, line = statement
+                if expr[0] != 'call' or expr[1] not in IGNORED_FUNCTIONS:
+                    raise AFLCompileError(f"Statement on line {line} is not an assignment")
+
+        if 'buy' not in assigned and 'short' not in assigned:
+            raise AFLCompileError("Script assigns neither Buy nor Short")
+
+    def _expr(self, node, assigned: set) -> Callable:
+        """AST node -> closure(env, params) returning a scalar or array"""
+        kind = node[0]
+
+        if kind == 'num':
+            value = node[1]
+            return lambda env, params: value
+
+        if kind == 'str':
+            raise AFLCompileError(f"String \"{node[1]}\" is only allowed as a Param/Optimize name")
+
+        if kind == 'var':
+            _, name, line = node
+            if name in assigned:
+                return lambda env, params: env[name]
+            if name in PRICE_ARRAYS:
+                key = PRICE_ARRAYS[name]
+                return lambda env, params: env['__data__'][key]
+            if name in CONSTANTS:
+                value = CONSTANTS[name]
+                return lambda env, params: value
+            raise AFLCompileError(f"Undefined variable '{name}' on line {line}")
+
+        if kind == 'unary':
+            _, op, operand = node
+            operand = self._expr(operand, assigned)
+            if op == '-':
+                return lambda env, params: np.negative(operand(env, params))
+            return lambda env, params: _as_number(~_truth(operand(env, params)))
+
+        if kind == 'binop':
+            _, op, left, right = node
+            left, right = self._expr(left, assigned), self._expr(right, assigned)
+            func = _BINARY[op]
+            return lambda env, params: func(left(env, params), right(env, params))
+
+        _, name, args, line = node
+        if name in PARAM_FUNCTIONS:
+            return self._param(name, args, line)
+        if name not in FUNCTIONS:
+            raise AFLCompileError(f"Unsupported function '{name}' on line {line}")
+
+        func, min_args, max_args = FUNCTIONS[name]
+        if not min_args <= len(args) <= max_args:
+            raise AFLCompileError(f"{name}() takes {min_args}-{max_args} arguments, got {len(args)} on line {line}")
+        args = [self._expr(arg, assigned) for arg in args]
+        return lambda env, params: func(*[arg(env, params) for arg in args])
+
+    def _param(self, function: str, args: List, line: int) -> Callable:
+        """Param/Optimize: script default, overridable by name at run time"""
+        if len(args) < 2 or args[0][0] != 'str':
+            raise AFLCompileError(f"{function}() needs a name string and a default on line {line}")
+        default = args[1]
+        if default[0] == 'unary' and default[1] == '-' and default[2][0] == 'num':
+            default = ('num', -default[2][1])
+        if default[0] != 'num':
+            raise AFLCompileError(f"{function}() default must be a number on line {line}")
+
+        name, value = args[0][1], default[1]
+        self.params[name] = value
+        return lambda env, params: params.get(name, value)
+
+    def evaluate(self, data: Dict[str, np.ndarray], params: Optional[Dict] = None) -> Dict[str, Any]:
+        """
+        Run the plan on a dataset
+
+        Args:
+            data: OHLCV arrays ('open', 'high', 'low', 'close', 'volume')
+            params: Param/Optimize overrides by name
+
+        Returns:
+            Dict variable name (lower case) -> final value
+        """
+        params = params or {}
+        env = {'__data__': {key: np.asarray(values, dtype=np.float64)
+                            for key, values in data.items() if key in PRICE_ARRAYS.values()}}
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for name, evaluate in self.steps:
+                env[name] = evaluate(env, params)
+        del env['__data__']
+        return env
+
+    def signals(self, data: Dict[str, np.ndarray], params: Optional[Dict] = None) -> Dict[str, np.ndarray]:
+        """
+        Entry signals for AFLTradingEngine.run_backtest
+
+        Returns:
+            Dict with 'buy_signal' and 'short_signal' boolean arrays
+            (an unassigned Buy or Short is all False)
+        """
+        n_bars = len(data['close'])
+        env = self.evaluate(data, params)
+        return {
+            'buy_signal': np.broadcast_to(_truth(env.get('buy', 0.0)), n_bars).copy(),
+            'short_signal': np.broadcast_to(_truth(env.get('short', 0.0)), n_bars).copy()
+        }
+
+
+class AFLPlanCache:
+    """
+    LRU cache of compiled AFL programs keyed on the script hash
+
+    Programs hold no data, so one compiled plan is shared by every
+    backtest and optimizer run of the same script.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # script hash -> AFLProgram
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, script_hash: str) -> Optional[AFLProgram]:
+        with self._lock:
+            program = self._entries.get(script_hash)
+            if program is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(script_hash)
+            self.hits += 1
+            return program
+
+    def put(self, program: AFLProgram):
+        with self._lock:
+            self._entries[program.script_hash] = program
+            self._entries.move_to_end(program.script_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Process-wide compiled plan cache
+shared_afl_plan_cache = AFLPlanCache()
+
+
+def compile_afl(script: str, cache: Optional[AFLPlanCache] = shared_afl_plan_cache) -> AFLProgram:
+    """
+    Compile an AFL script (or fetch its cached plan)
+
+    Args:
+        script: AFL source
+        cache: Plan cache (defaults to the process-wide cache, None disables)
+
+    Returns:
+        AFLProgram
+
+    Raises:
+        AFLCompileError: Syntax or functions outside the supported subset
+    """
+    script_hash = hashlib.blake2b(script.encode('utf-8'), digest_size=16).hexdigest()
+    if cache is not None:
+        program = cache.get(script_hash)
+        if program is not None:
+            return program
+
+    program = AFLProgram(script, script_hash)
+    if cache is not None:
+        cache.put(program)
+    return program
@@ -8,7 +8,49 @@ Complete implementation based on MT5_trading_engine.afl
 
 import numpy as np
 from typing import Dict, Tuple, Optional, List
+import time as _time
 from datetime import datetime, time
+from . import afl_kernel
+from .afl_compiler import compile_afl
+
+
+# Dynamic TP/SL tables: (min_profit, tp_points, sl_points, trailing_points, trailing_pct)
+# First row with profit >= min_profit applies; trailing_pct means profit / 100 * pct
+DYNAMIC_TP_SL_BUY = [  # AFL lines 1088-1184
+    (28, None, 10, None, 55),
+    (26, None, 10, None, 61),
+    (24, None, 10, None, 65),
+    (22, None, 10, None, 68),
+    (20, None, 10, None, 68),
+    (18, None, 10, None, 68),
+    (16, None, 10, None, 68),
+    (14, None, 10, 8.2, None),
+    (12, None, 10, 10.1, None),
+    (10, None, 1, 12, None),
+    (8, None, 1.2, 9.5, None),
+    (6, None, 4, 10.1, None),
+    (4, None, 5.5, 9.8, None),
+    (2, None, 10.8, 13.9, None),
+    (-float('inf'), None, 10.3, 11.9, None)
+]
+
+DYNAMIC_TP_SL_SHORT = [  # AFL lines 1219-1312
+    (28, None, 10, None, 55),
+    (26, None, 10, None, 61),
+    (24, None, 10, None, 65),
+    (22, None, 10, None, 68),
+    (20, None, 10, None, 68),
+    (18, None, 10, None, 68),
+    (16, None, 10, None, 68),
+    (14, None, 10, 8.2, None),
+    (12, None, 10, 10.1, None),
+    (10, None, 1, 12, None),
+    (8, None, 1.2, 9.5, None),
+    (6, None, 4, 10.1, None),
+    (4, None, 5.5, 9.8, None),
+    (2, None, 10.8, 13.9, None),
+    (-float('inf'), None, 10.3, 11.9, None)
+]
 
 
 class AFLTradingEngine:
@@ -94,36 +136,7 @@ class AFLTradingEngine:
         Returns: (tp_points, sl_points, trailing_points)
         Based on AFL lines 1088-1184
         """
-        if profit >= 28:
-            return None, 10, profit / 100 * 55
-        elif profit >= 26:
-            return None, 10, profit / 100 * 61
-        elif profit >= 24:
-            return None, 10, profit / 100 * 65
-        elif profit >= 22:
-            return None, 10, profit / 100 * 68
-        elif profit >= 20:
-            return None, 10, profit / 100 * 68
-        elif profit >= 18:
-            return None, 10, profit / 100 * 68
-        elif profit >= 16:
-            return None, 10, profit / 100 * 68
-        elif profit >= 14:
-            return None, 10, 8.2
-        elif profit >= 12:
-            return None, 10, 10.1
-        elif profit >= 10:
-            return None, 1, 12
-        elif profit >= 8:
-            return None, 1.2, 9.5
-        elif profit >= 6:
-            return None, 4, 10.1
-        elif profit >= 4:
-            return None, 5.5, 9.8
-        elif profit >= 2:
-            return None, 10.8, 13.9
-        else:
-            return None, 10.3, 11.9
+        return self._lookup_dynamic_tp_sl(DYNAMIC_TP_SL_BUY, profit)
     
     def _get_dynamic_tp_sl_short(self, profit: float) -> Tuple[Optional[float], float, float]:
         """
@@ -131,48 +144,113 @@ class AFLTradingEngine:
         Returns: (tp_points, sl_points, trailing_points)
         Based on AFL lines 1219-1312
         """
-        if profit >= 28:
-            return None, 10, profit / 100 * 55
-        elif profit >= 26:
-            return None, 10, profit / 100 * 61
-        elif profit >= 24:
-            return None, 10, profit / 100 * 65
-        elif profit >= 22:
-            return None, 10, profit / 100 * 68
-        elif profit >= 20:
-            return None, 10, profit / 100 * 68
-        elif profit >= 18:
-            return None, 10, profit / 100 * 68
-        elif profit >= 16:
-            return None, 10, profit / 100 * 68
-        elif profit >= 14:
-            return None, 10, 8.2
-        elif profit >= 12:
-            return None, 10, 10.1
-        elif profit >= 10:
-            return None, 1, 12
-        elif profit >= 8:
-            return None, 1.2, 9.5
-        elif profit >= 6:
-            return None, 4, 10.1
-        elif profit >= 4:
-            return None, 5.5, 9.8
-        elif profit >= 2:
-            return None, 10.8, 13.9
-        else:
-            return None, 10.3, 11.9
+        return self._lookup_dynamic_tp_sl(DYNAMIC_TP_SL_SHORT, profit)
     
-    def run_backtest(self, data: Dict[str, np.ndarray], signals: Dict[str, np.ndarray]) -> Dict:
+    @staticmethod
+    def _lookup_dynamic_tp_sl(levels: List[Tuple], profit: float) -> Tuple[Optional[float], float, float]:
+        """First level with profit >= min_profit (last level otherwise)"""
+        for min_profit, tp_points, sl_points, trailing_points, trailing_pct in levels:
+            if profit >= min_profit:
+                break
+        
+        if trailing_pct is not None:
+            trailing_points = profit / 100 * trailing_pct
+        
+        return tp_points, sl_points, trailing_points
+    
+    def _precompute_time(self, data: Dict, n_bars: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Precompute in-session mask and HHMMSS time-of-day for every bar
+        
+        Numeric timestamps are epoch seconds converted to local time like
+        datetime.fromtimestamp; datetime64 values are taken as wall-clock time.
+        
+        Returns:
+            (in_time_range, itime) arrays
+        """
+        if 'time' not in data:
+            return np.ones(n_bars, dtype=bool), np.full(n_bars, 100000, dtype=np.int64)
+        
+        times = np.asarray(data['time'])
+        tod_us = None
+        
+        if times.dtype.kind == 'M':
+            wall_us = times.astype('datetime64[us]').astype(np.int64)
+            tod_us = wall_us % 86_400_000_000
+        elif times.dtype.kind in 'iu' or (times.dtype.kind == 'f' and np.all(np.floor(times) == times)):
+            epoch = times.astype(np.int64)
+            local = epoch + self._local_utc_offsets(epoch)
+            tod_us = (local % 86400) * 1_000_000
+        
+        if tod_us is None:
+            # Fractional or object timestamps: same conversion as the bar loop
+            in_time_range = np.zeros(n_bars, dtype=bool)
+            itime = np.zeros(n_bars, dtype=np.int64)
+            for i in range(1, n_bars):
+                dt = times[i]
+                if isinstance(dt, (int, float)):
+                    dt = datetime.fromtimestamp(dt)
+                in_time_range[i] = self._in_time_range(dt)
+                itime[i] = self._time_to_int(dt)
+            return in_time_range, itime
+        
+        start_us = (self.start_time.hour * 3600 + self.start_time.minute * 60 + self.start_time.second) * 1_000_000
+        end_us = (self.end_time.hour * 3600 + self.end_time.minute * 60 + self.end_time.second) * 1_000_000
+        in_time_range = (tod_us >= start_us) & (tod_us <= end_us)
+        
+        tod = tod_us // 1_000_000
+        itime = (tod // 3600) * 10000 + (tod % 3600 // 60) * 100 + tod % 60
+        
+        return in_time_range, itime
+    
+    @staticmethod
+    def _local_utc_offsets(epoch: np.ndarray) -> np.ndarray:
+        """
+        Local UTC offset (seconds) for each epoch timestamp
+        
+        Offsets are looked up once per day bucket; days containing a DST
+        transition are resolved bar by bar.
+        """
+        def offset(ts: int) -> int:
+            return _time.localtime(ts).tm_gmtoff
+        
+        days, inverse = np.unique(epoch // 86400, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        day_offsets = np.empty(len(days), dtype=np.int64)
+        mixed = []
+        
+        for k, day in enumerate(days.tolist()):
+            first = offset(day * 86400)
+            day_offsets[k] = first
+            if first != offset(day * 86400 + 86399):
+                mixed.append(k)
+        
+        offsets = day_offsets[inverse]
+        for k in mixed:
+            for i in np.flatnonzero(inverse == k):
+                offsets[i] = offset(int(epoch[i]))
+        
+        return offsets
+    
+    def run_backtest(self, data: Dict[str, np.ndarray], signals: Dict[str, np.ndarray],
+                     backend: str = 'python') -> Dict:
         """
         Run backtest with AFL logic
         
         Args:
             data: OHLCV data with 'open', 'high', 'low', 'close', 'time'
             signals: Entry signals with 'buy_signal', 'short_signal'
+            backend: 'python' (per-bar loop) or 'array' (precomputed time arrays +
+                     array kernel, numba-compiled when available)
         
         Returns:
             Dict with trades and statistics
         """
+        if backend == 'array':
+            return self._run_backtest_array(data, signals)
+        elif backend != 'python':
+            raise ValueError(f"Unknown backend: {backend}")
+        
         n_bars = len(data['close'])
         
         # Initialize arrays
@@ -430,6 +508,125 @@ class AFLTradingEngine:
             }
         }
     
+    def run_afl_backtest(self, data: Dict[str, np.ndarray], script: str, params: Optional[Dict] = None,
+                         backend: str = 'python') -> Dict:
+        """
+        Run backtest with entry signals from an AFL script
+        
+        Args:
+            data: OHLCV data with 'open', 'high', 'low', 'close', 'time'
+            script: AFL source assigning Buy and/or Short (compiled plans are cached)
+            params: Param/Optimize overrides by name
+            backend: Same as run_backtest
+        
+        Returns:
+            Dict with trades and statistics
+        """
+        signals = compile_afl(script).signals(data, params)
+        return self.run_backtest(data, signals, backend=backend)
+    
+    def _run_backtest_array(self, data: Dict[str, np.ndarray], signals: Dict[str, np.ndarray]) -> Dict:
+        """
+        Array backend for run_backtest - same results as the per-bar loop
+        
+        Trades are also returned as a structured array under 'trade_records'.
+        """
+        n_bars = len(data['close'])
+        
+        in_time_range, itime = self._precompute_time(data, n_bars)
+        
+        open_ = np.asarray(data['open'], dtype=np.float64)
+        high = np.asarray(data['high'], dtype=np.float64)
+        low = np.asarray(data['low'], dtype=np.float64)
+        buy_signal = np.asarray(signals['buy_signal'], dtype=bool)
+        short_signal = np.asarray(signals['short_signal'], dtype=bool)
+        
+        signal_arrays = {
+            key: np.zeros(n_bars, dtype=bool) if key in ('buy', 'sell', 'short', 'cover') else np.zeros(n_bars)
+            for key in afl_kernel.SIGNAL_KEYS
+        }
+        line_arrays = {key: np.full(n_bars, np.nan) for key in afl_kernel.LINE_KEYS}
+        
+        # At most one exit per bar (an exit and a new entry can share a bar)
+        trades = np.zeros(n_bars, dtype=afl_kernel.TRADE_DTYPE)
+        state = np.zeros(len(afl_kernel.STATE_KEYS))
+        
+        if afl_kernel.NUMBA_AVAILABLE:
+            inputs = (open_, high, low, in_time_range, itime, buy_signal, short_signal)
+        else:
+            # Plain Python indexing is faster on lists than on numpy scalars
+            inputs = tuple(arr.tolist() for arr in (open_, high, low, in_time_range, itime, buy_signal, short_signal))
+        
+        n_trades = afl_kernel.afl_backtest_kernel(
+            *inputs,
+            bool(self.active), bool(self.buy_active), bool(self.short_active),
+            self.buy_order_limit, self.short_order_limit, float(self.fee_tax),
+            afl_kernel.levels_to_array(DYNAMIC_TP_SL_BUY),
+            afl_kernel.levels_to_array(DYNAMIC_TP_SL_SHORT),
+            *signal_arrays.values(),
+            *line_arrays.values(),
+            trades, state
+        )
+        trades = trades[:n_trades]
+        
+        self._restore_state(dict(zip(afl_kernel.STATE_KEYS, state.tolist())))
+        
+        trade_list = [
+            {
+                'entry_bar': int(t['entry_bar']),
+                'exit_bar': int(t['exit_bar']),
+                'type': afl_kernel.TRADE_TYPES[int(t['type'])],
+                'entry_price': float(t['entry_price']),
+                'exit_price': float(t['exit_price']),
+                'profit': float(t['profit']),
+                'max_profit': float(t['max_profit']),
+                'exit_reason': afl_kernel.EXIT_REASONS[int(t['exit_reason'])],
+                'bars_held': int(t['bars_held'])
+            }
+            for t in trades
+        ]
+        
+        # Stats
+        stats = self._calculate_stats(trade_list, data)
+        
+        return {
+            'trades': trade_list,
+            'trade_records': trades,
+            'stats': stats,
+            'signals': signal_arrays,
+            'lines': line_arrays
+        }
+    
+    def _restore_state(self, state: Dict):
+        """Set position tracking to the final state reported by the array kernel"""
+        self.reset_position()
+        self.position = int(state['position'])
+        self.buy_count = int(state['buy_count'])
+        self.short_count = int(state['short_count'])
+        
+        if self.position == 0:
+            return
+        
+        self.entry_price = state['entry_price']
+        self.entry_bar = int(state['entry_bar'])
+        
+        # NaN marks levels that are not set (None in the bar loop)
+        tp, sl, trailing = (state[key] if state[key] == state[key] else None
+                            for key in ('tp', 'sl', 'trailing'))
+        
+        if self.position == 1:
+            self.hhv_since_buy = state['hhv_since_buy']
+            self.hhv_buy_profit = state['hhv_buy_profit']
+            self.tp_buy = tp
+            self.sl_buy = sl
+            self.trailing_buy = trailing
+        else:
+            self.llv_since_short = state['llv_since_short']
+            self.hhv_short_profit = state['hhv_short_profit']
+            self.tp_short = tp
+            self.sl_short = sl
+            self.trailing_short = trailing
+    
     def _calculate_stats(self, trades: List[Dict], data: Dict) -> Dict:
         """Calculate trading statistics"""
         if not trades:
@@ -0,0 +1,304 @@
+"""
+AFL Array Kernel
+Array backend for AFLTradingEngine.run_backtest
+- Time-of-day and in-session arrays are precomputed by the engine
+- The long/short state machine runs in one tight loop (JIT compiled with numba if installed)
+- Trades are written into a preallocated structured array
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in when numba is not installed"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# Trade record layout written by the kernel
+TRADE_DTYPE = np.dtype([
+    ('entry_bar', np.int64),
+    ('exit_bar', np.int64),
+    ('type', np.int8),          # 1 = long, -1 = short
+    ('entry_price', np.float64),
+    ('exit_price', np.float64),
+    ('profit', np.float64),
+    ('max_profit', np.float64),
+    ('exit_reason', np.int8),   # index into EXIT_REASONS
+    ('bars_held', np.int64)
+])
+
+EXIT_REASONS = ('SL', 'Trailing', 'TP')
+EXIT_SL, EXIT_TRAILING, EXIT_TP = 0, 1, 2
+
+TRADE_TYPES = {1: 'long', -1: 'short'}
+
+# Kernel output arrays, in kernel argument order
+SIGNAL_KEYS = ('buy', 'sell', 'short', 'cover',
+               'buy_price', 'sell_price', 'short_price', 'cover_price')
+LINE_KEYS = ('sl_buy', 'tp_buy', 'trailing_buy', 'sl_short', 'tp_short',
+             'trailing_short', 'entry_price', 'hhv_since_buy', 'llv_since_short')
+
+# Final engine state returned by the kernel
+STATE_KEYS = ('position', 'entry_price', 'entry_bar', 'buy_count', 'short_count',
+              'hhv_since_buy', 'hhv_buy_profit', 'llv_since_short', 'hhv_short_profit',
+              'tp', 'sl', 'trailing')
+
+
+def levels_to_array(levels) -> np.ndarray:
+    """
+    Convert a dynamic TP/SL table to the kernel layout
+
+    Args:
+        levels: Rows of (min_profit, tp_points, sl_points, trailing_points, trailing_pct)
+                with None for unused values
+
+    Returns:
+        2-D float array, None stored as NaN
+    """
+    return np.array([[np.nan if v is None else v for v in row] for row in levels], dtype=np.float64)
+
+
+@njit(cache=True)
+def _lookup_level(levels, profit):
+    """Row of the first level whose min_profit <= profit"""
+    for row in range(levels.shape[0]):
+        if profit >= levels[row, 0]:
+            return row
+    return levels.shape[0] - 1
+
+
+@njit(cache=True)
+def _level_points(levels, row, profit):
+    """(tp_points, sl_points, trailing_points) for a level row, tp NaN = None"""
+    trailing_pct = levels[row, 4]
+    if trailing_pct == trailing_pct:
+        trailing_points = profit / 100 * trailing_pct
+    else:
+        trailing_points = levels[row, 3]
+    return levels[row, 1], levels[row, 2], trailing_points
+
+
+@njit(cache=True)
+def afl_backtest_kernel(open_, high, low, in_range, itime, buy_signal, short_signal,
+                        active, buy_active, short_active,
+                        buy_order_limit, short_order_limit, fee_tax,
+                        levels_buy, levels_short,
+                        buy, sell, short, cover,
+                        buy_price, sell_price, short_price, cover_price,
+                        sl_buy_line, tp_buy_line, trailing_buy_line,
+                        sl_short_line, tp_short_line, trailing_short_line,
+                        entry_price_line, hhv_since_buy_line, llv_since_short_line,
+                        trades, state):
+    """
+    AFL long/short state machine over all bars
+
+    Mirrors AFLTradingEngine.run_backtest bar for bar. Output arrays must be
+    preallocated (signals zeroed, lines NaN). Returns the number of trades
+    written into `trades`; the final engine state is written into `state`.
+    """
+    n_bars = len(open_)
+    n_trades = 0
+
+    position = 0
+    entry_price = 0.0
+    entry_bar = -1
+    buy_count = 0
+    short_count = 0
+    hhv_since_buy = np.nan
+    hhv_buy_profit = 0.0
+    llv_since_short = np.nan
+    hhv_short_profit = 0.0
+    tp_level = np.nan
+    sl_level = np.nan
+    trailing_level = np.nan
+
+    for i in range(1, n_bars):
+        O = open_[i]
+        H = high[i]
+        L = low[i]
+
+        # === MANAGE EXISTING LONG POSITION ===
+        if position == 1:
+            # Update HHV
+            if hhv_since_buy != hhv_since_buy or H > hhv_since_buy:
+                hhv_since_buy = H
+
+            # Update profit
+            current_profit = hhv_since_buy - entry_price - fee_tax
+            if current_profit > hhv_buy_profit:
+                hhv_buy_profit = current_profit
+
+            # Dynamic TP/SL
+            row = _lookup_level(levels_buy, hhv_buy_profit)
+            tp_points, sl_points, trailing_points = _level_points(levels_buy, row, hhv_buy_profit)
+
+            tp_level = entry_price + tp_points
+            sl_level = entry_price - sl_points
+            trailing_level = hhv_since_buy - trailing_points
+            has_tp = tp_level == tp_level and tp_level != 0
+
+            # Update lines
+            sl_buy_line[i] = sl_level
+            if has_tp:
+                tp_buy_line[i] = tp_level
+            trailing_buy_line[i] = trailing_level
+            entry_price_line[i] = entry_price
+            hhv_since_buy_line[i] = hhv_since_buy
+
+            # Check exits
+            exit_reason = -1
+            exit_price = 0.0
+
+            if in_range[i]:
+                if L < sl_level:
+                    exit_reason = EXIT_SL
+                    exit_price = L
+                elif itime[i] != 142900 and L < trailing_level:
+                    exit_reason = EXIT_TRAILING
+                    exit_price = L
+                elif has_tp and H > tp_level and L > low[i - 1]:
+                    exit_reason = EXIT_TP
+                    exit_price = H
+
+            if exit_reason >= 0:
+                sell[i] = True
+                sell_price[i] = exit_price
+
+                trades[n_trades]['entry_bar'] = entry_bar
+                trades[n_trades]['exit_bar'] = i
+                trades[n_trades]['type'] = 1
+                trades[n_trades]['entry_price'] = entry_price
+                trades[n_trades]['exit_price'] = exit_price
+                trades[n_trades]['profit'] = exit_price - entry_price - fee_tax
+                trades[n_trades]['max_profit'] = hhv_buy_profit
+                trades[n_trades]['exit_reason'] = exit_reason
+                trades[n_trades]['bars_held'] = i - entry_bar
+                n_trades += 1
+
+                # Reset
+                position = 0
+                entry_price = 0.0
+                entry_bar = -1
+                tp_level = np.nan
+                sl_level = np.nan
+                trailing_level = np.nan
+                hhv_since_buy = np.nan
+                hhv_buy_profit = 0.0
+
+        # === MANAGE EXISTING SHORT POSITION ===
+        elif position == -1:
+            # Update LLV
+            if llv_since_short != llv_since_short or L < llv_since_short:
+                llv_since_short = L
+
+            # Update profit
+            current_profit = entry_price - llv_since_short - fee_tax
+            if current_profit > hhv_short_profit:
+                hhv_short_profit = current_profit
+
+            # Dynamic TP/SL
+            row = _lookup_level(levels_short, hhv_short_profit)
+            tp_points, sl_points, trailing_points = _level_points(levels_short, row, hhv_short_profit)
+
+            tp_level = entry_price - tp_points
+            sl_level = entry_price + sl_points
+            trailing_level = llv_since_short + trailing_points
+            has_tp = tp_level == tp_level and tp_level != 0
+
+            # Update lines
+            sl_short_line[i] = sl_level
+            if has_tp:
+                tp_short_line[i] = tp_level
+            trailing_short_line[i] = trailing_level
+            entry_price_line[i] = entry_price
+            llv_since_short_line[i] = llv_since_short
+
+            # Check exits
+            exit_reason = -1
+            exit_price = 0.0
+
+            if in_range[i]:
+                if H > sl_level:
+                    exit_reason = EXIT_SL
+                    exit_price = H
+                elif itime[i] != 142900 and H > trailing_level:
+                    exit_reason = EXIT_TRAILING
+                    exit_price = H
+                elif has_tp and L < tp_level and H < high[i - 1]:
+                    exit_reason = EXIT_TP
+                    exit_price = L
+
+            if exit_reason >= 0:
+                cover[i] = True
+                cover_price[i] = exit_price
+
+                trades[n_trades]['entry_bar'] = entry_bar
+                trades[n_trades]['exit_bar'] = i
+                trades[n_trades]['type'] = -1
+                trades[n_trades]['entry_price'] = entry_price
+                trades[n_trades]['exit_price'] = exit_price
+                trades[n_trades]['profit'] = entry_price - exit_price - fee_tax
+                trades[n_trades]['max_profit'] = hhv_short_profit
+                trades[n_trades]['exit_reason'] = exit_reason
+                trades[n_trades]['bars_held'] = i - entry_bar
+                n_trades += 1
+
+                # Reset
+                position = 0
+                entry_price = 0.0
+                entry_bar = -1
+                tp_level = np.nan
+                sl_level = np.nan
+                trailing_level = np.nan
+                llv_since_short = np.nan
+                hhv_short_profit = 0.0
+
+        # === NEW ENTRY (No repaint) ===
+        if position == 0 and in_range[i]:
+            # Buy: Signal at [i-1], enter at [i] Open
+            if buy_signal[i - 1] and active and buy_active:
+                if buy_count < buy_order_limit:
+                    buy[i] = True
+                    buy_price[i] = O
+
+                    position = 1
+                    entry_price = O
+                    entry_bar = i
+                    hhv_since_buy = O
+                    hhv_buy_profit = 0.0
+                    buy_count += 1
+
+            # Short: Signal at [i-1], enter at [i] Open
+            elif short_signal[i - 1] and active and short_active:
+                if short_count < short_order_limit:
+                    short[i] = True
+                    short_price[i] = O
+
+                    position = -1
+                    entry_price = O
+                    entry_bar = i
+                    llv_since_short = O
+                    hhv_short_profit = 0.0
+                    short_count += 1
+
+    state[0] = position
+    state[1] = entry_price
+    state[2] = entry_bar
+    state[3] = buy_count
+    state[4] = short_count
+    state[5] = hhv_since_buy
+    state[6] = hhv_buy_profit
+    state[7] = llv_since_short
+    state[8] = hhv_short_profit
+    state[9] = tp_level
+    state[10] = sl_level
+    state[11] = trailing_level
+
+    return n_trades
@@ -0,0 +1,256 @@
+"""
+AFL Primitives
+Vectorized AmiBroker AFL array functions (HHV, LLV, Ref, Cross, BarsSince, ValueWhen, Sum, ...)
+- Every function works on whole arrays in O(n), without a per-bar Python loop
+- AFL's Null is NaN; a window containing Null gives Null (same as pandas rolling)
+- HHV/LLV run a monotonic-deque kernel (JIT compiled with numba if installed);
+  without numba they fall back to block prefix/suffix scans (van Herk / Gil-Werman),
+  which keep the O(n) bound as a few NumPy passes
+"""
+
+import numpy as np
+import pandas as pd
+
+from .afl_kernel import njit, NUMBA_AVAILABLE
+
+
+def _check_periods(periods):
+    """Window length validation (same rule and message as pandas rolling)"""
+    if isinstance(periods, bool) or not isinstance(periods, (int, np.integer)) or periods < 0:
+        raise ValueError("window must be an integer 0 or greater")
+
+
+def _window_scan(values: np.ndarray, missing: np.ndarray, periods: int, ufunc, identity: float) -> np.ndarray:
+    """
+    Reduce every trailing window of `periods` bars with an associative ufunc
+
+    Args:
+        values: float64 series
+        missing: Bars treated as Null (their windows are Null)
+        periods: Window length
+        ufunc: np.maximum, np.minimum or np.add
+        identity: Neutral element of ufunc, stored in place of missing bars
+
+    Returns:
+        float64 array, NaN for the first periods-1 bars and Null windows
+    """
+    n_bars = len(values)
+    result = np.full(n_bars, np.nan)
+    if periods == 0 or periods > n_bars:
+        return result
+
+    # Blocks of `periods` bars: a window spans the tail of one block and the head of the next
+    n_blocks = -(-n_bars // periods)
+    padded = np.full(n_blocks * periods, identity)
+    padded[:n_bars] = np.where(missing, identity, values)
+    blocks = padded.reshape(n_blocks, periods)
+    prefix = ufunc.accumulate(blocks, axis=1).ravel()
+    suffix = ufunc.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+
+    end = np.arange(periods - 1, n_bars)
+    start = end - periods + 1
+    windows = ufunc(suffix[start], prefix[end])
+    aligned = start % periods == 0
+    windows[aligned] = prefix[end[aligned]]
+
+    missing_count = np.concatenate([[0], np.cumsum(missing)])
+    windows[missing_count[end + 1] - missing_count[start] > 0] = np.nan
+
+    result[periods - 1:] = windows
+    return result
+
+
+@njit(cache=True)
+def _extreme_kernel(values, missing, periods, sign):
+    """Monotonic deque: rolling max (sign=1) or min (sign=-1) of periods >= 1 bars"""
+    n_bars = len(values)
+    result = np.full(n_bars, np.nan)
+    window = np.empty(n_bars, dtype=np.int64)  # candidate indices, best first
+    head = 0
+    tail = 0
+    last_missing = -1
+
+    for i in range(n_bars):
+        if missing[i]:
+            last_missing = i
+        else:
+            value = sign * values[i]
+            while tail > head and sign * values[window[tail - 1]] <= value:
+                tail -= 1
+            window[tail] = i
+            tail += 1
+
+        while tail > head and window[head] <= i - periods:
+            head += 1
+
+        if i >= periods - 1 and i - last_missing >= periods:
+            result[i] = values[window[head]]
+
+    return result
+
+
+def _extreme(array, periods: int, sign: int) -> np.ndarray:
+    _check_periods(periods)
+    values = np.asarray(array, dtype=np.float64)
+    missing = ~np.isfinite(values)
+    if not NUMBA_AVAILABLE:
+        if sign > 0:
+            return _window_scan(values, missing, periods, np.maximum, -np.inf)
+        return _window_scan(values, missing, periods, np.minimum, np.inf)
+
+    if periods == 0 or periods > len(values):
+        return np.full(len(values), np.nan)
+    return _extreme_kernel(values, missing, periods, sign)
+
+
+# ==================== MOVING WINDOWS ====================
+
+def hhv(array, periods: int) -> np.ndarray:
+    """
+    HHV - highest value of the last `periods` bars (current bar included)
+
+    Identical to pd.Series(array).rolling(periods).max(), including its
+    treatment of NaN/inf bars as missing.
+    """
+    return _extreme(array, periods, 1)
+
+
+def llv(array, periods: int) -> np.ndarray:
+    """LLV - lowest value of the last `periods` bars (rolling(periods).min())"""
+    return _extreme(array, periods, -1)
+
+
+def moving_sum(array, periods: int) -> np.ndarray:
+    """AFL Sum - sum of the last `periods` bars (Null if any of them is Null)"""
+    _check_periods(periods)
+    values = np.asarray(array, dtype=np.float64)
+    return _window_scan(values, np.isnan(values), periods, np.add, 0.0)
+
+
+# ==================== BAR REFERENCES ====================
+
+def ref(array, offset: int) -> np.ndarray:
+    """
+    Ref - value `offset` bars away (negative = past, positive = future)
+
+    Bars referencing outside the data are Null.
+    """
+    values = np.asarray(array, dtype=np.float64)
+    n_bars = len(values)
+    result = np.full(n_bars, np.nan)
+    if offset < 0:
+        lag = min(-offset, n_bars)
+        result[lag:] = values[:n_bars - lag]
+    elif offset > 0:
+        lead = min(offset, n_bars)
+        result[:n_bars - lead] = values[lead:]
+    else:
+        result[:] = values
+    return result
+
+
+def cross(array1, array2) -> np.ndarray:
+    """
+    Cross - True on bars where array1 crosses above array2
+
+    array1 > array2 on the bar and array1 <= array2 on the previous bar.
+    Scalars are broadcast; comparisons with Null are False.
+    """
+    a = np.asarray(array1, dtype=np.float64)
+    b = np.asarray(array2, dtype=np.float64)
+    n_bars = max(a.size if a.ndim else 1, b.size if b.ndim else 1)
+    a = np.broadcast_to(a, n_bars)
+    b = np.broadcast_to(b, n_bars)
+
+    result = np.zeros(n_bars, dtype=bool)
+    if n_bars > 1:
+        with np.errstate(invalid='ignore'):
+            result[1:] = (a[1:] > b[1:]) & (a[:-1] <= b[:-1])
+    return result
+
+
+def iif(condition, true_value, false_value) -> np.ndarray:
+    """IIf - element-wise choice (Null conditions are False)"""
+    condition = np.nan_to_num(np.asarray(condition, dtype=np.float64), nan=0.0) != 0
+    return np.where(condition, true_value, false_value).astype(np.float64)
+
+
+# ==================== SINCE-EVENT FUNCTIONS ====================
+
+def _events(condition) -> np.ndarray:
+    """Condition array as booleans (Null = False)"""
+    condition = np.asarray(condition)
+    if condition.dtype == bool:
+        return condition
+    return np.nan_to_num(condition.astype(np.float64), nan=0.0) != 0
+
+
+def bars_since(condition) -> np.ndarray:
+    """BarsSince - bars since the condition was last True (0 on the event bar, Null before the first)"""
+    events = _events(condition)
+    index = np.arange(len(events))
+    last = np.maximum.accumulate(np.where(events, index, -1)) if len(events) else index
+    result = (index - last).astype(np.float64)
+    result[last < 0] = np.nan
+    return result
+
+
+def value_when(condition, array, n: int = 1) -> np.ndarray:
+    """
+    ValueWhen - value of array on the n-th most recent bar where the condition was True
+
+    Null until the condition has been True n times.
+    """
+    if n < 1:
+        raise ValueError("n must be 1 or greater")
+    events = _events(condition)
+    values = np.asarray(array, dtype=np.float64)
+    values = np.broadcast_to(values, len(events)) if values.ndim == 0 else values
+
+    positions = np.flatnonzero(events)
+    occurrence = np.cumsum(events) - n
+    result = np.full(len(events), np.nan)
+    valid = occurrence >= 0
+    result[valid] = values[positions[occurrence[valid]]]
+    return result
+
+
+def _since_event(condition, array, method: str) -> np.ndarray:
+    """Cumulative pandas groupby scan restarted on every event bar (Null before the first)"""
+    events = _events(condition)
+    segment = np.cumsum(events)
+    values = pd.Series(np.asarray(array, dtype=np.float64))
+    result = getattr(values.groupby(segment), method)().to_numpy(dtype=np.float64, copy=True)
+    result[segment == 0] = np.nan
+    return result
+
+
+def highest_since(condition, array) -> np.ndarray:
+    """HighestSince - highest array value since the last event (event bar included)"""
+    return _since_event(condition, array, 'cummax')
+
+
+def lowest_since(condition, array) -> np.ndarray:
+    """LowestSince - lowest array value since the last event (event bar included)"""
+    return _since_event(condition, array, 'cummin')
+
+
+def cum(array) -> np.ndarray:
+    """Cum - cumulative sum from the first bar"""
+    return np.cumsum(np.asarray(array, dtype=np.float64))
+
+
+# AFL function names -> implementations
+AFL_FUNCTIONS = {
+    'HHV': hhv,
+    'LLV': llv,
+    'Sum': moving_sum,
+    'Ref': ref,
+    'Cross': cross,
+    'IIf': iif,
+    'BarsSince': bars_since,
+    'ValueWhen': value_when,
+    'HighestSince': highest_since,
+    'LowestSince': lowest_since,
+    'Cum': cum
+}
@@ -1,6 +1,9 @@
 """
 Backtest Engine
 Tests trading strategies on historical data
+- Equity curve and trade log are kept in preallocated NumPy arrays
+- Statistics are computed from the arrays; trade / equity dicts are
+  produced lazily by TradeLog / EquityCurve views
 """
 
 import numpy as np
@@ -8,7 +11,162 @@ import pandas as pd
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from .strategy import Strategy
-from .dynamic_exit import Position
+from .dynamic_exit import Position, pack_exit_rules, rule_levels, level_touched
+
+
+def _day_keys(times, n_bars: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Daily P&L keys (str(time)[:10]) and whether each bar has a time"""
+    if times is None:
+        return np.full(n_bars, '', dtype='<U10'), np.zeros(n_bars, dtype=bool)
+    
+    values = np.asarray(times)
+    if values.dtype.kind in 'iuf':
+        return values.astype(str).astype('<U10'), values != 0
+    if values.dtype.kind == 'U':
+        return values.astype('<U10'), values != ''
+    return (np.array([str(t)[:10] for t in times], dtype='<U10'),
+            np.array([bool(t) for t in times], dtype=bool))
+
+
+def _times_at(times, bars: np.ndarray):
+    """data['time'] values of the given bars (None without a time column)"""
+    if times is None:
+        return [None] * len(bars)
+    if isinstance(times, np.ndarray):
+        return times[bars]
+    return [times[bar] for bar in bars]
+
+
+# Trade log layout (one record per closed trade)
+TRADE_DTYPE = np.dtype([
+    ('entry_bar', np.int64),
+    ('exit_bar', np.int64),
+    ('direction', np.int8),         # 1 = long, -1 = short
+    ('entry_price', np.float64),
+    ('exit_price', np.float64),
+    ('size', np.float64),
+    ('profit_points', np.float64),
+    ('profit_value', np.float64),
+    ('exit_reason', np.int8),       # index into EXIT_REASONS
+    ('highest_profit', np.float64)
+])
+
+EXIT_REASONS = ('stop_loss', 'trailing_stop', 'take_profit', 'end_of_data')
+DIRECTIONS = {1: 'long', -1: 'short'}
+
+
+class TradeLog:
+    """
+    Lazy dict view of a trade record array
+    
+    Indexing / iterating yields the trade dicts (entry_time, entry_price,
+    exit_time, exit_price, direction, size, profit_points, profit_value,
+    exit_reason, highest_profit); `records` holds the TRADE_DTYPE array.
+    """
+    
+    def __init__(self, records: np.ndarray, times=None):
+        self.records = records
+        self.times = times
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._as_dict(record) for record in self.records[index]]
+        return self._as_dict(self.records[index])
+    
+    def __iter__(self):
+        for record in self.records:
+            yield self._as_dict(record)
+    
+    def _as_dict(self, record) -> Dict:
+        entry_time, exit_time = _times_at(self.times, [record['entry_bar'], record['exit_bar']])
+        return {
+            'entry_time': entry_time,
+            'entry_price': record['entry_price'],
+            'exit_time': exit_time,
+            'exit_price': record['exit_price'],
+            'direction': DIRECTIONS[int(record['direction'])],
+            'size': record['size'],
+            'profit_points': record['profit_points'],
+            'profit_value': record['profit_value'],
+            'exit_reason': EXIT_REASONS[record['exit_reason']],
+            'highest_profit': record['highest_profit']
+        }
+    
+    def to_list(self) -> List[Dict]:
+        """All trades as dicts"""
+        return list(self)
+    
+    def to_dataframe(self) -> pd.DataFrame:
+        """Trades as a DataFrame (same columns as the dicts)"""
+        records = self.records
+        return pd.DataFrame({
+            'entry_time': _times_at(self.times, records['entry_bar']),
+            'entry_price': records['entry_price'],
+            'exit_time': _times_at(self.times, records['exit_bar']),
+            'exit_price': records['exit_price'],
+            'direction': [DIRECTIONS[direction] for direction in records['direction'].tolist()],
+            'size': records['size'],
+            'profit_points': records['profit_points'],
+            'profit_value': records['profit_value'],
+            'exit_reason': [EXIT_REASONS[reason] for reason in records['exit_reason'].tolist()],
+            'highest_profit': records['highest_profit']
+        })
+
+
+class EquityCurve:
+    """
+    Lazy dict view of the equity arrays
+    
+    Indexing / iterating yields {'bar', 'time', 'equity', 'capital'} dicts;
+    the series stay in `bars`, `equity` and `capital`.
+    """
+    
+    def __init__(self, bars: np.ndarray, equity: np.ndarray, capital: np.ndarray, times=None):
+        self.bars = bars
+        self.equity = equity
+        self.capital = capital
+        self.times = times
+    
+    def __len__(self) -> int:
+        return len(self.bars)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._as_dict(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("equity curve index out of range")
+        return self._as_dict(index)
+    
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._as_dict(i)
+    
+    def _as_dict(self, i: int) -> Dict:
+        bar = int(self.bars[i])
+        return {
+            'bar': bar,
+            'time': self.times[bar] if self.times is not None else None,
+            'equity': self.equity[i],
+            'capital': self.capital[i]
+        }
+    
+    def to_list(self) -> List[Dict]:
+        """All equity points as dicts"""
+        return list(self)
+    
+    def to_dataframe(self) -> pd.DataFrame:
+        """Equity points as a DataFrame (same columns as the dicts)"""
+        return pd.DataFrame({
+            'bar': self.bars,
+            'time': _times_at(self.times, self.bars),
+            'equity': self.equity,
+            'capital': self.capital
+        })
 
 
 class BacktestEngine:
@@ -37,15 +195,39 @@ class BacktestEngine:
         
         self.reset()
     
-    def reset(self):
-        """Reset backtest state"""
+    def reset(self, n_bars: int = 0):
+        """
+        Reset backtest state
+        
+        Args:
+            n_bars: Bars of the next run (equity arrays are preallocated for them)
+        """
         self.capital = self.initial_capital
-        self.equity_curve = []
-        self.trades = []
         self.current_position = None
+        self.entry_bar = None
         self.daily_pnl = {}
+        self.times = None
+        
+        # One equity point per processed bar, one record per closed trade
+        self.equity_bars = np.empty(n_bars, dtype=np.int64)
+        self.equity_values = np.empty(n_bars)
+        self.capital_values = np.empty(n_bars)
+        self.n_points = 0
+        self.trade_records = np.empty(16, dtype=TRADE_DTYPE)
+        self.n_trades = 0
+    
+    @property
+    def trades(self) -> TradeLog:
+        """Closed trades (lazy dict view)"""
+        return TradeLog(self.trade_records[:self.n_trades], self.times)
+    
+    @property
+    def equity_curve(self) -> EquityCurve:
+        """Equity points (lazy dict view)"""
+        n = self.n_points
+        return EquityCurve(self.equity_bars[:n], self.equity_values[:n], self.capital_values[:n], self.times)
         
-    def run(self, data: Dict[str, np.ndarray]) -> Dict:
+    def run(self, data: Dict[str, np.ndarray], backend: str = 'python') -> Dict:
         """
         Run backtest on historical data
         
@@ -53,15 +235,21 @@ class BacktestEngine:
             data: Dict with OHLCV data as numpy arrays
                   Must include: 'open', 'high', 'low', 'close', 'volume'
                   Optional: 'time' (datetime or timestamp)
+            backend: 'python' (visits every bar) or 'event' (jumps between
+                     entry and exit bars, same trades and equity curve)
         
         Returns:
             Dict with backtest results
         """
+        if backend not in ('python', 'event'):
+            raise ValueError(f"Unknown backend: {backend}")
+        
         print(f"\n🚀 Running backtest: {self.strategy.config['name']}")
         print(f"   Initial Capital: ${self.initial_capital:,.2f}")
         print(f"   Data points: {len(data['close'])}")
         
-        self.reset()
+        self.reset(len(data['close']))
+        self.times = data.get('time')
         
         # Generate signals
         signals = self.strategy.generate_signals(data)
@@ -83,71 +271,21 @@ class BacktestEngine:
         print(f"   Buy Active: {buy_active}")
         print(f"   Short Active: {short_active}")
 
+        limits = {
+            'max_positions': max_positions,
+            'max_daily_loss': max_daily_loss,
+            'active': active,
+            'buy_active': buy_active,
+            'short_active': short_active
+        }
         n_bars = len(data['close'])
         
-        # Iterate through bars
-        for i in range(1, n_bars):
-            current_open = data['open'][i]
-            current_high = data['high'][i]
-            current_low = data['low'][i]
-            current_close = data['close'][i]
-            
-            # Check if we have open position
-            if self.current_position:
-                # Update position and check exit
-                should_exit, exit_reason = self.current_position.update(current_high, current_low)
-                
-                if should_exit:
-                    # Close position
-                    if exit_reason == 'stop_loss':
-                        exit_price = self.current_position.get_exit_levels(current_close)['sl']
-                    elif exit_reason == 'take_profit':
-                        exit_price = self.current_position.get_exit_levels(current_close)['tp']
-                    elif exit_reason == 'trailing_stop':
-                        exit_price = self.current_position.get_exit_levels(current_close)['trailing']
-                    else:
-                        exit_price = current_close
-                    
-                    # Apply slippage
-                    if self.current_position.direction == 'long':
-                        exit_price -= self.slippage
-                    else:
-                        exit_price += self.slippage
-                    
-                    self._close_position(i, exit_price, exit_reason, data)
-            
-            # Check for new entries (only if no position)
-            if not self.current_position and max_positions > 0 and active:
-                # Check daily loss limit
-                current_date = data.get('time', [None])[i]
-                if current_date:
-                    date_str = str(current_date)[:10]  # YYYY-MM-DD
-                    daily_loss = self.daily_pnl.get(date_str, 0)
-                    if daily_loss <= -max_daily_loss:
-                        continue  # Skip trading for today
-
-                # Check buy signal (only if buy_active is True)
-                if buy_signals[i] and buy_active:
-                    entry_price = current_open + self.slippage
-                    self._open_position(i, entry_price, 'long', data)
-
-                # Check short signal (only if short_active is True)
-                elif short_signals[i] and short_active:
-                    entry_price = current_open - self.slippage
-                    self._open_position(i, entry_price, 'short', data)
-            
-            # Update equity curve
-            current_equity = self.capital
-            if self.current_position:
-                unrealized_pnl = self.current_position.get_current_profit(current_close)
-                current_equity += unrealized_pnl
-            
-            self.equity_curve.append({
-                'bar': i,
-                'time': data.get('time', [None])[i],
-                'equity': current_equity,
-                'capital': self.capital
-            })
+        if backend == 'event':
+            self._run_events(data, buy_signals, short_signals, limits)
+        else:
+            # Iterate through bars
+            for i in range(1, n_bars):
+                self._process_bar(i, data, buy_signals, short_signals, limits)
         
         # Close any remaining position
         if self.current_position:
@@ -165,6 +303,192 @@ class BacktestEngine:
         
         return results
     
+    def _process_bar(self, i: int, data: Dict, buy_signals: np.ndarray, short_signals: np.ndarray,
+                     limits: Dict):
+        """Exit check, entry check and equity point of bar i"""
+        current_open = data['open'][i]
+        current_high = data['high'][i]
+        current_low = data['low'][i]
+        current_close = data['close'][i]
+        
+        # Check if we have open position
+        if self.current_position:
+            # Update position and check exit
+            should_exit, exit_reason = self.current_position.update(current_high, current_low)
+            
+            if should_exit:
+                # Close position
+                if exit_reason == 'stop_loss':
+                    exit_price = self.current_position.get_exit_levels(current_close)['sl']
+                elif exit_reason == 'take_profit':
+                    exit_price = self.current_position.get_exit_levels(current_close)['tp']
+                elif exit_reason == 'trailing_stop':
+                    exit_price = self.current_position.get_exit_levels(current_close)['trailing']
+                else:
+                    exit_price = current_close
+                
+                # Apply slippage
+                if self.current_position.direction == 'long':
+                    exit_price -= self.slippage
+                else:
+                    exit_price += self.slippage
+                
+                self._close_position(i, exit_price, exit_reason, data)
+        
+        # Check for new entries (only if no position)
+        if not self.current_position and limits['max_positions'] > 0 and limits['active']:
+            # Check daily loss limit
+            current_date = data.get('time', [None])[i]
+            if current_date:
+                date_str = str(current_date)[:10]  # YYYY-MM-DD
+                daily_loss = self.daily_pnl.get(date_str, 0)
+                if daily_loss <= -limits['max_daily_loss']:
+                    return  # Skip trading for today
+
+            # Check buy signal (only if buy_active is True)
+            if buy_signals[i] and limits['buy_active']:
+                entry_price = current_open + self.slippage
+                self._open_position(i, entry_price, 'long', data)
+
+            # Check short signal (only if short_active is True)
+            elif short_signals[i] and limits['short_active']:
+                entry_price = current_open - self.slippage
+                self._open_position(i, entry_price, 'short', data)
+        
+        # Update equity curve
+        current_equity = self.capital
+        if self.current_position:
+            unrealized_pnl = self.current_position.get_current_profit(current_close)
+            current_equity += unrealized_pnl
+        
+        n = self.n_points
+        self.equity_bars[n] = i
+        self.equity_values[n] = current_equity
+        self.capital_values[n] = self.capital
+        self.n_points = n + 1
+    
+    def _run_events(self, data: Dict, buy_signals: np.ndarray, short_signals: np.ndarray, limits: Dict):
+        """
+        Event-skipping bar loop
+        
+        Only entry-signal bars (while flat) and exit bars (while in a trade)
+        go through _process_bar; equity points of the bars in between are
+        filled in from arrays.
+        """
+        n_bars = len(data['close'])
+        closes = np.asarray(data['close'], dtype=float)
+        highs = np.asarray(data['high'], dtype=float)
+        lows = np.asarray(data['low'], dtype=float)
+        
+        entry_mask = np.zeros(n_bars, dtype=bool)
+        if limits['max_positions'] > 0 and limits['active']:
+            if limits['buy_active']:
+                entry_mask |= np.asarray(buy_signals, dtype=bool)
+            if limits['short_active']:
+                entry_mask |= np.asarray(short_signals, dtype=bool)
+        entry_bars = np.flatnonzero(entry_mask)
+        
+        packed = None
+        day_keys = None
+        
+        i = 1
+        while i < n_bars:
+            if self.current_position:
+                if packed is None:
+                    packed = pack_exit_rules([self.current_position.exit_manager.tp_sl_rules])
+                next_bar = self._advance_to_exit(i, packed, highs, lows)
+                self._fill_equity(i, next_bar, data, closes)
+            else:
+                k = np.searchsorted(entry_bars, i)
+                next_bar = int(entry_bars[k]) if k < len(entry_bars) else n_bars
+                
+                # Flat bars of a day over the daily loss limit get no equity point
+                # (a day without P&L counts as 0, like daily_pnl.get(day, 0))
+                skipped = None
+                if limits['max_positions'] > 0 and limits['active'] and next_bar > i:
+                    max_daily_loss = limits['max_daily_loss']
+                    unrecorded_blocked = 0 <= -max_daily_loss
+                    if unrecorded_blocked:
+                        days = [day for day, pnl in self.daily_pnl.items() if pnl > -max_daily_loss]
+                    else:
+                        days = [day for day, pnl in self.daily_pnl.items() if pnl <= -max_daily_loss]
+                    if unrecorded_blocked or days:
+                        if day_keys is None:
+                            day_keys = _day_keys(data.get('time'), n_bars)
+                        keys, has_date = day_keys
+                        listed = np.isin(keys[i:next_bar], days)
+                        skipped = has_date[i:next_bar] & (~listed if unrecorded_blocked else listed)
+                self._fill_equity(i, next_bar, data, closes, skipped)
+            
+            if next_bar < n_bars:
+                self._process_bar(next_bar, data, buy_signals, short_signals, limits)
+            i = next_bar + 1
+    
+    def _advance_to_exit(self, start: int, packed: Dict, highs: np.ndarray, lows: np.ndarray) -> int:
+        """
+        Find the next bar on which the open position exits
+        
+        Bars are scanned in growing blocks: the highest profit is a running
+        max over the block, TP/SL/trailing levels are looked up for every bar
+        and the first touched level gives the exit bar. The position is left
+        in its state before that bar, so _process_bar replays the exit itself.
+        
+        Returns:
+            Exit bar index (len(highs) if the position stays open)
+        """
+        position = self.current_position
+        long_side = position.direction == 'long'
+        entry = position.entry_price
+        n_bars = len(highs)
+        width = 64
+        
+        while start < n_bars:
+            end = min(start + width, n_bars)
+            high, low = highs[start:end], lows[start:end]
+            mid = (high + low) / 2
+            profit = mid - entry if long_side else entry - mid
+            highest = np.fmax.accumulate(np.fmax(profit, position.highest_profit))
+            # max(profit, highest_profit) of get_exit_levels (a NaN profit matches no rule)
+            rule_profit = np.where(np.isnan(profit), np.nan, highest)
+            
+            tp, sl, trailing, percentage = rule_levels(packed, np.zeros(end - start, dtype=np.int64), rule_profit)
+            trailing = np.where(percentage, rule_profit * 0.68, trailing)
+            if long_side:
+                tp_price, sl_price, trailing_price = entry + tp, entry - sl, mid - trailing
+            else:
+                tp_price, sl_price, trailing_price = entry - tp, entry + sl, mid + trailing
+            
+            exiting = (level_touched(sl_price, long_side, low <= sl_price, high >= sl_price)
+                       | level_touched(trailing_price, long_side, low <= trailing_price, high >= trailing_price)
+                       | level_touched(tp_price, long_side, high >= tp_price, low <= tp_price))
+            k = int(exiting.argmax()) if exiting.any() else end - start
+            
+            if k:
+                if highest[k - 1] > position.highest_profit:
+                    position.highest_profit = highest[k - 1]
+                position.lowest_drawdown = min(position.lowest_drawdown, np.fmin.reduce(profit[:k]))
+            if k < end - start:
+                return start + k
+            start = end
+            width *= 2
+        
+        return n_bars
+    
+    def _fill_equity(self, start: int, end: int, data: Dict, closes: np.ndarray,
+                     skipped: Optional[np.ndarray] = None):
+        """Equity points of bars start..end-1, which have no exit or entry"""
+        bars = np.arange(start, end)
+        if skipped is not None:
+            bars = bars[~skipped]
+        
+        points = slice(self.n_points, self.n_points + len(bars))
+        self.equity_bars[points] = bars
+        self.equity_values[points] = self.capital
+        if self.current_position:
+            self.equity_values[points] += self.current_position.get_current_profit(closes[bars])
+        self.capital_values[points] = self.capital
+        self.n_points += len(bars)
+    
     def _open_position(self, bar_index: int, entry_price: float, direction: str, data: Dict):
         """Open new position"""
         # Calculate position size
@@ -181,6 +505,7 @@ class BacktestEngine:
             exit_manager=self.strategy.get_exit_manager()
         )
         self.current_position.entry_time = data.get('time', [None])[bar_index]
+        self.entry_bar = bar_index
         
         print(f"  📈 {direction.upper()} @ {entry_price:.2f} (Bar {bar_index})")
     
@@ -207,20 +532,22 @@ class BacktestEngine:
             date_str = str(exit_time)[:10]
             self.daily_pnl[date_str] = self.daily_pnl.get(date_str, 0) + profit_value
         
-        # Store trade
-        trade = {
-            'entry_time': self.current_position.entry_time,
-            'entry_price': self.current_position.entry_price,
-            'exit_time': self.current_position.exit_time,
-            'exit_price': exit_price,
-            'direction': self.current_position.direction,
-            'size': self.current_position.size,
-            'profit_points': profit_points,
-            'profit_value': profit_value,
-            'exit_reason': exit_reason,
-            'highest_profit': self.current_position.highest_profit
-        }
-        self.trades.append(trade)
+        # Store trade (the record array doubles when full)
+        if self.n_trades == len(self.trade_records):
+            self.trade_records = np.concatenate([self.trade_records, np.empty_like(self.trade_records)])
+        self.trade_records[self.n_trades] = (
+            self.entry_bar,
+            bar_index,
+            1 if self.current_position.direction == 'long' else -1,
+            self.current_position.entry_price,
+            exit_price,
+            self.current_position.size,
+            profit_points,
+            profit_value,
+            EXIT_REASONS.index(exit_reason),
+            self.current_position.highest_profit
+        )
+        self.n_trades += 1
         
         print(f"  📉 EXIT @ {exit_price:.2f} | P&L: {profit_points:.2f} pts (${profit_value:.2f}) | Reason: {exit_reason}")
         
@@ -229,7 +556,7 @@ class BacktestEngine:
     
     def _calculate_statistics(self, data: Dict) -> Dict:
         """Calculate backtest statistics"""
-        if not self.trades:
+        if not self.n_trades:
             return {
                 'total_trades': 0,
                 'winning_trades': 0,
@@ -248,38 +575,42 @@ class BacktestEngine:
                 'equity_curve': []
             }
         
-        trades_df = pd.DataFrame(self.trades)
+        profit_value = self.trade_records['profit_value'][:self.n_trades]
+        wins = profit_value[profit_value > 0]
+        losses = profit_value[profit_value <= 0]
         
         # Basic stats
-        total_trades = len(self.trades)
-        winning_trades = len(trades_df[trades_df['profit_value'] > 0])
-        losing_trades = len(trades_df[trades_df['profit_value'] < 0])
+        total_trades = self.n_trades
+        winning_trades = len(wins)
+        losing_trades = int(np.count_nonzero(profit_value < 0))
         win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
         
         # P&L stats
-        total_profit = trades_df[trades_df['profit_value'] > 0]['profit_value'].sum()
-        total_loss = abs(trades_df[trades_df['profit_value'] < 0]['profit_value'].sum())
+        total_profit = wins.sum()
+        total_loss = abs(profit_value[profit_value < 0].sum())
         profit_factor = (total_profit / total_loss) if total_loss > 0 else float('inf')
         
         # Equity curve stats
-        equity_df = pd.DataFrame(self.equity_curve)
-        final_capital = equity_df['equity'].iloc[-1] if len(equity_df) > 0 else self.initial_capital
+        equity = self.equity_values[:self.n_points]
+        final_capital = equity[-1] if len(equity) > 0 else self.initial_capital
         total_return = ((final_capital - self.initial_capital) / self.initial_capital * 100)
         
-        # Max drawdown
-        equity_series = equity_df['equity']
-        running_max = equity_series.expanding().max()
-        drawdown = (equity_series - running_max) / running_max * 100
-        max_drawdown = drawdown.min()
-        
-        # Sharpe ratio (simplified)
-        returns = equity_series.pct_change().dropna()
-        sharpe_ratio = (returns.mean() / returns.std() * np.sqrt(252)) if len(returns) > 0 else 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Max drawdown (NaN points skipped, like expanding().max() / min())
+            running_max = np.fmax.accumulate(equity)
+            drawdown = (equity - running_max) / running_max * 100
+            drawdown = drawdown[~np.isnan(drawdown)]
+            max_drawdown = drawdown.min() if len(drawdown) > 0 else np.nan
+            
+            # Sharpe ratio (simplified)
+            returns = equity[1:] / equity[:-1] - 1
+            returns = returns[~np.isnan(returns)]
+            if len(returns) > 1:
+                sharpe_ratio = returns.mean() / returns.std(ddof=1) * np.sqrt(252)
+            else:
+                sharpe_ratio = np.nan if len(returns) > 0 else 0
         
         # Average win/loss and largest win/loss
-        wins = trades_df[trades_df['profit_value'] > 0]['profit_value']
-        losses = trades_df[trades_df['profit_value'] <= 0]['profit_value']
-
         avg_win = wins.mean() if len(wins) > 0 else 0
         avg_loss = abs(losses.mean()) if len(losses) > 0 else 0  # Return positive value
         largest_win = wins.max() if len(wins) > 0 else 0
@@ -318,15 +649,15 @@ class BacktestEngine:
     
     def get_trades_dataframe(self) -> pd.DataFrame:
         """Get trades as pandas DataFrame"""
-        if not self.trades:
+        if not self.n_trades:
             return pd.DataFrame()
-        return pd.DataFrame(self.trades)
+        return self.trades.to_dataframe()
     
     def get_equity_dataframe(self) -> pd.DataFrame:
         """Get equity curve as pandas DataFrame"""
-        if not self.equity_curve:
+        if not self.n_points:
             return pd.DataFrame()
-        return pd.DataFrame(self.equity_curve)
+        return self.equity_curve.to_dataframe()
     
     def export_results(self, filepath: str):
         """Export backtest results to JSON"""
@@ -0,0 +1,312 @@
+"""
+Condition Compiler
+Compiles strategy entry conditions into vectorized NumPy boolean masks
+"""
+
+import re
+import numpy as np
+from typing import Dict, List, Optional
+
+
+OHLCV_KEYS = ['open', 'high', 'low', 'close', 'volume']
+
+COMPARISON_OPERATORS = {
+    '>': np.greater,
+    '<': np.less,
+    '>=': np.greater_equal,
+    '<=': np.less_equal,
+    '==': np.equal,
+    '!=': np.not_equal
+}
+
+CROSS_OPERATORS = ('cross_above', 'cross_below')
+
+# Literals that eval() turns into plain numbers
+_NUMBER_RE = re.compile(r'^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$')
+
+# Characters that can appear in str(value) - ids made only of these could
+# collide with substituted values inside the legacy eval() string
+_VALUE_CHARS = set('0123456789.eE+-naif')
+
+
+class ConditionCompiler:
+    """
+    Turns entry condition groups into whole-array boolean masks.
+
+    Mirrors Strategy.evaluate_condition bar-for-bar: every condition that can
+    be expressed as array operations is computed once over all bars, anything
+    else (time conditions, ambiguous ids, dict indicators, ...) falls back to
+    the per-bar evaluator so the resulting masks are always identical.
+    """
+
+    def __init__(self, strategy):
+        """
+        Args:
+            strategy: Strategy instance (indicator_cache must be populated)
+        """
+        self.strategy = strategy
+
+    def compile(self, cond_groups: List[Dict], data: Dict, active: np.ndarray) -> np.ndarray:
+        """
+        Compile one side (long/short) of entry_conditions into a mask
+
+        Args:
+            cond_groups: List of condition groups (nested or simple format)
+            data: OHLCV data dict
+            active: Bars where conditions are evaluated (trading hours, bar > 0)
+
+        Returns:
+            Boolean signal array
+        """
+        n_bars = len(active)
+        side_met = np.zeros(n_bars, dtype=bool)
+
+        for cond_group in cond_groups:
+            # Nested conditions format from UI
+            if "conditions" in cond_group:
+                group_met = np.ones(n_bars, dtype=bool)
+                for cond in cond_group["conditions"]:
+                    condition_str = f"{cond['left']} {cond['operator']} {cond['right']}"
+                    result = self.condition_mask(
+                        condition_str, data, active,
+                        cond.get("leftOffset", 0), cond.get("rightOffset", 0)
+                    )
+
+                    if cond.get("logic", "AND") == "AND":
+                        group_met &= result
+                    else:  # OR
+                        group_met |= result
+
+                # OR logic between different signal groups
+                side_met |= group_met
+            # Simple condition format (backward compatibility)
+            elif "condition" in cond_group:
+                result = self.condition_mask(cond_group["condition"], data, active, 0, 0)
+
+                if cond_group.get("logic", "AND") == "AND":
+                    side_met &= result
+                else:  # OR
+                    side_met |= result
+
+        return side_met & active
+
+    def condition_mask(self, condition: str, data: Dict, active: np.ndarray,
+                       left_offset: int = 0, right_offset: int = 0) -> np.ndarray:
+        """
+        Evaluate a single condition string over all bars
+
+        Args:
+            condition: Condition string like "ema_fast > ema_slow" or "close cross_above ema_5"
+            data: OHLCV data dict
+            active: Bars where the condition is needed
+            left_offset: Offset for left operand (lookback bars)
+            right_offset: Offset for right operand (lookback bars)
+
+        Returns:
+            Boolean array
+        """
+        n_bars = len(active)
+
+        if 'cross_above' in condition or 'cross_below' in condition:
+            mask = self._cross_mask(condition, data, n_bars, left_offset, right_offset)
+        else:
+            mask = self._compare_mask(condition, data, n_bars)
+
+        if mask is None:
+            mask = self._fallback_mask(condition, data, active, left_offset, right_offset)
+
+        return mask
+
+    # ==================== CROSS OPERATORS ====================
+
+    def _cross_mask(self, condition: str, data: Dict, n_bars: int,
+                    left_offset, right_offset) -> Optional[np.ndarray]:
+        """cross_above / cross_below with operand offsets"""
+        parts = condition.split()
+        if len(parts) != 3:
+            return np.zeros(n_bars, dtype=bool)
+
+        left_key, operator, right_key = parts
+        if operator not in CROSS_OPERATORS:
+            return np.zeros(n_bars, dtype=bool)
+
+        if not (_is_int(left_offset) and _is_int(right_offset)):
+            return None
+
+        left = self._lookup_series(left_key, data, n_bars)
+        right = self._lookup_series(right_key, data, n_bars)
+        if left is None or right is None:
+            return None
+
+        left_curr, ok_lc = _shift(*left, left_offset)
+        left_prev, ok_lp = _shift(*left, left_offset + 1)
+        right_curr, ok_rc = _shift(*right, right_offset)
+        right_prev, ok_rp = _shift(*right, right_offset + 1)
+        valid = ok_lc & ok_lp & ok_rc & ok_rp
+
+        with np.errstate(invalid='ignore'):
+            if operator == 'cross_above':
+                crossed = (left_prev <= right_prev) & (left_curr > right_curr)
+            else:
+                crossed = (left_prev >= right_prev) & (left_curr < right_curr)
+
+        return crossed & valid
+
+    def _lookup_series(self, key: str, data: Dict, n_bars: int):
+        """
+        Series used by Strategy._get_value for a key
+
+        Returns:
+            (values, readable) - readable is False for failed indicators,
+            whose lookups raise; None when not compilable
+        """
+        if key in OHLCV_KEYS:
+            if key not in data:
+                return None
+            return np.asarray(data[key], dtype=float), True
+
+        indicator_cache = self.strategy.indicator_cache
+        if key in indicator_cache:
+            values = indicator_cache[key]
+            if isinstance(values, tuple):
+                values = values[0]
+            elif isinstance(values, dict):
+                return np.zeros(n_bars), True
+            elif values is None:
+                return np.zeros(n_bars), False
+            values = np.asarray(values, dtype=float)
+            if len(values) != n_bars:
+                return None
+            return values, True
+
+        # Unknown operand evaluates to 0.0
+        return np.zeros(n_bars), True
+
+    # ==================== COMPARISON OPERATORS ====================
+
+    def _compare_mask(self, condition: str, data: Dict, n_bars: int) -> Optional[np.ndarray]:
+        """Plain comparison like "ema_fast > ema_slow" or "rsi < 30" """
+        parts = condition.split()
+        if len(parts) != 3 or parts[1] not in COMPARISON_OPERATORS:
+            return None
+
+        left_key, operator, right_key = parts
+        if not self._is_unambiguous(condition, (left_key, right_key)):
+            return None
+
+        left = self._operand_values(left_key, data, n_bars)
+        right = self._operand_values(right_key, data, n_bars)
+        if left is None or right is None:
+            return None
+        if left is False or right is False:
+            return np.zeros(n_bars, dtype=bool)
+
+        left_values, left_valid = left
+        right_values, right_valid = right
+
+        with np.errstate(invalid='ignore'):
+            result = COMPARISON_OPERATORS[operator](left_values, right_values)
+
+        return result & left_valid & right_valid
+
+    def _operand_values(self, key: str, data: Dict, n_bars: int):
+        """
+        Operand values as substituted by the eval() path
+
+        Returns:
+            (values, valid_mask), False when eval fails on every bar,
+            None when not compilable
+        """
+        all_valid = np.ones(n_bars, dtype=bool)
+
+        if _NUMBER_RE.match(key):
+            return np.full(n_bars, float(key)), all_valid
+
+        if key in OHLCV_KEYS:
+            if key not in data:
+                return None
+            return np.asarray(data[key], dtype=float), all_valid
+
+        indicator_cache = self.strategy.indicator_cache
+        if key in indicator_cache:
+            values = indicator_cache[key]
+            if isinstance(values, tuple):
+                values = values[0]
+            elif isinstance(values, dict):
+                return None
+            elif values is None:
+                return False
+            values = np.asarray(values, dtype=float)
+            if len(values) != n_bars:
+                return None
+            # str(nan) / str(inf) are not valid expressions for eval()
+            return values, np.isfinite(values)
+
+        return None
+
+    def _is_unambiguous(self, condition: str, operands) -> bool:
+        """
+        Check that the legacy string substitution would only ever replace
+        the two operand tokens, so comparing arrays gives the same answer
+        """
+        indicator_ids = list(self.strategy.indicator_cache.keys())
+        tokens = condition.split()
+
+        # Names must only match whole operand tokens
+        for name in OHLCV_KEYS + indicator_ids + ['time']:
+            for token in tokens:
+                if name in token and name != token:
+                    return False
+
+        # Ids must not match inside text inserted by earlier replacements
+        for ind_id in indicator_ids:
+            if set(ind_id) <= _VALUE_CHARS | set('[]'):
+                return False
+            if any(ind_id in f"data['{key}'][" for key in OHLCV_KEYS):
+                return False
+
+        return 'time' not in operands
+
+    # ==================== FALLBACK ====================
+
+    def _fallback_mask(self, condition: str, data: Dict, active: np.ndarray,
+                       left_offset, right_offset) -> np.ndarray:
+        """Per-bar evaluation for conditions that cannot be compiled"""
+        mask = np.zeros(len(active), dtype=bool)
+        for i in np.flatnonzero(active):
+            mask[i] = self.strategy.evaluate_condition(condition, int(i), data, left_offset, right_offset)
+        return mask
+
+
+def _is_int(value) -> bool:
+    """True for plain integer offsets"""
+    return isinstance(value, (int, np.integer)) and not isinstance(value, bool)
+
+
+def _shift(values: np.ndarray, readable: bool, lag: int):
+    """
+    Values at bar_index - lag for every bar
+
+    Returns:
+        (shifted, valid) - bars looking before the first bar read 0.0,
+        bars looking past the last bar (or reading an unreadable series)
+        are invalid
+    """
+    n_bars = len(values)
+    shifted = np.zeros(n_bars)
+    valid = np.ones(n_bars, dtype=bool)
+
+    if lag >= 0:
+        if lag < n_bars:
+            shifted[lag:] = values[:n_bars - lag]
+            if not readable:
+                valid[lag:] = False
+    else:
+        lead = -lag
+        if lead < n_bars:
+            shifted[:n_bars - lead] = values[lead:]
+        if not readable:
+            valid[:] = False
+        valid[max(n_bars - lead, 0):] = False
+
+    return shifted, valid
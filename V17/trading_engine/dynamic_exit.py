@@ -284,3 +284,71 @@ class Position:
             'exit_reason': self.exit_reason,
             'size': self.size
         }
+
+
+# ==================== ARRAY HELPERS ====================
+
+def pack_exit_rules(tables: List[List[Dict]]) -> Dict[str, np.ndarray]:
+    """
+    Rules of every TP/SL table as (tables x rules) arrays
+    
+    Missing levels (None / 0) are NaN; padding rules match no profit.
+    Empty tables use the DynamicExitManager default rules.
+    
+    Args:
+        tables: List of tp_sl_rules lists
+    
+    Returns:
+        Dict with 'low', 'high', 'tp', 'sl', 'trailing' (points) and
+        'percentage' (trailing = 68% of the highest profit)
+    """
+    tables = [DynamicExitManager(table).tp_sl_rules for table in tables]
+    shape = (len(tables), max(len(table) for table in tables))
+    packed = {key: np.full(shape, np.nan) for key in ('low', 'high', 'tp', 'sl', 'trailing')}
+    packed['percentage'] = np.zeros(shape, dtype=bool)
+    
+    for k, table in enumerate(tables):
+        for r, rule in enumerate(table):
+            packed['low'][k, r], packed['high'][k, r] = rule['profit_range']
+            for key in ('tp', 'sl'):
+                if rule.get(key):
+                    packed[key][k, r] = rule[key]
+            trailing = rule.get('trailing')
+            if trailing == 'percentage':
+                packed['percentage'][k, r] = True
+            elif trailing:
+                packed['trailing'][k, r] = trailing
+    
+    return packed
+
+
+def rule_levels(packed: Dict[str, np.ndarray], rows: np.ndarray, profit: np.ndarray):
+    """
+    Level points of the first rule with low <= profit < high (DynamicExitManager._find_rule)
+    
+    Args:
+        packed: Output of pack_exit_rules
+        rows: Table index of every profit value
+        profit: Profit used for the rule lookup
+    
+    Returns:
+        (tp, sl, trailing, percentage) arrays - NaN / False when the level
+        is missing or no rule matches
+    """
+    profit = profit[:, None]
+    match = (packed['low'][rows] <= profit) & (profit < packed['high'][rows])
+    found = match.any(axis=1)
+    rule = match.argmax(axis=1)
+    
+    levels = []
+    for key in ('tp', 'sl', 'trailing'):
+        values = packed[key][rows, rule]
+        values[~found] = np.nan
+        levels.append(values)
+    levels.append(packed['percentage'][rows, rule] & found)
+    return levels
+
+
+def level_touched(price: np.ndarray, long_side, long_hit: np.ndarray, short_hit: np.ndarray) -> np.ndarray:
+    """Level hit by the bar (missing and zero levels are never checked, like `if levels[...]`)"""
+    return ~np.isnan(price) & (price != 0) & np.where(long_side, long_hit, short_hit)
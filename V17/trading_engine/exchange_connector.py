@@ -12,7 +12,7 @@ import requests
 import base64
 import ssl
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 import MetaTrader5 as mt5
 import logging
 
@@ -87,6 +87,20 @@ class TickAggregator:
         if symbol not in self.completed_candles:
             return []
         return self.completed_candles[symbol][-limit:]
+    
+    def get_current_candle(self, symbol: str) -> Optional[Dict]:
+        """Get the candle still forming (None before the first tick)"""
+        candle = self.current_candles.get(symbol)
+        if candle is None:
+            return None
+        return {
+            'time': candle['start_time'],
+            'open': candle['open'],
+            'high': candle['high'],
+            'low': candle['low'],
+            'close': candle['close'],
+            'volume': candle['volume']
+        }
 
 
 class TimeframeAggregator:
@@ -177,6 +191,34 @@ class ExchangeConnector:
         self.exchange_name = exchange_name
         self.connected = False
         self.credentials = {}
+        self.listeners = []  # Market data callbacks: callback(event, symbol, data, received_at)
+    
+    def add_listener(self, callback: Callable):
+        """
+        Register a market data callback (MQTT connectors call it from their network thread)
+        
+        Args:
+            callback: callback(event, symbol, data, received_at) with event 'tick'
+                      (ticker snapshot), 'candle_forming' (1m candle still forming, from
+                      ticks or an MQTT OHLC message) or 'candle' (1m candle completed by
+                      the tick aggregator) and received_at the time.perf_counter() of
+                      the MQTT message
+        """
+        if callback not in self.listeners:
+            self.listeners.append(callback)
+    
+    def remove_listener(self, callback: Callable):
+        """Unregister a market data callback"""
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+    
+    def _notify(self, event: str, symbol: str, data: Dict, received_at: float):
+        """Push a market data event to every listener"""
+        for callback in list(self.listeners):
+            try:
+                callback(event, symbol, data, received_at)
+            except Exception as e:
+                logger.error(f"❌ Market data listener error: {e}")
         
     def connect(self, credentials: Dict) -> bool:
         """Kết nối tới sàn"""
@@ -1754,6 +1796,7 @@ class DNSEMQTTConnector(ExchangeConnector):
     
     def _on_message(self, client, userdata, msg):
         """Handle incoming MQTT messages"""
+        received_at = time.perf_counter()
         try:
             payload = json.loads(msg.payload.decode('utf-8'))
             
@@ -1797,6 +1840,11 @@ class DNSEMQTTConnector(ExchangeConnector):
                         if len(self.ohlc_data[symbol]) > 1000:
                             self.ohlc_data[symbol] = self.ohlc_data[symbol][-1000:]
                         logger.info(f"🕯️ DNSE: Completed 1m candle for {symbol}: O={completed_candle['open']:.2f} C={completed_candle['close']:.2f}")
+                    
+                    self._notify('tick', symbol, dict(self.market_data[symbol]), received_at)
+                    if completed_candle:
+                        self._notify('candle', symbol, completed_candle, received_at)
+                    self._notify('candle_forming', symbol, self.tick_aggregator.get_current_candle(symbol), received_at)
             
             # Parse other message types
             message_type = payload.get('channel', payload.get('type', ''))
@@ -1820,6 +1868,7 @@ class DNSEMQTTConnector(ExchangeConnector):
                         'time': data.get('time', time.time())
                     }
                     logger.debug(f"📊 {symbol}: ${self.market_data[symbol]['price']}")
+                    self._notify('tick', symbol, dict(self.market_data[symbol]), received_at)
             
             elif 'OHLC' in message_type or 'ohlc' in msg.topic:
                 # OHLC candle data
@@ -1844,6 +1893,7 @@ class DNSEMQTTConnector(ExchangeConnector):
                         self.ohlc_data[symbol] = self.ohlc_data[symbol][-1000:]
                     
                     logger.debug(f"🕯️ {symbol} OHLC: C={candle['close']}")
+                    self._notify('candle_forming', symbol, candle, received_at)
             
         except Exception as e:
             logger.error(f"❌ Error processing MQTT message: {e}")
@@ -2135,6 +2185,7 @@ class EntradeMQTTConnector(ExchangeConnector):
     
     def _on_message(self, client, userdata, msg):
         """Handle incoming MQTT messages for KRX data"""
+        received_at = time.perf_counter()
         try:
             payload = json.loads(msg.payload.decode('utf-8'))
             
@@ -2178,6 +2229,11 @@ class EntradeMQTTConnector(ExchangeConnector):
                         if len(self.ohlc_data[symbol]) > 1000:
                             self.ohlc_data[symbol] = self.ohlc_data[symbol][-1000:]
                         logger.info(f"🕯️ KRX: Completed 1m candle for {symbol}: O={completed_candle['open']:.2f} C={completed_candle['close']:.2f}")
+                    
+                    self._notify('tick', symbol, dict(self.market_data[symbol]), received_at)
+                    if completed_candle:
+                        self._notify('candle', symbol, completed_candle, received_at)
+                    self._notify('candle_forming', symbol, self.tick_aggregator.get_current_candle(symbol), received_at)
             
             # Parse other message types
             message_type = payload.get('channel', payload.get('type', ''))
@@ -2200,6 +2256,7 @@ class EntradeMQTTConnector(ExchangeConnector):
                         'time': data.get('time', time.time())
                     }
                     logger.debug(f"📊 KRX {symbol}: ${self.market_data[symbol]['price']}")
+                    self._notify('tick', symbol, dict(self.market_data[symbol]), received_at)
             
             elif 'OHLC' in message_type or 'ohlc' in msg.topic:
                 data = payload.get('data', payload)
@@ -2222,6 +2279,7 @@ class EntradeMQTTConnector(ExchangeConnector):
                         self.ohlc_data[symbol] = self.ohlc_data[symbol][-1000:]
                     
                     logger.debug(f"🕯️ KRX {symbol} OHLC: C={candle['close']}")
+                    self._notify('candle_forming', symbol, candle, received_at)
             
         except Exception as e:
             logger.error(f"❌ Error processing MQTT message: {e}")
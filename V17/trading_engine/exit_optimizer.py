@@ -0,0 +1,300 @@
+"""
+Exit Optimizer
+Evaluates many TP/SL tables against one set of entry signals at once
+- Entry signals are generated once for the strategy
+- All candidate tables are simulated in lockstep: every bar updates a
+  (tables,) state vector, exit levels come from a (tables x rules) lookup
+- Positions, exit levels and prices, slippage, commission, daily loss limit
+  and statistics follow BacktestEngine.run with DynamicExitManager
+"""
+
+import numpy as np
+from typing import Dict, List, Optional
+
+from .strategy import Strategy
+from .dynamic_exit import pack_exit_rules, rule_levels, level_touched
+
+# Exit reasons in priority order (same as DynamicExitManager.should_exit)
+EXIT_SL, EXIT_TRAILING, EXIT_TP = 0, 1, 2
+
+
+class ExitOptimizer:
+    """
+    Batch evaluation of TP/SL tables for fixed entry signals
+
+    Usage:
+        exit_optimizer = ExitOptimizer(strategy, data)
+        results = exit_optimizer.evaluate([table_a, table_b, ...])
+        # results[k] has the BacktestEngine.run statistics of table k
+    """
+
+    def __init__(self,
+                 strategy: Strategy,
+                 data: Dict[str, np.ndarray],
+                 initial_capital: float = 10000,
+                 commission: float = 0.5,
+                 slippage: float = 0.1,
+                 signals: Optional[Dict[str, np.ndarray]] = None):
+        """
+        Args:
+            strategy: Strategy providing entry signals and risk settings
+            data: OHLCV data with 'time' (same as BacktestEngine.run)
+            initial_capital: Starting capital
+            commission: Commission per trade (points)
+            slippage: Slippage per trade (points)
+            signals: Precomputed 'buy'/'short' arrays (generated when None)
+        """
+        self.strategy = strategy
+        self.data = data
+        self.initial_capital = initial_capital
+        self.commission = commission
+        self.slippage = slippage
+        self.signals = signals if signals is not None else strategy.generate_signals(data)
+
+    def evaluate(self, tables: List[List[Dict]]) -> List[Dict]:
+        """
+        Backtest statistics for each TP/SL table
+
+        Args:
+            tables: List of tp_sl_table rule lists (profit_range, tp, sl, trailing)
+
+        Returns:
+            One dict per table with the statistics of BacktestEngine.run
+            (without trades / equity_curve / daily_pnl), or {'error': message}
+            for tables the backtest would fail on
+        """
+        if not tables:
+            return []
+
+        data = self.data
+        opens = np.asarray(data['open'], dtype=float)
+        highs = np.asarray(data['high'], dtype=float)
+        lows = np.asarray(data['low'], dtype=float)
+        closes = np.asarray(data['close'], dtype=float)
+        buy_signals = np.asarray(self.signals['buy'], dtype=bool)
+        short_signals = np.asarray(self.signals['short'], dtype=bool)
+        n_bars = len(closes)
+
+        config = self.strategy.config
+        risk_mgmt = config['risk_management']
+        max_positions = risk_mgmt.get('max_positions', 1)
+        max_daily_loss = risk_mgmt.get('max_daily_loss', 50)
+        position_size_pct = risk_mgmt.get('position_size_pct', 10)
+        settings = config.get('settings', {})
+        can_enter = max_positions > 0 and settings.get('active', True)
+        buy_active = settings.get('buy_active', True)
+        short_active = settings.get('short_active', True)
+
+        # Daily P&L keys (str(time)[:10] like BacktestEngine); the same key may
+        # come back later in the data (e.g. HH:MM times), so totals are kept per key
+        times = data['time']
+        has_date = np.array([bool(t) for t in times], dtype=bool)
+        day_keys = {}
+        day_codes = np.array([day_keys.setdefault(str(t)[:10], len(day_keys)) for t in times], dtype=np.int64)
+
+        packed = pack_exit_rules(tables)
+        n_tables = len(tables)
+        alive = np.ones(n_tables, dtype=bool)
+        errors = [None] * n_tables
+
+        capital = np.full(n_tables, float(self.initial_capital))
+        direction = np.zeros(n_tables)      # 1 long, -1 short, 0 flat
+        entry_price = np.zeros(n_tables)
+        size = np.zeros(n_tables)
+        highest_profit = np.zeros(n_tables)
+        day_pnl = {}    # day code -> P&L per table (only days with exits)
+
+        # Trade statistics
+        n_trades = np.zeros(n_tables, dtype=np.int64)
+        n_wins = np.zeros(n_tables, dtype=np.int64)
+        n_losses = np.zeros(n_tables, dtype=np.int64)
+        n_non_wins = np.zeros(n_tables, dtype=np.int64)
+        total_profit = np.zeros(n_tables)
+        total_loss = np.zeros(n_tables)
+        non_win_sum = np.zeros(n_tables)
+        largest_win = np.full(n_tables, -np.inf)
+        largest_non_win = np.full(n_tables, np.inf)
+
+        # Equity curve statistics (streamed: running max drawdown, sums of returns)
+        last_equity = np.full(n_tables, np.nan)
+        running_max = np.full(n_tables, -np.inf)
+        max_drawdown = np.full(n_tables, np.inf)
+        n_skipped = np.zeros(n_tables, dtype=np.int64)     # bars without equity point or return
+        returns_sum = np.zeros(n_tables)
+        returns_sq_sum = np.zeros(n_tables)
+
+        def record_trades(rows, profit_value):
+            n_trades[rows] += 1
+            wins = profit_value > 0
+            n_wins[rows[wins]] += 1
+            total_profit[rows[wins]] += profit_value[wins]
+            largest_win[rows[wins]] = np.maximum(largest_win[rows[wins]], profit_value[wins])
+            losses = profit_value < 0
+            n_losses[rows[losses]] += 1
+            total_loss[rows[losses]] += profit_value[losses]
+            non_wins = ~wins
+            n_non_wins[rows[non_wins]] += 1
+            non_win_sum[rows[non_wins]] += profit_value[non_wins]
+            largest_non_win[rows[non_wins]] = np.minimum(largest_non_win[rows[non_wins]], profit_value[non_wins])
+
+        def fail(rows, message):
+            for k in rows:
+                errors[k] = message
+            alive[rows] = False
+            direction[rows] = 0
+
+        for i in range(1, n_bars):
+            high, low, close = highs[i], lows[i], closes[i]
+
+            # ---- exits of open positions ----
+            rows = np.flatnonzero(direction != 0)
+            if len(rows):
+                side = direction[rows]
+                entry = entry_price[rows]
+                mid = (high + low) / 2
+                highest_profit[rows] = np.maximum(highest_profit[rows], side * (mid - entry))
+                hp = highest_profit[rows]
+
+                tp, sl, trailing, percentage = rule_levels(packed, rows, hp)
+                trailing = np.where(percentage, hp * 0.68, trailing)
+                tp_price = entry + side * tp
+                sl_price = entry - side * sl
+                trailing_price = mid - side * trailing
+
+                long_side = side > 0
+                sl_hit = level_touched(sl_price, long_side, low <= sl_price, high >= sl_price)
+                trailing_hit = level_touched(trailing_price, long_side, low <= trailing_price, high >= trailing_price)
+                tp_hit = level_touched(tp_price, long_side, high >= tp_price, low <= tp_price)
+
+                exiting = sl_hit | trailing_hit | tp_hit
+                if exiting.any():
+                    reason = np.where(sl_hit, EXIT_SL, np.where(trailing_hit, EXIT_TRAILING, EXIT_TP))[exiting]
+                    rows, side, entry, hp = rows[exiting], side[exiting], entry[exiting], hp[exiting]
+
+                    # Exit price from the levels at the close (get_exit_levels(current_close))
+                    close_profit = np.maximum(side * (close - entry), hp)
+                    tp, sl, trailing, percentage = rule_levels(packed, rows, close_profit)
+                    trailing = np.where(percentage, close_profit * 0.68, trailing)
+                    exit_price = np.select(
+                        [reason == EXIT_SL, reason == EXIT_TRAILING],
+                        [entry - side * sl, close - side * trailing],
+                        entry + side * tp
+                    )
+
+                    missing = np.isnan(exit_price)
+                    if missing.any():
+                        fail(rows[missing], f"No exit level for the exit on bar {i}")
+                        rows, side, entry, exit_price = rows[~missing], side[~missing], entry[~missing], exit_price[~missing]
+
+                    exit_price = exit_price - side * self.slippage
+                    profit_value = side * (exit_price - entry) * size[rows] - self.commission * 2
+                    capital[rows] += profit_value
+                    if has_date[i]:
+                        day_totals = day_pnl.setdefault(day_codes[i], np.zeros(n_tables))
+                        day_totals[rows] += profit_value
+                    record_trades(rows, profit_value)
+                    direction[rows] = 0
+
+            # ---- entries ----
+            appended = alive.copy()
+            if can_enter:
+                flat = alive & (direction == 0)
+                if has_date[i]:
+                    # A day without exits has P&L 0 (blocked when max_daily_loss <= 0)
+                    blocked = flat & (day_pnl.get(day_codes[i], 0.0) <= -max_daily_loss)
+                    flat &= ~blocked
+                    appended &= ~blocked
+                    n_skipped[blocked] += 1
+
+                entry_side = 1 if buy_signals[i] and buy_active else -1 if short_signals[i] and short_active else 0
+                if entry_side:
+                    rows = np.flatnonzero(flat)
+                    price = opens[i] + entry_side * self.slippage
+                    direction[rows] = entry_side
+                    entry_price[rows] = price
+                    size[rows] = capital[rows] * (position_size_pct / 100) / price
+                    highest_profit[rows] = 0
+
+            # ---- equity curve ----
+            # A flat table whose capital equals its last equity point adds a zero
+            # return and leaves the drawdown unchanged, so only the others are updated
+            rows = np.flatnonzero(appended & ((direction != 0) | (capital != last_equity)))
+            if not len(rows):
+                continue
+            equity = capital[rows] + direction[rows] * (close - entry_price[rows])
+            with np.errstate(divide='ignore', invalid='ignore'):
+                returns = equity / last_equity[rows] - 1
+            no_return = np.isnan(returns)
+            n_skipped[rows[no_return]] += 1
+            returns = np.where(no_return, 0, returns)
+            returns_sum[rows] += returns
+            returns_sq_sum[rows] += returns * returns
+            running_max[rows] = np.maximum(running_max[rows], equity)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                drawdown = (equity - running_max[rows]) / running_max[rows] * 100
+            max_drawdown[rows] = np.fmin(max_drawdown[rows], drawdown)
+            last_equity[rows] = equity
+
+        # Close remaining positions at the last close
+        rows = np.flatnonzero(direction != 0)
+        if len(rows):
+            profit_value = direction[rows] * (closes[-1] - entry_price[rows]) * size[rows] - self.commission * 2
+            capital[rows] += profit_value
+            record_trades(rows, profit_value)
+
+        return [self._statistics(k, errors, n_trades, n_wins, n_losses, n_non_wins, total_profit,
+                                 total_loss, non_win_sum, largest_win, largest_non_win, last_equity,
+                                 max_drawdown, n_bars - 1 - n_skipped, returns_sum, returns_sq_sum)
+                for k in range(n_tables)]
+
+    def _statistics(self, k, errors, n_trades, n_wins, n_losses, n_non_wins, total_profit, total_loss,
+                    non_win_sum, largest_win, largest_non_win, last_equity, max_drawdown,
+                    n_returns, returns_sum, returns_sq_sum) -> Dict:
+        """Statistics of table k in the BacktestEngine._calculate_statistics layout"""
+        if errors[k] is not None:
+            return {'error': errors[k]}
+
+        if n_trades[k] == 0:
+            return {
+                'total_trades': 0,
+                'winning_trades': 0,
+                'losing_trades': 0,
+                'win_rate': 0,
+                'final_capital': self.initial_capital,
+                'total_return': 0,
+                'max_drawdown': 0,
+                'profit_factor': 0,
+                'sharpe_ratio': 0,
+                'avg_win': 0,
+                'avg_loss': 0,
+                'largest_win': 0,
+                'largest_loss': 0
+            }
+
+        final_capital = float(last_equity[k])
+        gross_loss = abs(float(total_loss[k]))
+
+        sharpe_ratio = 0
+        if n_returns[k] > 1:
+            mean = returns_sum[k] / n_returns[k]
+            std = np.sqrt(max(returns_sq_sum[k] - returns_sum[k] * mean, 0) / (n_returns[k] - 1))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                sharpe_ratio = float(mean / std * np.sqrt(252))
+            if np.isnan(sharpe_ratio):
+                sharpe_ratio = 0
+
+        return {
+            'total_trades': int(n_trades[k]),
+            'winning_trades': int(n_wins[k]),
+            'losing_trades': int(n_losses[k]),
+            'win_rate': n_wins[k] / n_trades[k] * 100,
+            'final_capital': final_capital,
+            'total_return': (final_capital - self.initial_capital) / self.initial_capital * 100,
+            'max_drawdown': float(max_drawdown[k]),
+            'profit_factor': float(total_profit[k]) / gross_loss if gross_loss > 0 else float('inf'),
+            'sharpe_ratio': sharpe_ratio,
+            'avg_win': float(total_profit[k]) / n_wins[k] if n_wins[k] else 0,
+            'avg_loss': abs(float(non_win_sum[k]) / n_non_wins[k]) if n_non_wins[k] else 0,
+            'largest_win': float(largest_win[k]) if n_wins[k] else 0,
+            'largest_loss': abs(float(largest_non_win[k])) if n_non_wins[k] else 0
+        }
@@ -0,0 +1,317 @@
+"""
+Indicator Graph
+Plans a strategy's indicators as a DAG of shared primitive computations
+- Each indicator entry expands into primitive nodes (EMA(n), TR, ATR(n), rolling min/max, ...)
+- Identical nodes are merged (common-subexpression elimination) and evaluated once per dataset
+- Every indicator result is identical to calculate_indicator for the same type and params
+"""
+
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Dict, Tuple, Any, Callable
+
+from .indicators import Indicators, _compute_indicator
+from .afl_primitives import hhv, llv
+
+# Source node standing for the whole dataset dict (inputs of opaque indicators)
+DATA_NODE = 'data'
+
+
+class _Failed:
+    """Marks a node whose evaluation raised (dependents fail with the same error)"""
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+class IndicatorGraph:
+    """
+    DAG of primitive indicator computations
+
+    Nodes are named after their operation, inputs and params
+    (e.g. "ema(close,5)", "ema(tr,14)", "rolling_max(high,20)"), so two
+    indicators asking for the same computation get the same node.
+
+    Usage:
+        graph = IndicatorGraph()
+        graph.add_indicator('ema_fast', 'EMA', {'period': 5})
+        graph.add_indicator('macd', 'MACD', {'fast': 5, 'slow': 26, 'signal': 9})
+        results = graph.evaluate(data)   # ema(close,5) is computed once
+    """
+
+    def __init__(self):
+        self.nodes = OrderedDict()    # name -> (func, dependency names); insertion order is topological
+        self.outputs = OrderedDict()  # indicator id -> node name or tuple of node names
+        self.requested = 0            # primitive computations asked for by the expansions
+        self.evaluated = 0            # primitive computations actually run by evaluate()
+
+    def source(self, key: str) -> str:
+        """Node reading one OHLCV series from the dataset"""
+        if key not in self.nodes:
+            self.nodes[key] = (None, ())
+        return key
+
+    def node(self, op: str, deps: Tuple[str, ...], params: Tuple, func: Callable) -> str:
+        """
+        Add (or reuse) a primitive node
+
+        Args:
+            op: Operation name
+            deps: Names of the input nodes, passed to func in order
+            params: Parameters baked into func (part of the node identity)
+            func: func(*dep_values) -> value
+
+        Returns:
+            Node name
+        """
+        args = ','.join(list(deps) + [repr(p) for p in params])
+        name = f"{op}({args})" if args else op
+        self.requested += 1
+        if name not in self.nodes:
+            self.nodes[name] = (func, tuple(deps))
+        return name
+
+    def add_indicator(self, ind_id: str, ind_type: str, params: Dict):
+        """Expand one strategy indicator entry into nodes"""
+        expand = EXPANSIONS.get(ind_type)
+        if expand is None:
+            self.outputs[ind_id] = _opaque(self, ind_type, params)
+        else:
+            self.outputs[ind_id] = expand(self, params)
+
+    def evaluate(self, data: Dict[str, np.ndarray]) -> Dict[str, Any]:
+        """
+        Evaluate every node once
+
+        Returns:
+            Dict indicator id -> result (array, tuple or dict), or the
+            Exception raised while computing it
+        """
+        values = {}
+        for name, (func, deps) in self.nodes.items():
+            if func is None:
+                try:
+                    values[name] = data if name == DATA_NODE else data[name]
+                except Exception as e:
+                    values[name] = _Failed(e)
+                continue
+
+            inputs = [values[dep] for dep in deps]
+            failed = next((value for value in inputs if isinstance(value, _Failed)), None)
+            if failed is not None:
+                values[name] = failed
+                continue
+
+            self.evaluated += 1
+            try:
+                values[name] = func(*inputs)
+            except Exception as e:
+                values[name] = _Failed(e)
+
+        results = {}
+        for ind_id, output in self.outputs.items():
+            names = output if isinstance(output, tuple) else (output,)
+            failed = next((values[name] for name in names if isinstance(values[name], _Failed)), None)
+            if failed is not None:
+                results[ind_id] = failed.error
+            elif isinstance(output, tuple):
+                results[ind_id] = tuple(values[name] for name in output)
+            else:
+                results[ind_id] = values[output]
+
+        return results
+
+    def stats(self) -> Dict:
+        """
+        Primitive counts
+
+        Returns:
+            Dict with requested (what evaluating each indicator on its own
+            would compute), nodes (distinct computations), evaluated and saved
+        """
+        nodes = sum(1 for func, _ in self.nodes.values() if func is not None)
+        return {
+            'requested': self.requested,
+            'nodes': nodes,
+            'evaluated': self.evaluated,
+            'saved': self.requested - nodes
+        }
+
+
+# ==================== PRIMITIVES ====================
+
+def _ema(graph: IndicatorGraph, src: str, period) -> str:
+    return graph.node('ema', (src,), (period,), lambda x: Indicators.ema(x, period))
+
+
+def _sma(graph: IndicatorGraph, src: str, period) -> str:
+    return graph.node('sma', (src,), (period,), lambda x: Indicators.sma(x, period))
+
+
+def _rolling_max(graph: IndicatorGraph, src: str, period) -> str:
+    return graph.node('rolling_max', (src,), (period,), lambda x: hhv(x, period))
+
+
+def _rolling_min(graph: IndicatorGraph, src: str, period) -> str:
+    return graph.node('rolling_min', (src,), (period,), lambda x: llv(x, period))
+
+
+def _true_range(graph: IndicatorGraph) -> str:
+    deps = (graph.source('high'), graph.source('low'), graph.source('close'))
+    return graph.node('tr', deps, (), Indicators.true_range)
+
+
+def _atr(graph: IndicatorGraph, period) -> str:
+    """ATR(n) = EMA(TR, n)"""
+    return _ema(graph, _true_range(graph), period)
+
+
+def _typical_price(graph: IndicatorGraph) -> str:
+    deps = (graph.source('high'), graph.source('low'), graph.source('close'))
+    return graph.node('tp', deps, (), lambda high, low, close: (high + low + close) / 3)
+
+
+def _opaque(graph: IndicatorGraph, ind_type: str, params: Dict) -> str:
+    """Whole indicator as one node (no shared sub-computations)"""
+    frozen = tuple(sorted((str(key), value) for key, value in params.items()))
+    return graph.node(ind_type, (graph.source(DATA_NODE),), frozen,
+                      lambda data: _compute_indicator(ind_type, data, params))
+
+
+# ==================== EXPANSIONS ====================
+# Defaults and arithmetic follow _compute_indicator / Indicators exactly
+
+def _expand_ema(graph, params):
+    return _ema(graph, graph.source('close'), params.get('period', 14))
+
+
+def _expand_sma(graph, params):
+    return _sma(graph, graph.source('close'), params.get('period', 14))
+
+
+def _expand_wma(graph, params):
+    period = params.get('period', 14)
+    return graph.node('wma', (graph.source('close'),), (period,), lambda x: Indicators.wma(x, period))
+
+
+def _expand_dema(graph, params):
+    period = params.get('period', 14)
+    ema1 = _ema(graph, graph.source('close'), period)
+    ema2 = _ema(graph, ema1, period)
+    return graph.node('dema', (ema1, ema2), (), lambda e1, e2: 2 * e1 - e2)
+
+
+def _expand_tema(graph, params):
+    period = params.get('period', 14)
+    ema1 = _ema(graph, graph.source('close'), period)
+    ema2 = _ema(graph, ema1, period)
+    ema3 = _ema(graph, ema2, period)
+    return graph.node('tema', (ema1, ema2, ema3), (), lambda e1, e2, e3: 3 * e1 - 3 * e2 + e3)
+
+
+def _expand_rsi(graph, params):
+    period = params.get('period', 14)
+    close = graph.source('close')
+    delta = graph.node('delta', (close,), (), lambda x: np.diff(x, prepend=x[0]))
+    gain = graph.node('gain', (delta,), (), lambda d: np.where(d > 0, d, 0))
+    loss = graph.node('loss', (delta,), (), lambda d: np.where(d < 0, -d, 0))
+    avg_gain = _ema(graph, gain, period)
+    avg_loss = _ema(graph, loss, period)
+
+    def rsi(avg_gain, avg_loss):
+        rs = avg_gain / (avg_loss + 1e-10)
+        return 100 - (100 / (1 + rs))
+
+    return graph.node('rsi', (avg_gain, avg_loss), (), rsi)
+
+
+def _expand_macd(graph, params):
+    close = graph.source('close')
+    ema_fast = _ema(graph, close, params.get('fast', 12))
+    ema_slow = _ema(graph, close, params.get('slow', 26))
+    macd_line = graph.node('sub', (ema_fast, ema_slow), (), lambda a, b: a - b)
+    signal_line = _ema(graph, macd_line, params.get('signal', 9))
+    histogram = graph.node('sub', (macd_line, signal_line), (), lambda a, b: a - b)
+    return macd_line, signal_line, histogram
+
+
+def _expand_stochastic(graph, params):
+    k_period = params.get('k_period', 14)
+    lowest_low = _rolling_min(graph, graph.source('low'), k_period)
+    highest_high = _rolling_max(graph, graph.source('high'), k_period)
+    k = graph.node('stoch_k', (graph.source('close'), lowest_low, highest_high), (),
+                   lambda close, ll, hh: 100 * (close - ll) / (hh - ll + 1e-10))
+    d = _sma(graph, k, params.get('d_period', 3))
+    return k, d
+
+
+def _expand_cci(graph, params):
+    period = params.get('period', 20)
+    tp = _typical_price(graph)
+    sma_tp = _sma(graph, tp, period)
+    mad = graph.node('rolling_mad', (tp,), (period,), lambda x: Indicators.rolling_mad(x, period))
+    return graph.node('cci', (tp, sma_tp, mad), (),
+                      lambda tp, sma_tp, mad: (tp - sma_tp) / (0.015 * mad + 1e-10))
+
+
+def _expand_bollinger(graph, params):
+    period = params.get('period', 20)
+    std_dev = params.get('std_dev', 2.0)
+    close = graph.source('close')
+    middle = _sma(graph, close, period)
+    std = graph.node('rolling_std', (close,), (period,), lambda x: pd.Series(x).rolling(period).std().values)
+    upper = graph.node('band_upper', (middle, std), (std_dev,), lambda m, s: m + (std_dev * s))
+    lower = graph.node('band_lower', (middle, std), (std_dev,), lambda m, s: m - (std_dev * s))
+    return upper, middle, lower
+
+
+def _expand_atr(graph, params):
+    return _atr(graph, params.get('period', 14))
+
+
+def _expand_keltner(graph, params):
+    period = params.get('period', 20)
+    multiplier = params.get('multiplier', 2.0)
+    middle = _ema(graph, graph.source('close'), period)
+    atr = _atr(graph, period)
+    upper = graph.node('band_upper', (middle, atr), (multiplier,), lambda m, a: m + (multiplier * a))
+    lower = graph.node('band_lower', (middle, atr), (multiplier,), lambda m, a: m - (multiplier * a))
+    return upper, middle, lower
+
+
+def _expand_donchian(graph, params):
+    period = params.get('period', 20)
+    upper = _rolling_max(graph, graph.source('high'), period)
+    lower = _rolling_min(graph, graph.source('low'), period)
+    middle = graph.node('mid', (upper, lower), (), lambda u, l: (u + l) / 2)
+    return upper, middle, lower
+
+
+def _expand_supertrend(graph, params):
+    multiplier = params.get('multiplier', 3.0)
+    atr = _atr(graph, params.get('period', 10))
+    deps = (graph.source('high'), graph.source('low'), graph.source('close'), atr)
+    supertrend = graph.node('supertrend', deps, (multiplier,),
+                            lambda high, low, close, atr: Indicators.supertrend_from_atr(high, low, close, atr, multiplier))
+    line = graph.node('item', (supertrend,), (0,), lambda st: st[0])
+    direction = graph.node('item', (supertrend,), (1,), lambda st: st[1])
+    return line, direction
+
+
+EXPANSIONS = {
+    'EMA': _expand_ema,
+    'SMA': _expand_sma,
+    'WMA': _expand_wma,
+    'DEMA': _expand_dema,
+    'TEMA': _expand_tema,
+    'RSI': _expand_rsi,
+    'MACD': _expand_macd,
+    'Stochastic': _expand_stochastic,
+    'CCI': _expand_cci,
+    'BollingerBands': _expand_bollinger,
+    'ATR': _expand_atr,
+    'KeltnerChannel': _expand_keltner,
+    'DonchianChannel': _expand_donchian,
+    'SuperTrend': _expand_supertrend
+}
@@ -3,9 +3,23 @@ Technical Indicators Library
 Comprehensive collection of trading indicators
 """
 
+import json
+import hashlib
+import threading
+import weakref
 import numpy as np
 import pandas as pd
-from typing import Union, Tuple
+from collections import OrderedDict
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Union, Tuple, Optional
+
+from .afl_primitives import hhv, llv, ref
+
+# Max window elements materialized at once by Indicators.rolling_mad
+MAD_CHUNK_ELEMENTS = 1 << 20
+
+# Max float64 working set of one period chunk in the *_matrix sweeps
+MATRIX_CHUNK_BYTES = 64 * 1024 * 1024
 
 
 class Indicators:
@@ -87,8 +101,8 @@ class Indicators:
     def stochastic(high: np.ndarray, low: np.ndarray, close: np.ndarray, 
                    k_period: int = 14, d_period: int = 3) -> Tuple[np.ndarray, np.ndarray]:
         """Stochastic Oscillator"""
-        lowest_low = pd.Series(low).rolling(k_period).min().values
-        highest_high = pd.Series(high).rolling(k_period).max().values
+        lowest_low = llv(low, k_period)
+        highest_high = hhv(high, k_period)
         
         k = 100 * (close - lowest_low) / (highest_high - lowest_low + 1e-10)
         d = Indicators.sma(k, d_period)
@@ -100,12 +114,37 @@ class Indicators:
         """Commodity Channel Index"""
         tp = (high + low + close) / 3
         sma_tp = Indicators.sma(tp, period)
-        mad = pd.Series(tp).rolling(period).apply(lambda x: np.abs(x - x.mean()).mean()).values
+        mad = Indicators.rolling_mad(tp, period)
         
         cci = (tp - sma_tp) / (0.015 * mad + 1e-10)
         
         return cci
     
+    @staticmethod
+    def rolling_mad(data: np.ndarray, period: int) -> np.ndarray:
+        """
+        Rolling mean absolute deviation from the window mean
+        
+        Same values as pd.Series(data).rolling(period).apply(lambda x: np.abs(x - x.mean()).mean()),
+        computed on a sliding-window view in row chunks instead of a Python call per window
+        """
+        if isinstance(period, bool) or not isinstance(period, (int, np.integer)) or period < 0:
+            raise ValueError("window must be an integer 0 or greater")
+        
+        data = np.asarray(data, dtype=np.float64)
+        mad = np.full(len(data), np.nan)
+        if period == 0 or period > len(data):
+            return mad
+        
+        windows = sliding_window_view(data, period)
+        chunk = max(MAD_CHUNK_ELEMENTS // period, 1)
+        for start in range(0, len(windows), chunk):
+            block = windows[start:start + chunk]
+            deviations = np.abs(block - block.mean(axis=1, keepdims=True))
+            mad[start + period - 1:start + period - 1 + len(block)] = deviations.mean(axis=1)
+        
+        return mad
+    
     @staticmethod
     def mfi(high: np.ndarray, low: np.ndarray, close: np.ndarray, 
             volume: np.ndarray, period: int = 14) -> np.ndarray:
@@ -141,6 +180,14 @@ class Indicators:
     @staticmethod
     def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
         """Average True Range"""
+        tr = Indicators.true_range(high, low, close)
+        atr = Indicators.ema(tr, period)
+        
+        return atr
+    
+    @staticmethod
+    def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+        """True Range (first bar: high - low)"""
         tr1 = high - low
         tr2 = np.abs(high - np.roll(close, 1))
         tr3 = np.abs(low - np.roll(close, 1))
@@ -148,9 +195,7 @@ class Indicators:
         tr = np.maximum(tr1, np.maximum(tr2, tr3))
         tr[0] = tr1[0]
         
-        atr = Indicators.ema(tr, period)
-        
-        return atr
+        return tr
     
     @staticmethod
     def keltner_channel(high: np.ndarray, low: np.ndarray, close: np.ndarray,
@@ -167,8 +212,8 @@ class Indicators:
     @staticmethod
     def donchian_channel(high: np.ndarray, low: np.ndarray, period: int = 20) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """Donchian Channel"""
-        upper = pd.Series(high).rolling(period).max().values
-        lower = pd.Series(low).rolling(period).min().values
+        upper = hhv(high, period)
+        lower = llv(low, period)
         middle = (upper + lower) / 2
         
         return upper, middle, lower
@@ -201,6 +246,12 @@ class Indicators:
                    period: int = 10, multiplier: float = 3.0) -> Tuple[np.ndarray, np.ndarray]:
         """SuperTrend Indicator"""
         atr = Indicators.atr(high, low, close, period)
+        return Indicators.supertrend_from_atr(high, low, close, atr, multiplier)
+    
+    @staticmethod
+    def supertrend_from_atr(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                            atr: np.ndarray, multiplier: float = 3.0) -> Tuple[np.ndarray, np.ndarray]:
+        """SuperTrend bands and direction from a precomputed ATR"""
         hl_avg = (high + low) / 2
         
         basic_upper = hl_avg + (multiplier * atr)
@@ -262,15 +313,298 @@ class Indicators:
     @staticmethod
     def peak_trough(high: np.ndarray, low: np.ndarray, lookback: int = 20) -> Tuple[np.ndarray, np.ndarray]:
         """Peak and Trough Detection"""
-        peak = pd.Series(high).rolling(lookback, center=True).max().values
-        trough = pd.Series(low).rolling(lookback, center=True).min().values
+        # Centered window = trailing window read (lookback - 1) // 2 bars ahead
+        peak = ref(hhv(high, lookback), (lookback - 1) // 2)
+        trough = ref(llv(low, lookback), (lookback - 1) // 2)
         
         return peak, trough
+    
+    # ==================== PARAMETER SWEEPS ====================
+    # Row k of a sweep matrix equals the single-period indicator for periods[k]
+    # (bit for bit when dtype is float64). Periods are processed in chunks so
+    # the float64 working set stays under MATRIX_CHUNK_BYTES.
+    
+    @staticmethod
+    def ema_matrix(data: np.ndarray, periods, dtype=np.float32) -> np.ndarray:
+        """EMA for every period in one pass over the bars -> (periods x bars)"""
+        return _sweep(data, periods, dtype, 1, lambda p: _ema_columns(data, p))
+    
+    @staticmethod
+    def dema_matrix(data: np.ndarray, periods, dtype=np.float32) -> np.ndarray:
+        """DEMA for every period -> (periods x bars)"""
+        def compute(chunk):
+            ema1 = _ema_columns(data, chunk)
+            ema2 = _ema_columns(ema1, chunk)
+            return 2 * ema1 - ema2
+        return _sweep(data, periods, dtype, 3, compute)
+    
+    @staticmethod
+    def tema_matrix(data: np.ndarray, periods, dtype=np.float32) -> np.ndarray:
+        """TEMA for every period -> (periods x bars)"""
+        def compute(chunk):
+            ema1 = _ema_columns(data, chunk)
+            ema2 = _ema_columns(ema1, chunk)
+            ema3 = _ema_columns(ema2, chunk)
+            return 3 * ema1 - 3 * ema2 + ema3
+        return _sweep(data, periods, dtype, 4, compute)
+    
+    @staticmethod
+    def rsi_matrix(data: np.ndarray, periods, dtype=np.float32) -> np.ndarray:
+        """RSI for every period, gains/losses computed once -> (periods x bars)"""
+        delta = np.diff(data, prepend=data[0])
+        gain = np.where(delta > 0, delta, 0)
+        loss = np.where(delta < 0, -delta, 0)
+        
+        def compute(chunk):
+            avg_gain = _ema_columns(gain, chunk)
+            avg_loss = _ema_columns(loss, chunk)
+            rs = avg_gain / (avg_loss + 1e-10)
+            return 100 - (100 / (1 + rs))
+        return _sweep(data, periods, dtype, 3, compute)
+    
+    @staticmethod
+    def sma_matrix(data: np.ndarray, periods, dtype=np.float32) -> np.ndarray:
+        """
+        SMA for every period -> (periods x bars)
+        
+        Each row is one np.convolve call: a shared running sum would be a single
+        pass but rounds differently from Indicators.sma. Periods longer than the
+        data give all-NaN rows (the first bars of the longer 'same' output).
+        """
+        n_bars = len(data)
+        return _sweep(data, periods, dtype, 1,
+                      lambda chunk: np.column_stack([Indicators.sma(data, int(p))[:n_bars] for p in chunk]))
+    
+    @staticmethod
+    def wma_matrix(data: np.ndarray, periods, dtype=np.float32) -> np.ndarray:
+        """WMA for every period -> (periods x bars), one np.convolve per row"""
+        n_bars = len(data)
+        return _sweep(data, periods, dtype, 1,
+                      lambda chunk: np.column_stack([Indicators.wma(data, int(p))[:n_bars] for p in chunk]))
+
+
+def _ema_columns(data: np.ndarray, periods: np.ndarray) -> np.ndarray:
+    """
+    EMA recursion for several periods at once
+    
+    Args:
+        data: Source series (bars,) shared by all periods, or (bars, periods)
+              with one column per period
+        periods: Period of each column
+    
+    Returns:
+        (bars, periods) array - one contiguous row per bar, so each step is a
+        single vector update. Integer input keeps the integer dtype (and the
+        truncation) of Indicators.ema.
+    """
+    data = np.asarray(data)
+    multipliers = 2 / (np.asarray(periods, dtype=np.float64) + 1)
+    n_bars = data.shape[0]
+    
+    ema = np.empty((n_bars, len(multipliers)), dtype=data.dtype)
+    if n_bars == 0:
+        return ema
+    ema[0] = data[0]
+    
+    if np.issubdtype(data.dtype, np.floating):
+        prev = ema[0]
+        for i in range(1, n_bars):
+            row = ema[i]
+            np.subtract(data[i], prev, out=row)
+            row *= multipliers
+            row += prev
+            prev = row
+    else:
+        for i in range(1, n_bars):
+            ema[i] = (data[i] - ema[i - 1]) * multipliers + ema[i - 1]
+    
+    return ema
+
+
+def _sweep(data: np.ndarray, periods, dtype, temporaries: int, compute) -> np.ndarray:
+    """
+    Run a column kernel over chunks of periods into a (periods x bars) matrix
+    
+    Args:
+        data: Source series (for the bar count)
+        periods: Periods to compute
+        dtype: Storage dtype of the result (float32 halves the memory)
+        temporaries: (bars x chunk) float64 arrays the kernel keeps alive
+        compute: compute(chunk_periods) -> (bars, chunk) array
+    """
+    periods = np.asarray(periods).ravel()
+    n_bars = len(data)
+    matrix = np.empty((len(periods), n_bars), dtype=dtype)
+    
+    chunk = max(MATRIX_CHUNK_BYTES // max(n_bars * 8 * temporaries, 1), 1)
+    for start in range(0, len(periods), chunk):
+        block = periods[start:start + chunk]
+        matrix[start:start + len(block)] = compute(block).T
+    
+    return matrix
+
+
+# ==================== INDICATOR CACHE ====================
+
+OHLCV_KEYS = ('open', 'high', 'low', 'close', 'volume')
+
+
+class IndicatorCache:
+    """
+    Process-wide LRU cache for calculate_indicator results
+
+    Keyed on (dataset fingerprint, indicator type, params). The fingerprint
+    is a hash of the OHLCV arrays, so optimizer runs and repeated backtests
+    on the same upload reuse already computed series. Memory is bounded by
+    the total nbytes of the cached results.
+
+    Cached arrays are returned read-only and shared between callers. Input
+    arrays are fingerprinted once per array object, so they must not be
+    modified in place after being passed to calculate_indicator.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            max_bytes: Upper bound for memory used by cached results
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (result, nbytes)
+        self._fingerprints = {}        # id(array) -> (weakref, digest)
+        self._lock = threading.RLock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def dataset_fingerprint(self, data: dict) -> str:
+        """Hash of the OHLCV arrays present in data"""
+        digest = hashlib.blake2b(digest_size=16)
+        for key in OHLCV_KEYS:
+            if key in data:
+                digest.update(key.encode())
+                digest.update(self._array_fingerprint(data[key]).encode())
+        return digest.hexdigest()
+
+    def _array_fingerprint(self, values) -> str:
+        """Hash of a single array, memoized per array object"""
+        if not isinstance(values, np.ndarray):
+            values = np.asarray(values)
+            return self._hash_array(values)
+
+        with self._lock:
+            entry = self._fingerprints.get(id(values))
+            if entry is not None and entry[0]() is values:
+                return entry[1]
+
+        fingerprint = self._hash_array(values)
+
+        with self._lock:
+            key = id(values)
+            ref = weakref.ref(values, lambda _, key=key: self._fingerprints.pop(key, None))
+            self._fingerprints[key] = (ref, fingerprint)
+        return fingerprint
+
+    @staticmethod
+    def _hash_array(values: np.ndarray) -> str:
+        values = np.ascontiguousarray(values)
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str(values.dtype).encode())
+        digest.update(str(values.shape).encode())
+        digest.update(values.tobytes() if values.dtype != object else repr(values.tolist()).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_key(fingerprint: str, indicator_name: str, params: dict) -> tuple:
+        """Cache key for an indicator call"""
+        return fingerprint, indicator_name, json.dumps(params, sort_keys=True, default=str)
+
+    def get(self, key: tuple):
+        """Return cached result or None (updates hit/miss counters)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: tuple, result):
+        """Store result, evicting least recently used entries to stay in budget"""
+        result = _freeze_result(result)
+        nbytes = _result_nbytes(result)
+        if nbytes > self.max_bytes:
+            return result
+
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (result, nbytes)
+            self.current_bytes += nbytes
+
+            while self.current_bytes > self.max_bytes and self._entries:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_bytes
+                self.evictions += 1
+
+        return result
+
+    def clear(self):
+        """Drop all cached results and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self._fingerprints.clear()
+            self.current_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> dict:
+        """Cache statistics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': (self.hits / lookups * 100) if lookups > 0 else 0.0
+            }
+
+
+def _freeze_result(result):
+    """Make cached arrays read-only so shared results cannot be corrupted"""
+    if isinstance(result, np.ndarray):
+        result.setflags(write=False)
+    elif isinstance(result, tuple):
+        for item in result:
+            if isinstance(item, np.ndarray):
+                item.setflags(write=False)
+    return result
+
+
+def _result_nbytes(result) -> int:
+    """Approximate memory used by an indicator result"""
+    if isinstance(result, np.ndarray):
+        return result.nbytes
+    if isinstance(result, tuple):
+        return sum(_result_nbytes(item) for item in result)
+    if isinstance(result, dict):
+        return 64 * len(result)
+    return 64
+
+
+# Shared by all calculate_indicator callers in this process
+shared_indicator_cache = IndicatorCache()
 
 
 # ==================== HELPER FUNCTIONS ====================
 
-def calculate_indicator(indicator_name: str, data: dict, params: dict) -> Union[np.ndarray, Tuple]:
+def calculate_indicator(indicator_name: str, data: dict, params: dict,
+                        cache: Optional[IndicatorCache] = shared_indicator_cache) -> Union[np.ndarray, Tuple]:
     """
     Universal indicator calculator
     
@@ -278,10 +612,57 @@ def calculate_indicator(indicator_name: str, data: dict, params: dict) -> Union[
         indicator_name: Name of indicator (e.g., 'EMA', 'RSI', 'MACD')
         data: Dict with 'open', 'high', 'low', 'close', 'volume' as numpy arrays
         params: Dict with indicator parameters
+        cache: Result cache (defaults to the process-wide cache, None disables)
     
     Returns:
         Indicator values as numpy array or tuple of arrays
     """
+    if cache is not None:
+        key = cache.make_key(cache.dataset_fingerprint(data), indicator_name, params)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+    
+    result = _compute_indicator(indicator_name, data, params)
+    
+    if cache is not None:
+        result = cache.put(key, result)
+    
+    return result
+
+
+# Indicators with a batched period sweep (all take the close series)
+MATRIX_INDICATORS = {
+    'EMA': Indicators.ema_matrix,
+    'SMA': Indicators.sma_matrix,
+    'WMA': Indicators.wma_matrix,
+    'DEMA': Indicators.dema_matrix,
+    'TEMA': Indicators.tema_matrix,
+    'RSI': Indicators.rsi_matrix
+}
+
+
+def calculate_indicator_matrix(indicator_name: str, data: dict, periods, dtype=np.float32) -> np.ndarray:
+    """
+    Indicator values for a whole sweep of periods
+    
+    Args:
+        indicator_name: One of MATRIX_INDICATORS
+        data: Dict with OHLCV data as numpy arrays
+        periods: Period values, one matrix row each
+        dtype: Storage dtype (float32 by default, float64 for exact rows)
+    
+    Returns:
+        (len(periods), bars) array; row k matches
+        calculate_indicator(indicator_name, data, {'period': periods[k]})
+    """
+    if indicator_name not in MATRIX_INDICATORS:
+        raise ValueError(f"No batched sweep for indicator: {indicator_name}")
+    return MATRIX_INDICATORS[indicator_name](data['close'], periods, dtype)
+
+
+def _compute_indicator(indicator_name: str, data: dict, params: dict) -> Union[np.ndarray, Tuple]:
+    """Dispatch indicator name to the Indicators implementation"""
     ind = Indicators()
     
     # Map indicator names to methods
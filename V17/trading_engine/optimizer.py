@@ -3,12 +3,75 @@ Genetic Algorithm Optimizer
 Optimizes strategy parameters using genetic algorithms
 """
 
+import os
+import re
 import numpy as np
 import random
-from typing import Dict, List, Tuple, Callable
+from typing import Dict, List, Tuple, Callable, Optional
 from copy import deepcopy
-from .strategy import Strategy
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from .strategy import Strategy, CompiledStrategy, _completed_timeframe_data, _align_completed
 from .backtest_engine import BacktestEngine
+from .indicators import shared_indicator_cache, MATRIX_INDICATORS, calculate_indicator_matrix
+
+# Memory allowed for precomputed indicator sweep matrices
+INDICATOR_MATRIX_BUDGET = 512 * 1024 * 1024
+
+# Parameter paths whose candidate values can be precomputed as a sweep matrix
+_PERIOD_PATH_RE = re.compile(r'^indicators\.(\d+)\.params\.period$')
+
+# Memory allowed for buy/short arrays cached per signal-parameter combination
+SIGNAL_CACHE_BUDGET = 256 * 1024 * 1024
+
+# Config sections Strategy.generate_signals never reads
+EXIT_SECTIONS = ('exit_rules', 'settings')
+
+
+def _indicator_cache_stats_since(start: Dict, worker_caches: Optional[Dict] = None) -> Dict:
+    """
+    Indicator cache statistics of one run
+    
+    Args:
+        start: shared_indicator_cache.stats() taken when the run started
+        worker_caches: Pool worker pid -> counters reported by _evaluate_in_worker
+                       (parallel runs: the indicators are computed in the workers)
+    
+    Returns:
+        stats() dict with hits, misses, evictions and hit_rate counted since
+        start (entries and bytes are the current totals), summed over this
+        process and the workers
+    """
+    stats = shared_indicator_cache.stats()
+    for key in ('hits', 'misses', 'evictions'):
+        stats[key] -= start[key]
+    for worker in (worker_caches or {}).values():
+        for key in ('hits', 'misses', 'evictions', 'entries', 'bytes'):
+            stats[key] += worker[key]
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = (stats['hits'] / lookups * 100) if lookups > 0 else 0.0
+    return stats
+
+
+def classify_parameter(param_path: str) -> str:
+    """
+    Whether a parameter can change the entry signals
+    
+    Args:
+        param_path: Path in the strategy config (e.g. "exit_rules.tp_sl_table.0.sl")
+    
+    Returns:
+        'exit' for exit rules, settings and risk management other than
+        trading_hours; 'signal' for everything else (indicators, entry
+        conditions, trading hours, unknown paths)
+    """
+    keys = param_path.split('.')
+    if keys[0] in EXIT_SECTIONS:
+        return 'exit'
+    if keys[0] == 'risk_management' and len(keys) > 1 and keys[1] != 'trading_hours':
+        return 'exit'
+    return 'signal'
 
 
 class GeneticOptimizer:
@@ -23,7 +86,11 @@ class GeneticOptimizer:
                  generations: int = 20,
                  mutation_rate: float = 0.1,
                  crossover_rate: float = 0.7,
-                 elitism_pct: float = 0.1):
+                 elitism_pct: float = 0.1,
+                 n_workers: Optional[int] = 1,
+                 seed: Optional[int] = None,
+                 matrix_budget: int = INDICATOR_MATRIX_BUDGET,
+                 signal_cache_budget: int = SIGNAL_CACHE_BUDGET):
         """
         Initialize optimizer
         
@@ -35,20 +102,40 @@ class GeneticOptimizer:
             mutation_rate: Probability of mutation
             crossover_rate: Probability of crossover
             elitism_pct: Percentage of best individuals to keep
+            n_workers: Worker processes for fitness evaluation
+                       (1 = serial, None = one per CPU)
+            seed: Random seed for reproducible runs (None = global random state)
+            matrix_budget: Bytes for precomputed indicator sweep matrices (0 disables)
+            signal_cache_budget: Bytes for buy/short arrays reused across individuals
+                                 with the same signal parameters (0 disables)
         """
         self.strategy_template = strategy_template
+        self.compiled_strategy = CompiledStrategy(strategy_template)
         self.data = data
         self.population_size = population_size
         self.generations = generations
         self.mutation_rate = mutation_rate
         self.crossover_rate = crossover_rate
         self.elitism_count = int(population_size * elitism_pct)
+        self.n_workers = n_workers if n_workers is not None else (os.cpu_count() or 1)
+        self.rng = random.Random(seed) if seed is not None else random
+        self.matrix_budget = matrix_budget
+        self.signal_cache_budget = signal_cache_budget
         
         self.param_ranges = {}
         self.population = []
         self.best_individual = None
         self.best_fitness = -float('inf')
         self.history = []
+        self.indicator_matrices = {}  # param path -> {'indicator_id', 'first_period', 'values'}
+        self.param_sides = {}         # param path -> 'signal' or 'exit'
+        self.signal_cache = OrderedDict()  # signal param values -> signals dict (LRU)
+        self.signal_cache_bytes = 0
+        self.signal_cache_hits = 0
+        self.signal_cache_misses = 0
+        self._last_signal_lookup = None  # 'hit' / 'miss' of the last fitness evaluation
+        self._executor = None
+        self._worker_caches = {}  # pool worker pid -> indicator cache counters of the run
     
     def add_parameter(self, 
                      param_path: str,
@@ -72,19 +159,21 @@ class GeneticOptimizer:
             'step': step,
             'type': param_type
         }
-        print(f"  Added parameter: {param_path} [{min_value}, {max_value}]")
+        self.compiled_strategy.add_slot(param_path)
+        self.param_sides[param_path] = classify_parameter(param_path)
+        print(f"  Added parameter: {param_path} [{min_value}, {max_value}] ({self.param_sides[param_path]})")
     
     def _create_individual(self) -> Dict:
         """Create random individual (parameter set)"""
         individual = {}
         for param_path, param_range in self.param_ranges.items():
             if param_range['type'] == 'int':
-                value = random.randint(
+                value = self.rng.randint(
                     int(param_range['min']),
                     int(param_range['max'])
                 )
             else:
-                value = random.uniform(param_range['min'], param_range['max'])
+                value = self.rng.uniform(param_range['min'], param_range['max'])
             
             individual[param_path] = value
         
@@ -126,12 +215,14 @@ class GeneticOptimizer:
             Fitness score (higher is better)
         """
         try:
-            # Create strategy with these parameters
-            strategy = self._apply_parameters(self.strategy_template, individual)
+            # Bind these parameters to the compiled template (no deepcopy / re-validation)
+            strategy = self.compiled_strategy.bind(individual)
+            strategy.indicator_overrides = self._matrix_overrides(individual)
+            strategy.precomputed_signals = self._cached_signals(strategy, individual)
             
             # Run backtest
             engine = BacktestEngine(strategy)
-            results = engine.run(self.data)
+            results = engine.run(self.data, backend='event')
             
             # Fitness = combination of return and win rate
             # You can customize this formula
@@ -154,15 +245,187 @@ class GeneticOptimizer:
             print(f"  ✗ Error evaluating individual: {e}")
             return -float('inf')
     
+    def _precompute_indicator_matrices(self):
+        """
+        Compute every candidate period of swept indicator periods up front
+        
+        Applies to int sweeps of indicators.<i>.params.period on indicators with
+        a batched implementation (MATRIX_INDICATORS). Matrices are float64 when
+        all sweeps fit matrix_budget (rows identical to calculate_indicator),
+        float32 when only that fits, and skipped otherwise. Indicators with a
+        "timeframe" are swept on the resampled bars and mapped back to the base
+        bars like Strategy.calculate_indicators does.
+        """
+        self.indicator_matrices = {}
+        if not self.matrix_budget:
+            return
+        
+        indicators = self.strategy_template.config['indicators']
+        timeframe_data = {}  # timeframe -> (resampled data, completed bucket per bar) or None
+        sweeps = []
+        for param_path, param_range in self.param_ranges.items():
+            match = _PERIOD_PATH_RE.match(param_path)
+            if not match or param_range['type'] != 'int':
+                continue
+            
+            index = int(match.group(1))
+            if index >= len(indicators) or indicators[index]['type'] not in MATRIX_INDICATORS:
+                continue
+            
+            # The indicator itself (type/id) must not be swept as well
+            prefix = f"indicators.{index}."
+            if any(path.startswith(prefix) and not path.startswith(prefix + 'params.')
+                   for path in self.param_ranges):
+                continue
+            
+            source = self.data
+            timeframe = indicators[index].get('timeframe') or None
+            if timeframe is not None:
+                if timeframe not in timeframe_data:
+                    try:
+                        timeframe_data[timeframe] = _completed_timeframe_data(self.data, timeframe)
+                    except Exception:
+                        timeframe_data[timeframe] = None
+                if timeframe_data[timeframe] is None:
+                    continue
+                source = timeframe_data[timeframe][0]
+            
+            periods = np.arange(int(param_range['min']), int(param_range['max']) + 1)
+            if len(periods) == 0 or periods[0] < 1 or periods[-1] > len(source['close']):
+                continue
+            sweeps.append((param_path, indicators[index], periods, source, timeframe))
+        
+        if not sweeps:
+            return
+        
+        n_cells = sum(len(periods) for _, _, periods, _, _ in sweeps) * len(self.data['close'])
+        if n_cells * 8 <= self.matrix_budget:
+            dtype = np.float64
+        elif n_cells * 4 <= self.matrix_budget:
+            dtype = np.float32
+        else:
+            print(f"  ⚠️ Indicator sweeps need {n_cells * 4 / 2**20:.0f} MB, over the matrix budget - not precomputed")
+            return
+        
+        try:
+            for param_path, indicator, periods, source, timeframe in sweeps:
+                values = calculate_indicator_matrix(indicator['type'], source, periods, dtype)
+                if timeframe is not None:
+                    values = _align_completed(values, timeframe_data[timeframe][1])
+                self.indicator_matrices[param_path] = {
+                    'indicator_id': indicator['id'],
+                    'first_period': int(periods[0]),
+                    'values': values
+                }
+                print(f"  📐 {indicator['id']} ({indicator['type']}) periods {periods[0]}-{periods[-1]} "
+                      f"precomputed ({np.dtype(dtype).name}, {values.nbytes / 2**20:.1f} MB)")
+        except Exception as e:
+            print(f"  ✗ Error precomputing indicator sweeps: {e}")
+            self.indicator_matrices = {}
+    
+    def _matrix_overrides(self, individual: Dict) -> Dict[str, np.ndarray]:
+        """Precomputed indicator rows (indicator id -> values) for an individual"""
+        overrides = {}
+        for param_path, sweep in self.indicator_matrices.items():
+            value = individual.get(param_path)
+            if isinstance(value, bool) or not isinstance(value, (int, np.integer)):
+                continue
+            row = int(value) - sweep['first_period']
+            if 0 <= row < len(sweep['values']):
+                overrides[sweep['indicator_id']] = sweep['values'][row]
+        return overrides
+    
+    def _signal_key(self, individual: Dict) -> tuple:
+        """Values of the signal-side parameters (exit-only sweeps share one key)"""
+        return tuple((path, value) for path, value in individual.items()
+                     if self.param_sides.get(path, classify_parameter(path)) == 'signal')
+    
+    def _cached_signals(self, strategy: Strategy, individual: Dict) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Buy/short arrays for the individual's signal parameters
+        
+        Generated with the bound strategy on the first lookup of a key and
+        reused afterwards; the lookup result is left in _last_signal_lookup.
+        """
+        self._last_signal_lookup = None
+        if not self.signal_cache_budget:
+            return None
+        
+        key = self._signal_key(individual)
+        try:
+            signals = self.signal_cache.get(key)
+        except TypeError:
+            return None  # unhashable parameter value
+        if signals is not None:
+            self.signal_cache.move_to_end(key)
+            self._last_signal_lookup = 'hit'
+            return signals
+        
+        self._last_signal_lookup = 'miss'
+        signals = strategy.generate_signals(self.data)
+        for values in signals.values():
+            values.setflags(write=False)
+        
+        nbytes = sum(values.nbytes for values in signals.values())
+        if nbytes <= self.signal_cache_budget:
+            self.signal_cache[key] = signals
+            self.signal_cache_bytes += nbytes
+            while self.signal_cache_bytes > self.signal_cache_budget:
+                _, evicted = self.signal_cache.popitem(last=False)
+                self.signal_cache_bytes -= sum(values.nbytes for values in evicted.values())
+        return signals
+    
+    def _count_signal_lookup(self, lookup: Optional[str]):
+        if lookup == 'hit':
+            self.signal_cache_hits += 1
+        elif lookup == 'miss':
+            self.signal_cache_misses += 1
+    
+    def signal_cache_stats(self) -> Dict:
+        """Signal cache statistics (lookups of all workers)"""
+        lookups = self.signal_cache_hits + self.signal_cache_misses
+        return {
+            'hits': self.signal_cache_hits,
+            'misses': self.signal_cache_misses,
+            'hit_rate': (self.signal_cache_hits / lookups * 100) if lookups > 0 else 0.0,
+            'signal_params': [path for path, side in self.param_sides.items() if side == 'signal'],
+            'exit_params': [path for path, side in self.param_sides.items() if side == 'exit']
+        }
+    
+    def _evaluate_batch(self, individuals: List[Dict]) -> List[float]:
+        """
+        Evaluate fitness for a batch of individuals
+        
+        Uses the worker pool when running in parallel mode. Results are
+        returned in input order, so runs stay deterministic under a fixed seed.
+        """
+        if self._executor is None:
+            fitnesses = []
+            for individual in individuals:
+                fitnesses.append(self._fitness_function(individual))
+                self._count_signal_lookup(self._last_signal_lookup)
+            return fitnesses
+        
+        chunksize = max(1, len(individuals) // (self.n_workers * 4))
+        results = list(self._executor.map(_evaluate_in_worker, individuals, chunksize=chunksize))
+        for _, lookup, cache in results:
+            self._count_signal_lookup(lookup)
+            worker = self._worker_caches.setdefault(cache['pid'], {'hits': 0, 'misses': 0, 'evictions': 0})
+            for key in ('hits', 'misses', 'evictions'):
+                worker[key] += cache[key]
+            worker['entries'] = cache['entries']
+            worker['bytes'] = cache['bytes']
+        return [fitness for fitness, _, _ in results]
+    
     def _initialize_population(self):
         """Create initial population"""
         print(f"\n🧬 Initializing population ({self.population_size} individuals)...")
-        self.population = []
         
-        for i in range(self.population_size):
-            individual = self._create_individual()
-            fitness = self._fitness_function(individual)
-            
+        individuals = [self._create_individual() for _ in range(self.population_size)]
+        fitnesses = self._evaluate_batch(individuals)
+        
+        self.population = []
+        for i, (individual, fitness) in enumerate(zip(individuals, fitnesses)):
             self.population.append({
                 'params': individual,
                 'fitness': fitness
@@ -183,25 +446,25 @@ class GeneticOptimizer:
         tournament_size = 5
         
         # Tournament 1
-        tournament1 = random.sample(self.population, tournament_size)
+        tournament1 = self.rng.sample(self.population, tournament_size)
         parent1 = max(tournament1, key=lambda x: x['fitness'])
         
         # Tournament 2
-        tournament2 = random.sample(self.population, tournament_size)
+        tournament2 = self.rng.sample(self.population, tournament_size)
         parent2 = max(tournament2, key=lambda x: x['fitness'])
         
         return parent1['params'], parent2['params']
     
     def _crossover(self, parent1: Dict, parent2: Dict) -> Tuple[Dict, Dict]:
         """Crossover two parents to create offspring"""
-        if random.random() > self.crossover_rate:
+        if self.rng.random() > self.crossover_rate:
             return deepcopy(parent1), deepcopy(parent2)
         
         child1 = {}
         child2 = {}
         
         for param_path in parent1.keys():
-            if random.random() < 0.5:
+            if self.rng.random() < 0.5:
                 child1[param_path] = parent1[param_path]
                 child2[param_path] = parent2[param_path]
             else:
@@ -215,19 +478,19 @@ class GeneticOptimizer:
         mutated = deepcopy(individual)
         
         for param_path, value in mutated.items():
-            if random.random() < self.mutation_rate:
+            if self.rng.random() < self.mutation_rate:
                 param_range = self.param_ranges[param_path]
                 
                 if param_range['type'] == 'int':
                     # Random mutation within range
-                    mutated[param_path] = random.randint(
+                    mutated[param_path] = self.rng.randint(
                         int(param_range['min']),
                         int(param_range['max'])
                     )
                 else:
                     # Gaussian mutation
                     sigma = (param_range['max'] - param_range['min']) * 0.1
-                    new_value = value + random.gauss(0, sigma)
+                    new_value = value + self.rng.gauss(0, sigma)
                     new_value = np.clip(new_value, param_range['min'], param_range['max'])
                     mutated[param_path] = new_value
         
@@ -246,6 +509,62 @@ class GeneticOptimizer:
         print(f"   Mutation Rate: {self.mutation_rate}")
         print(f"   Crossover Rate: {self.crossover_rate}")
         
+        indicator_cache_start = shared_indicator_cache.stats()
+        self._precompute_indicator_matrices()
+        self.signal_cache_hits = 0
+        self.signal_cache_misses = 0
+        self._worker_caches = {}
+        
+        if self.n_workers > 1:
+            print(f"   Workers: {self.n_workers}")
+            shared_data = SharedOHLCV(self.data)
+            shared_matrices = SharedOHLCV({path: sweep['values'] for path, sweep in self.indicator_matrices.items()})
+            matrix_meta = {
+                path: {'indicator_id': sweep['indicator_id'], 'first_period': sweep['first_period']}
+                for path, sweep in self.indicator_matrices.items()
+            }
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.n_workers,
+                initializer=_init_worker,
+                initargs=(shared_data.specs, shared_data.extras, self.strategy_template.config,
+                          shared_matrices.specs, matrix_meta, self.signal_cache_budget)
+            )
+        else:
+            shared_data = None
+            shared_matrices = None
+        
+        try:
+            self._evolve()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+            if shared_data is not None:
+                shared_data.close()
+                shared_matrices.close()
+        
+        print(f"\n✅ Optimization complete!")
+        print(f"   Best fitness: {self.best_fitness:.2f}")
+        print(f"   Best parameters:")
+        for param, value in self.best_individual.items():
+            print(f"     {param}: {value}")
+        
+        cache_stats = _indicator_cache_stats_since(indicator_cache_start, self._worker_caches)
+        print(f"   Indicator cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses ({cache_stats['hit_rate']:.1f}%)")
+        signal_stats = self.signal_cache_stats()
+        print(f"   Signal cache: {signal_stats['hits']} hits, {signal_stats['misses']} misses ({signal_stats['hit_rate']:.1f}%)")
+        
+        return {
+            'best_params': self.best_individual,
+            'best_fitness': self.best_fitness,
+            'history': self.history,
+            'final_population': self.population,
+            'indicator_cache': cache_stats,
+            'signal_cache': signal_stats
+        }
+    
+    def _evolve(self):
+        """Initialize population and run the evolution loop"""
         # Initialize population
         self._initialize_population()
         
@@ -260,8 +579,9 @@ class GeneticOptimizer:
             new_population.extend(self.population[:self.elitism_count])
             print(f"  Elite individuals: {self.elitism_count}")
             
-            # Generate offspring
-            while len(new_population) < self.population_size:
+            # Generate offspring for the whole generation first
+            offspring = []
+            while len(new_population) + len(offspring) < self.population_size:
                 # Selection
                 parent1, parent2 = self._selection()
                 
@@ -272,13 +592,14 @@ class GeneticOptimizer:
                 child1 = self._mutate(child1)
                 child2 = self._mutate(child2)
                 
-                # Evaluate fitness
-                fitness1 = self._fitness_function(child1)
-                fitness2 = self._fitness_function(child2)
-                
-                new_population.append({'params': child1, 'fitness': fitness1})
-                if len(new_population) < self.population_size:
-                    new_population.append({'params': child2, 'fitness': fitness2})
+                offspring.append(child1)
+                if len(new_population) + len(offspring) < self.population_size:
+                    offspring.append(child2)
+            
+            # Evaluate fitness (in parallel when workers are enabled)
+            fitnesses = self._evaluate_batch(offspring)
+            for child, fitness in zip(offspring, fitnesses):
+                new_population.append({'params': child, 'fitness': fitness})
             
             # Replace population
             self.population = new_population
@@ -301,19 +622,6 @@ class GeneticOptimizer:
                 'avg_fitness': avg_fitness,
                 'worst_fitness': self.population[-1]['fitness']
             })
-        
-        print(f"\n✅ Optimization complete!")
-        print(f"   Best fitness: {self.best_fitness:.2f}")
-        print(f"   Best parameters:")
-        for param, value in self.best_individual.items():
-            print(f"     {param}: {value}")
-        
-        return {
-            'best_params': self.best_individual,
-            'best_fitness': self.best_fitness,
-            'history': self.history,
-            'final_population': self.population
-        }
     
     def get_optimized_strategy(self) -> Strategy:
         """Get strategy with optimized parameters"""
@@ -321,3 +629,95 @@ class GeneticOptimizer:
             raise ValueError("No optimization run yet. Call optimize() first.")
         
         return self._apply_parameters(self.strategy_template, self.best_individual)
+
+
+# ==================== PARALLEL EVALUATION ====================
+
+class SharedOHLCV:
+    """
+    OHLCV arrays placed in shared memory
+
+    Worker processes attach to the blocks once in their initializer instead
+    of receiving a pickled copy of the dataset with every task.
+    """
+
+    def __init__(self, data: Dict[str, np.ndarray]):
+        """
+        Args:
+            data: Dict of arrays to share
+        """
+        self.blocks = []
+        self.specs = {}   # key -> (shm name, shape, dtype)
+        self.extras = {}  # arrays that cannot live in shared memory (object dtype)
+
+        for key, values in data.items():
+            values = np.asarray(values)
+            if values.dtype == object or values.nbytes == 0:
+                self.extras[key] = values
+                continue
+
+            block = shared_memory.SharedMemory(create=True, size=values.nbytes)
+            shared = np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)
+            shared[:] = values
+            self.blocks.append(block)
+            self.specs[key] = (block.name, values.shape, values.dtype.str)
+
+    @staticmethod
+    def attach(specs: Dict, extras: Dict) -> Tuple[Dict[str, np.ndarray], List]:
+        """
+        Rebuild the data dict from shared memory blocks
+
+        Returns:
+            (data, blocks) - blocks must be kept alive while data is used
+        """
+        data = dict(extras)
+        blocks = []
+        for key, (name, shape, dtype) in specs.items():
+            block = shared_memory.SharedMemory(name=name)
+            data[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+            blocks.append(block)
+        return data, blocks
+
+    def close(self):
+        """Release and remove the shared memory blocks"""
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+
+# Per-process state of pool workers
+_worker_state = {}
+
+
+def _init_worker(specs: Dict, extras: Dict, strategy_config: Dict,
+                 matrix_specs: Optional[Dict] = None, matrix_meta: Optional[Dict] = None,
+                 signal_cache_budget: int = SIGNAL_CACHE_BUDGET):
+    """Pool initializer: attach shared data (and sweep matrices) and build the evaluator once"""
+    data, blocks = SharedOHLCV.attach(specs, extras)
+    matrices, matrix_blocks = SharedOHLCV.attach(matrix_specs or {}, {})
+    _worker_state['blocks'] = blocks + matrix_blocks
+    
+    optimizer = GeneticOptimizer(Strategy(strategy_json=strategy_config), data,
+                                 signal_cache_budget=signal_cache_budget)
+    optimizer.indicator_matrices = {
+        path: dict(meta, values=matrices[path]) for path, meta in (matrix_meta or {}).items()
+    }
+    _worker_state['optimizer'] = optimizer
+
+
+def _evaluate_in_worker(individual: Dict) -> Tuple[float, Optional[str], Dict]:
+    """
+    Evaluate one individual inside a pool worker
+    
+    Returns:
+        (fitness, signal cache lookup, indicator cache counters of this
+        evaluation plus the worker's current entries/bytes and pid)
+    """
+    optimizer = _worker_state['optimizer']
+    before = shared_indicator_cache.stats()
+    fitness = optimizer._fitness_function(individual)
+    after = shared_indicator_cache.stats()
+    cache = {key: after[key] - before[key] for key in ('hits', 'misses', 'evictions')}
+    cache.update(pid=os.getpid(), entries=after['entries'], bytes=after['bytes'])
+    return fitness, optimizer._last_signal_lookup, cache
@@ -1,13 +1,22 @@
 """
 Strategy Class
 Parses JSON strategy files and generates trading signals
+- Indicators may carry a "timeframe" (e.g. "15m"): they are computed on the
+  resampled series and read on base bars through the last completed bucket
 """
 
 import json
+import hashlib
+import threading
 import numpy as np
+from collections import OrderedDict
+from copy import copy, deepcopy
 from typing import Dict, List, Optional, Any
-from .indicators import calculate_indicator
+from .indicators import shared_indicator_cache
+from .indicator_graph import IndicatorGraph
 from .dynamic_exit import DynamicExitManager
+from .condition_compiler import ConditionCompiler
+from .timeframe_resampler import TimeframeResampler
 
 
 class Strategy:
@@ -117,19 +126,48 @@ class Strategy:
         
         print(f"✅ Strategy '{self.config['name']}' validated")
     
-    def _init_components(self):
-        """Initialize strategy components"""
+    def _init_components(self, exit_manager: Optional[DynamicExitManager] = None):
+        """
+        Initialize strategy components
+        
+        Args:
+            exit_manager: Exit manager to share (built from exit_rules when None)
+        """
         # Initialize exit manager
-        tp_sl_rules = self.config["exit_rules"].get("tp_sl_table", [])
-        self.exit_manager = DynamicExitManager(tp_sl_rules if tp_sl_rules else None)
+        if exit_manager is None:
+            tp_sl_rules = self.config["exit_rules"].get("tp_sl_table", [])
+            exit_manager = DynamicExitManager(tp_sl_rules if tp_sl_rules else None)
+        self.exit_manager = exit_manager
         
         # Cache for calculated indicators
         self.indicator_cache = {}
+        
+        # Precomputed values by indicator id (e.g. rows of an optimizer sweep matrix)
+        self.indicator_overrides = {}
+        
+        # Precomputed 'buy'/'short' arrays returned by generate_signals when set
+        # (e.g. the optimizer's signal cache for exit-only parameter changes)
+        self.precomputed_signals = None
+        
+        # Primitive counts of the last indicator graph evaluation
+        self.indicator_graph_stats = {}
     
     def calculate_indicators(self, data: Dict[str, np.ndarray]) -> Dict[str, Any]:
         """
         Calculate all indicators defined in strategy
         
+        Results come from indicator_overrides when set for an id, otherwise
+        from the process-wide indicator cache when the same
+        dataset/indicator/params combination was computed before. The
+        remaining indicators are evaluated together through an IndicatorGraph,
+        so EMAs, ATRs, rolling extremes, ... shared between them are computed once.
+        
+        Indicators with a "timeframe" get one graph per timeframe, evaluated on
+        data resampled to it; the results are mapped back to the base bars
+        (latest completed bucket, NaN before the first one) and cached under
+        the dataset + timeframe, so each higher-timeframe series is computed
+        once per dataset.
+        
         Args:
             data: Dict with OHLCV data as numpy arrays
         
@@ -137,19 +175,82 @@ class Strategy:
             Dict with indicator_id -> values
         """
         self.indicator_cache = {}
+        cache = shared_indicator_cache
+        fingerprint = cache.dataset_fingerprint(data)
+        graphs = {}    # timeframe (None = bars of data) -> IndicatorGraph
         
-        for indicator in self.config["indicators"]:
-            ind_id = indicator["id"]
-            ind_type = indicator["type"]
+        results = {}   # config position -> result or Exception
+        pending = {}   # cache key -> first config position planned for it
+        aliases = {}   # config position -> position planned with the same key
+        
+        for position, indicator in enumerate(self.config["indicators"]):
+            if indicator["id"] in self.indicator_overrides:
+                continue
+            
             params = indicator.get("params", {})
+            timeframe = indicator.get("timeframe") or None
+            key = cache.make_key(fingerprint if timeframe is None else f"{fingerprint}@{timeframe}",
+                                 indicator["type"], params)
+            if key in pending:
+                aliases[position] = pending[key]
+                continue
+            
+            cached = cache.get(key)
+            if cached is not None:
+                results[position] = cached
+                continue
             
             try:
-                result = calculate_indicator(ind_type, data, params)
-                self.indicator_cache[ind_id] = result
-                print(f"  ✓ {ind_id} ({ind_type}) calculated")
+                graphs.setdefault(timeframe, IndicatorGraph()).add_indicator(position, indicator["type"], params)
+                pending[key] = position
             except Exception as e:
-                print(f"  ✗ Error calculating {ind_id}: {e}")
+                results[position] = e
+        
+        evaluated = {}
+        for timeframe, graph in graphs.items():
+            if timeframe is None:
+                evaluated.update(graph.evaluate(data))
+                continue
+            
+            try:
+                timeframe_data, completed = _completed_timeframe_data(data, timeframe)
+            except Exception as e:
+                evaluated.update((position, e) for position in graph.outputs)
+                continue
+            
+            for position, result in graph.evaluate(timeframe_data).items():
+                evaluated[position] = result if isinstance(result, Exception) else _align_completed(result, completed)
+        for key, position in pending.items():
+            result = evaluated[position]
+            results[position] = result if isinstance(result, Exception) else cache.put(key, result)
+        for position, source in aliases.items():
+            results[position] = results[source]
+        
+        for position, indicator in enumerate(self.config["indicators"]):
+            ind_id = indicator["id"]
+            ind_type = indicator["type"]
+            
+            if ind_id in self.indicator_overrides:
+                self.indicator_cache[ind_id] = self.indicator_overrides[ind_id]
+                print(f"  ✓ {ind_id} ({ind_type}) precomputed")
+                continue
+            
+            result = results[position]
+            if isinstance(result, Exception):
+                print(f"  ✗ Error calculating {ind_id}: {result}")
                 self.indicator_cache[ind_id] = None
+            else:
+                self.indicator_cache[ind_id] = result
+                timeframe = indicator.get("timeframe")
+                print(f"  ✓ {ind_id} ({ind_type}{', ' + timeframe if timeframe else ''}) calculated")
+        
+        self.indicator_graph_stats = IndicatorGraph().stats()
+        for graph in graphs.values():
+            for name, count in graph.stats().items():
+                self.indicator_graph_stats[name] += count
+        if self.indicator_graph_stats['saved']:
+            print(f"  🔗 Indicator graph: {self.indicator_graph_stats['nodes']} primitives evaluated, "
+                  f"{self.indicator_graph_stats['saved']} shared")
         
         return self.indicator_cache
     
@@ -259,111 +360,38 @@ class Strategy:
             data: Dict with OHLCV data
         
         Returns:
-            Dict with 'buy' and 'short' signal arrays (boolean)
+            Dict with 'buy' and 'short' signal arrays (boolean), precomputed_signals
+            when set
         """
+        if self.precomputed_signals is not None:
+            print(f"\n📊 Reusing precomputed signals for '{self.config['name']}'")
+            return self.precomputed_signals
+        
         print(f"\n📊 Generating signals for '{self.config['name']}'...")
         
         # Calculate indicators
         self.calculate_indicators(data)
         
         n_bars = len(data['close'])
-        buy_signals = np.zeros(n_bars, dtype=bool)
-        short_signals = np.zeros(n_bars, dtype=bool)
         
         # Get trading hours
         trading_hours = self.config["risk_management"].get("trading_hours", {})
         start_time = trading_hours.get("start")
         end_time = trading_hours.get("end")
         
-        # Evaluate conditions for each bar
-        for i in range(1, n_bars):  # Start from 1 to avoid lookback issues
-            # Check trading hours
-            in_trading_hours = True
-            if 'time' in data and start_time and end_time:
-                current_time = data['time'][i]
-                # Simplified time check (assumes time is in format like "09:30")
-                in_trading_hours = start_time <= str(current_time) <= end_time
-            
-            if not in_trading_hours:
-                continue
-            
-            # Evaluate long conditions
-            long_conditions_met = False
-            for cond_group in self.config["entry_conditions"]["long"]:
-                # Handle nested conditions format from UI
-                if "conditions" in cond_group:
-                    group_met = True
-                    for cond in cond_group["conditions"]:
-                        # Build condition string from object
-                        left = cond["left"]
-                        operator = cond["operator"]
-                        right = cond["right"]
-                        left_offset = cond.get("leftOffset", 0)
-                        right_offset = cond.get("rightOffset", 0)
-                        
-                        # Build condition string
-                        condition_str = f"{left} {operator} {right}"
-                        result = self.evaluate_condition(condition_str, i, data, left_offset, right_offset)
-                        
-                        logic = cond.get("logic", "AND")
-                        if logic == "AND":
-                            group_met = group_met and result
-                        else:  # OR
-                            group_met = group_met or result
-                    
-                    # OR logic between different signal groups
-                    long_conditions_met = long_conditions_met or group_met
-                # Handle simple condition format (backward compatibility)
-                elif "condition" in cond_group:
-                    condition_str = cond_group["condition"]
-                    result = self.evaluate_condition(condition_str, i, data, 0, 0)
-                    
-                    logic = cond_group.get("logic", "AND")
-                    if logic == "AND":
-                        long_conditions_met = long_conditions_met and result
-                    else:  # OR
-                        long_conditions_met = long_conditions_met or result
-            
-            buy_signals[i] = long_conditions_met
-            
-            # Evaluate short conditions
-            short_conditions_met = False
-            for cond_group in self.config["entry_conditions"]["short"]:
-                # Handle nested conditions format from UI
-                if "conditions" in cond_group:
-                    group_met = True
-                    for cond in cond_group["conditions"]:
-                        # Build condition string from object
-                        left = cond["left"]
-                        operator = cond["operator"]
-                        right = cond["right"]
-                        left_offset = cond.get("leftOffset", 0)
-                        right_offset = cond.get("rightOffset", 0)
-                        
-                        # Build condition string
-                        condition_str = f"{left} {operator} {right}"
-                        result = self.evaluate_condition(condition_str, i, data, left_offset, right_offset)
-                        
-                        logic = cond.get("logic", "AND")
-                        if logic == "AND":
-                            group_met = group_met and result
-                        else:  # OR
-                            group_met = group_met or result
-                    
-                    # OR logic between different signal groups
-                    short_conditions_met = short_conditions_met or group_met
-                # Handle simple condition format (backward compatibility)
-                elif "condition" in cond_group:
-                    condition_str = cond_group["condition"]
-                    result = self.evaluate_condition(condition_str, i, data, 0, 0)
-                    
-                    logic = cond_group.get("logic", "AND")
-                    if logic == "AND":
-                        short_conditions_met = short_conditions_met and result
-                    else:  # OR
-                        short_conditions_met = short_conditions_met or result
-            
-            short_signals[i] = short_conditions_met
+        # Bars where conditions are evaluated (start from 1 to avoid lookback issues)
+        active = np.ones(n_bars, dtype=bool)
+        active[:1] = False
+        
+        if 'time' in data and start_time and end_time:
+            # Simplified time check (assumes time is in format like "09:30")
+            time_str = np.asarray(data['time']).astype(str)
+            active &= (time_str >= start_time) & (time_str <= end_time)
+        
+        # Compile each side of entry conditions into whole-array masks
+        compiler = ConditionCompiler(self)
+        buy_signals = compiler.compile(self.config["entry_conditions"]["long"], data, active)
+        short_signals = compiler.compile(self.config["entry_conditions"]["short"], data, active)
         
         print(f"  ✅ Generated {np.sum(buy_signals)} buy signals, {np.sum(short_signals)} short signals")
         
@@ -503,6 +531,169 @@ class Strategy:
         return candle_range <= candle_length_limit
 
 
+# ==================== MULTI-TIMEFRAME ====================
+
+def _completed_timeframe_data(data: Dict[str, np.ndarray], timeframe: str):
+    """
+    OHLCV of data resampled to a timeframe
+    
+    Returns:
+        (resampled data dict, bucket index of the last completed bucket per bar)
+    """
+    resampler = TimeframeResampler({
+        'times': data['time'],
+        'opens': data['open'],
+        'highs': data['high'],
+        'lows': data['low'],
+        'closes': data['close'],
+        'volumes': data['volume']
+    })
+    resampled, completed = resampler.resample_completed(timeframe)
+    return {
+        'time': resampled['times'],
+        'open': resampled['opens'],
+        'high': resampled['highs'],
+        'low': resampled['lows'],
+        'close': resampled['closes'],
+        'volume': resampled['volumes']
+    }, completed
+
+
+def _align_completed(result, completed: np.ndarray):
+    """
+    Map a higher-timeframe indicator result onto base bars (NaN before the
+    first completed bucket); the last axis is the bar axis, so sweep
+    matrices (one row per period) are mapped row by row
+    """
+    if isinstance(result, tuple):
+        return tuple(_align_completed(values, completed) for values in result)
+    if isinstance(result, dict):
+        return {name: _align_completed(values, completed) for name, values in result.items()}
+    
+    values = np.asarray(result)
+    if values.ndim == 0:
+        return result
+    if values.dtype.kind != 'f':
+        values = values.astype(float)
+    
+    if values.shape[-1] == 0:
+        return np.full(values.shape[:-1] + (len(completed),), np.nan, dtype=values.dtype)
+    aligned = values[..., np.maximum(completed, 0)]
+    aligned[..., completed < 0] = np.nan
+    return aligned
+
+
+# ==================== COMPILED STRATEGIES ====================
+
+class CompiledStrategy:
+    """
+    Validated strategy with parameter slots
+    
+    The config is validated and the exit manager built once. bind() then
+    returns a Strategy for a parameter vector by copying only the dicts and
+    lists on each parameter path, so there is no deepcopy and no validation
+    per evaluation. The rest of the config is shared by every bound
+    strategy and must be treated as read-only.
+    
+    Usage:
+        compiled = CompiledStrategy(strategy)
+        compiled.add_slot("indicators.0.params.period")
+        strategy = compiled.bind({"indicators.0.params.period": 12})
+    """
+    
+    def __init__(self, strategy: Strategy):
+        """
+        Args:
+            strategy: Already validated strategy used as template
+        """
+        self.config = strategy.config
+        self.exit_manager = strategy.exit_manager
+        self.slots = {}  # param path -> parsed keys (list index or dict key)
+    
+    def add_slot(self, param_path: str) -> tuple:
+        """Parse a parameter path like "indicators.0.params.period" once"""
+        keys = self.slots.get(param_path)
+        if keys is None:
+            keys = tuple(int(key) if key.isdigit() else key for key in param_path.split('.'))
+            self.slots[param_path] = keys
+        return keys
+    
+    def bind(self, params: Optional[Dict[str, Any]] = None) -> Strategy:
+        """
+        Strategy with parameter values applied
+        
+        Args:
+            params: Dict param path -> value
+        
+        Returns:
+            New Strategy instance (errors for paths that do not resolve are the
+            same KeyError / IndexError / TypeError as navigating the config)
+        """
+        config = dict(self.config)
+        copied = {id(config)}
+        exit_manager = self.exit_manager
+        
+        for param_path, value in (params or {}).items():
+            keys = self.add_slot(param_path)
+            current = config
+            for key in keys[:-1]:
+                child = current[key]
+                if id(child) not in copied and isinstance(child, (dict, list)):
+                    child = copy(child)
+                    current[key] = child
+                    copied.add(id(child))
+                current = child
+            current[keys[-1]] = value
+            
+            if keys[0] == "exit_rules":
+                exit_manager = None
+        
+        strategy = Strategy.__new__(Strategy)
+        strategy.config = config
+        strategy._init_components(exit_manager)
+        return strategy
+
+
+# Compiled strategies by config content (backtest / optimize endpoints)
+_compiled_strategies = OrderedDict()
+_compiled_strategies_lock = threading.Lock()
+COMPILED_STRATEGY_CACHE_SIZE = 32
+
+
+def compile_strategy(config: Dict) -> CompiledStrategy:
+    """
+    Validate and compile a strategy config, reusing earlier compilations
+    of the same content
+    
+    Args:
+        config: Strategy as dictionary
+    
+    Returns:
+        CompiledStrategy (call bind() for a Strategy instance)
+    """
+    try:
+        key = hashlib.blake2b(json.dumps(config, sort_keys=True).encode(), digest_size=16).hexdigest()
+    except (TypeError, ValueError):
+        # Not JSON serializable: compile without caching
+        return CompiledStrategy(Strategy(strategy_json=config))
+    
+    with _compiled_strategies_lock:
+        compiled = _compiled_strategies.get(key)
+        if compiled is not None:
+            _compiled_strategies.move_to_end(key)
+            return compiled
+    
+    # Own copy: the caller may keep modifying its config
+    compiled = CompiledStrategy(Strategy(strategy_json=deepcopy(config)))
+    
+    with _compiled_strategies_lock:
+        _compiled_strategies[key] = compiled
+        while len(_compiled_strategies) > COMPILED_STRATEGY_CACHE_SIZE:
+            _compiled_strategies.popitem(last=False)
+    
+    return compiled
+
+
 # ==================== STRATEGY BUILDER HELPERS ====================
 
 class StrategyBuilder:
@@ -534,13 +725,17 @@ class StrategyBuilder:
             }
         }
     
-    def add_indicator(self, ind_id: str, ind_type: str, params: Dict) -> 'StrategyBuilder':
-        """Add indicator to strategy"""
-        self.config["indicators"].append({
+    def add_indicator(self, ind_id: str, ind_type: str, params: Dict,
+                      timeframe: Optional[str] = None) -> 'StrategyBuilder':
+        """Add indicator to strategy (timeframe: compute on resampled bars, e.g. "15m")"""
+        indicator = {
             "id": ind_id,
             "type": ind_type,
             "params": params
-        })
+        }
+        if timeframe:
+            indicator["timeframe"] = timeframe
+        self.config["indicators"].append(indicator)
         return self
     
     def add_long_condition(self, condition: str, logic: str = "AND") -> 'StrategyBuilder':
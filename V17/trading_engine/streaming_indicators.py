@@ -0,0 +1,714 @@
+"""
+Streaming Indicators
+Stateful bar-by-bar counterparts of the Indicators batch functions for live data
+- update(bar) consumes one completed candle ({'open', 'high', 'low', 'close', 'volume'})
+  in O(1) amortized time (rolling max/min use monotonic deques)
+- seed(data) warms the state up from a historical batch of OHLCV arrays
+- Outputs match what the batch function returns for the last bar of the
+  history seen so far (calculate_indicator(name, data[:i + 1], params)[-1]),
+  i.e. what the live path would get by recomputing full arrays every bar
+"""
+
+import math
+import numpy as np
+from collections import deque
+from typing import Dict, Optional, Tuple, Union
+
+from .indicators import Indicators, calculate_indicator
+
+NAN = float('nan')
+
+# Rebuild running window sums from the window every N updates (bounds float drift)
+RESYNC_INTERVAL = 1024
+
+
+class StreamingIndicator:
+    """Base class for streaming indicators"""
+
+    def __init__(self):
+        self.count = 0
+        self.value = NAN
+
+    @property
+    def ready(self) -> bool:
+        """True once the warm-up period is over"""
+        return self.count >= self.warmup
+
+    @property
+    def warmup(self) -> int:
+        """Bars needed before the output is valid"""
+        return 1
+
+    def update(self, bar: Dict) -> Union[float, Tuple]:
+        """
+        Consume one completed bar
+
+        Args:
+            bar: Candle dict with 'open', 'high', 'low', 'close', 'volume'
+
+        Returns:
+            Current indicator value (tuple for multi-line indicators)
+        """
+        raise NotImplementedError
+
+    def seed(self, data: Dict[str, np.ndarray]) -> 'StreamingIndicator':
+        """
+        Warm up from historical OHLCV arrays (replays the bars)
+
+        Args:
+            data: Dict of arrays with 'open', 'high', 'low', 'close', 'volume'
+
+        Returns:
+            self
+        """
+        keys = [key for key in ('open', 'high', 'low', 'close', 'volume') if key in data]
+        columns = [np.asarray(data[key], dtype=float).tolist() for key in keys]
+        for row in zip(*columns):
+            self.update(dict(zip(keys, row)))
+        return self
+
+
+# ==================== BUILDING BLOCKS ====================
+
+class _EMAState:
+    """EMA recursion, same arithmetic as Indicators.ema"""
+
+    __slots__ = ('multiplier', 'value', 'count')
+
+    def __init__(self, period: int):
+        self.multiplier = 2 / (period + 1)
+        self.value = NAN
+        self.count = 0
+
+    def update(self, x: float) -> float:
+        if self.count == 0:
+            self.value = x
+        else:
+            self.value = (x - self.value) * self.multiplier + self.value
+        self.count += 1
+        return self.value
+
+    def seed(self, values: np.ndarray, period: int):
+        if len(values):
+            self.value = float(Indicators.ema(np.asarray(values, dtype=float), period)[-1])
+            self.count = len(values)
+
+
+class _WindowSum:
+    """Sum of the last `size` values with NaN tracking"""
+
+    __slots__ = ('size', 'window', 'total', 'nan_count', 'updates')
+
+    def __init__(self, size: int):
+        self.size = size
+        self.window = deque()
+        self.total = 0.0
+        self.nan_count = 0
+        self.updates = 0
+
+    def push(self, x: float):
+        self.window.append(x)
+        if x != x:
+            self.nan_count += 1
+        else:
+            self.total += x
+
+        if len(self.window) > self.size:
+            old = self.window.popleft()
+            if old != old:
+                self.nan_count -= 1
+            else:
+                self.total -= old
+
+        self.updates += 1
+        if self.updates % RESYNC_INTERVAL == 0:
+            self.total = math.fsum(v for v in self.window if v == v)
+
+    @property
+    def full(self) -> bool:
+        return len(self.window) == self.size
+
+
+class _RollingExtreme:
+    """Rolling max (or min) over the last `size` values with a monotonic deque"""
+
+    __slots__ = ('size', 'is_max', 'items', 'index')
+
+    def __init__(self, size: int, is_max: bool):
+        self.size = size
+        self.is_max = is_max
+        self.items = deque()  # (index, value), values monotonic
+        self.index = 0
+
+    def push(self, x: float) -> float:
+        items = self.items
+        if self.is_max:
+            while items and items[-1][1] <= x:
+                items.pop()
+        else:
+            while items and items[-1][1] >= x:
+                items.pop()
+        items.append((self.index, x))
+
+        if items[0][0] <= self.index - self.size:
+            items.popleft()
+
+        self.index += 1
+        return items[0][1] if self.index >= self.size else NAN
+
+
+class _RollingStd:
+    """Sample standard deviation (ddof=1) of the last `size` values, like pandas rolling().std()"""
+
+    __slots__ = ('size', 'window', 'mean', 'm2', 'updates')
+
+    def __init__(self, size: int):
+        self.size = size
+        self.window = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.updates = 0
+
+    def push(self, x: float) -> float:
+        # Welford add
+        self.window.append(x)
+        n = len(self.window)
+        delta = x - self.mean
+        self.mean += delta / n
+        self.m2 += delta * (x - self.mean)
+
+        # Welford remove
+        if n > self.size:
+            old = self.window.popleft()
+            n -= 1
+            delta = old - self.mean
+            self.mean -= delta / n
+            self.m2 -= delta * (old - self.mean)
+
+        self.updates += 1
+        if self.updates % RESYNC_INTERVAL == 0:
+            values = np.fromiter(self.window, dtype=float)
+            self.mean = float(values.mean())
+            self.m2 = float(((values - self.mean) ** 2).sum())
+
+        if n < self.size or n < 2:
+            return NAN
+        return math.sqrt(max(self.m2, 0.0) / (n - 1))
+
+
+class _CenteredMAState:
+    """
+    Last value of a 'same'-mode convolution moving average (Indicators.sma/wma)
+
+    np.convolve(..., mode='same') zero-pads past the last bar, so the value
+    at the last bar only covers the trailing period - (period - 1) // 2
+    prices, weighted by kernel[(period - 1) // 2:] from newest to oldest.
+    """
+
+    __slots__ = ('period', 'window', 'weights', 'weighted', 'weighted_step', 'count', 'updates')
+
+    def __init__(self, period: int, weights: Optional[np.ndarray] = None):
+        if period < 1:
+            raise ValueError(f"Invalid period: {period}")
+        self.period = period
+        head = (period - 1) // 2
+        if weights is None:
+            weights = np.ones(period)
+        kernel = np.asarray(weights, dtype=float) / np.sum(weights)
+        # weight of the k-th newest price in the window
+        self.weights = kernel[head:]
+        self.window = _WindowSum(period - head)
+        # linear weights: each bar gets `weighted_step` more weight as it ages
+        self.weighted_step = float(self.weights[1] - self.weights[0]) if len(self.weights) > 1 else 0.0
+        self.weighted = 0.0
+        self.count = 0
+        self.updates = 0
+
+    def update(self, x: float) -> float:
+        size = self.window.size
+        oldest = self.window.window[0] if self.window.full else None
+
+        # Existing prices age by one bar, the oldest one drops out
+        if self.weighted_step:
+            finite_sum = self.window.total
+            self.weighted += self.weighted_step * finite_sum
+            if oldest is not None and oldest == oldest:
+                self.weighted -= (self.weights[0] + self.weighted_step * size) * oldest
+            if x == x:
+                self.weighted += self.weights[0] * x
+
+        self.window.push(x)
+        self.count += 1
+        self.updates += 1
+        if self.weighted_step and self.updates % RESYNC_INTERVAL == 0:
+            self._resync()
+
+        return self.current()
+
+    def current(self) -> float:
+        """Moving average at the last pushed price"""
+        if self.count < self.period or self.window.nan_count:
+            return NAN
+        if self.weighted_step:
+            return self.weighted
+        return self.window.total * self.weights[0]
+
+    def _resync(self):
+        newest_first = list(self.window.window)[::-1]
+        self.weighted = math.fsum(w * v for w, v in zip(self.weights, newest_first) if v == v)
+
+    def seed(self, values: np.ndarray):
+        values = np.asarray(values, dtype=float)
+        self.count = len(values)
+        self.window = _WindowSum(self.window.size)
+        for v in values[-self.window.size:]:
+            self.window.push(float(v))
+        if self.weighted_step:
+            self._resync()
+
+
+# ==================== TREND ====================
+
+class StreamingEMA(StreamingIndicator):
+    """Exponential Moving Average"""
+
+    def __init__(self, period: int = 14, source: str = 'close'):
+        super().__init__()
+        self.period = period
+        self.source = source
+        self._ema = _EMAState(period)
+
+    def update(self, bar: Dict) -> float:
+        self.count += 1
+        self.value = self._ema.update(float(bar[self.source]))
+        return self.value
+
+    def seed(self, data: Dict[str, np.ndarray]) -> 'StreamingEMA':
+        values = np.asarray(data[self.source], dtype=float)
+        self._ema.seed(values, self.period)
+        self.count = len(values)
+        self.value = self._ema.value
+        return self
+
+
+class StreamingSMA(StreamingIndicator):
+    """Simple Moving Average (matches the last bar of Indicators.sma)"""
+
+    def __init__(self, period: int = 14, source: str = 'close'):
+        super().__init__()
+        self.period = period
+        self.source = source
+        self._ma = _CenteredMAState(period)
+
+    @property
+    def warmup(self) -> int:
+        return self.period
+
+    def update(self, bar: Dict) -> float:
+        self.count += 1
+        self.value = self._ma.update(float(bar[self.source]))
+        return self.value
+
+    def seed(self, data: Dict[str, np.ndarray]) -> 'StreamingSMA':
+        values = np.asarray(data[self.source], dtype=float)
+        self._ma.seed(values)
+        self.count = len(values)
+        self.value = self._ma.current()
+        return self
+
+
+class StreamingWMA(StreamingSMA):
+    """Weighted Moving Average (matches the last bar of Indicators.wma)"""
+
+    def __init__(self, period: int = 14, source: str = 'close'):
+        StreamingIndicator.__init__(self)
+        self.period = period
+        self.source = source
+        self._ma = _CenteredMAState(period, np.arange(1, period + 1))
+
+
+# ==================== MOMENTUM ====================
+
+class StreamingRSI(StreamingIndicator):
+    """Relative Strength Index"""
+
+    def __init__(self, period: int = 14, source: str = 'close'):
+        super().__init__()
+        self.period = period
+        self.source = source
+        self._gain = _EMAState(period)
+        self._loss = _EMAState(period)
+        self._prev = None
+
+    def update(self, bar: Dict) -> float:
+        x = float(bar[self.source])
+        delta = 0.0 if self._prev is None else x - self._prev
+        self._prev = x
+
+        avg_gain = self._gain.update(delta if delta > 0 else 0.0)
+        avg_loss = self._loss.update(-delta if delta < 0 else 0.0)
+
+        rs = avg_gain / (avg_loss + 1e-10)
+        self.count += 1
+        self.value = 100 - (100 / (1 + rs))
+        return self.value
+
+    def seed(self, data: Dict[str, np.ndarray]) -> 'StreamingRSI':
+        values = np.asarray(data[self.source], dtype=float)
+        if len(values) == 0:
+            return self
+        delta = np.diff(values, prepend=values[0])
+        self._gain.seed(np.where(delta > 0, delta, 0), self.period)
+        self._loss.seed(np.where(delta < 0, -delta, 0), self.period)
+        self._prev = float(values[-1])
+        self.count = len(values)
+        rs = self._gain.value / (self._loss.value + 1e-10)
+        self.value = 100 - (100 / (1 + rs))
+        return self
+
+
+class StreamingMACD(StreamingIndicator):
+    """MACD - returns (macd_line, signal_line, histogram)"""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9, source: str = 'close'):
+        super().__init__()
+        self.fast, self.slow, self.signal = fast, slow, signal
+        self.source = source
+        self._fast = _EMAState(fast)
+        self._slow = _EMAState(slow)
+        self._signal = _EMAState(signal)
+        self.value = (NAN, NAN, NAN)
+
+    def update(self, bar: Dict) -> Tuple[float, float, float]:
+        x = float(bar[self.source])
+        macd_line = self._fast.update(x) - self._slow.update(x)
+        signal_line = self._signal.update(macd_line)
+        self.count += 1
+        self.value = (macd_line, signal_line, macd_line - signal_line)
+        return self.value
+
+    def seed(self, data: Dict[str, np.ndarray]) -> 'StreamingMACD':
+        values = np.asarray(data[self.source], dtype=float)
+        if len(values) == 0:
+            return self
+        self._fast.seed(values, self.fast)
+        self._slow.seed(values, self.slow)
+        macd_line = Indicators.ema(values, self.fast) - Indicators.ema(values, self.slow)
+        self._signal.seed(macd_line, self.signal)
+        self.count = len(values)
+        self.value = (float(macd_line[-1]), self._signal.value, float(macd_line[-1]) - self._signal.value)
+        return self
+
+
+class StreamingStochastic(StreamingIndicator):
+    """Stochastic Oscillator - returns (k, d)"""
+
+    def __init__(self, k_period: int = 14, d_period: int = 3):
+        super().__init__()
+        self.k_period = k_period
+        self.d_period = d_period
+        self._lowest = _RollingExtreme(k_period, is_max=False)
+        self._highest = _RollingExtreme(k_period, is_max=True)
+        self._d = _CenteredMAState(d_period)
+        self.value = (NAN, NAN)
+
+    @property
+    def warmup(self) -> int:
+        # %K needs k_period bars, %D needs its whole trailing window of valid %K
+        d_window = self.d_period - (self.d_period - 1) // 2
+        return max(self.k_period + d_window - 1, self.d_period)
+
+    def update(self, bar: Dict) -> Tuple[float, float]:
+        lowest_low = self._lowest.push(float(bar['low']))
+        highest_high = self._highest.push(float(bar['high']))
+        k = 100 * (float(bar['close']) - lowest_low) / (highest_high - lowest_low + 1e-10)
+        d = self._d.update(k)
+        self.count += 1
+        self.value = (k, d)
+        return self.value
+
+
+# ==================== VOLATILITY ====================
+
+class StreamingATR(StreamingIndicator):
+    """Average True Range"""
+
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self.period = period
+        self._ema = _EMAState(period)
+        self._prev_close = None
+
+    def _true_range(self, bar: Dict) -> float:
+        high, low = float(bar['high']), float(bar['low'])
+        tr = high - low
+        if self._prev_close is not None:
+            tr = max(tr, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = float(bar['close'])
+        return tr
+
+    def update(self, bar: Dict) -> float:
+        self.count += 1
+        self.value = self._ema.update(self._true_range(bar))
+        return self.value
+
+    def seed(self, data: Dict[str, np.ndarray]) -> 'StreamingATR':
+        high, low, close = (np.asarray(data[key], dtype=float) for key in ('high', 'low', 'close'))
+        if len(close) == 0:
+            return self
+        self.value = float(Indicators.atr(high, low, close, self.period)[-1])
+        self._ema.value = self.value
+        self._ema.count = len(close)
+        self._prev_close = float(close[-1])
+        self.count = len(close)
+        return self
+
+
+class StreamingBollingerBands(StreamingIndicator):
+    """Bollinger Bands - returns (upper, middle, lower)"""
+
+    def __init__(self, period: int = 20, std_dev: float = 2.0, source: str = 'close'):
+        super().__init__()
+        self.period = period
+        self.std_dev = std_dev
+        self.source = source
+        self._middle = _CenteredMAState(period)
+        self._std = _RollingStd(period)
+        self.value = (NAN, NAN, NAN)
+
+    @property
+    def warmup(self) -> int:
+        return self.period
+
+    def update(self, bar: Dict) -> Tuple[float, float, float]:
+        x = float(bar[self.source])
+        middle = self._middle.update(x)
+        std = self._std.push(x)
+        self.count += 1
+        self.value = (middle + self.std_dev * std, middle, middle - self.std_dev * std)
+        return self.value
+
+
+class StreamingDonchianChannel(StreamingIndicator):
+    """Donchian Channel - returns (upper, middle, lower)"""
+
+    def __init__(self, period: int = 20):
+        super().__init__()
+        self.period = period
+        self._upper = _RollingExtreme(period, is_max=True)
+        self._lower = _RollingExtreme(period, is_max=False)
+        self.value = (NAN, NAN, NAN)
+
+    @property
+    def warmup(self) -> int:
+        return self.period
+
+    def update(self, bar: Dict) -> Tuple[float, float, float]:
+        upper = self._upper.push(float(bar['high']))
+        lower = self._lower.push(float(bar['low']))
+        self.count += 1
+        self.value = (upper, (upper + lower) / 2, lower)
+        return self.value
+
+
+# ==================== VOLUME ====================
+
+class StreamingOBV(StreamingIndicator):
+    """On Balance Volume"""
+
+    def __init__(self):
+        super().__init__()
+        self._prev_close = None
+        self._total = 0.0
+
+    def update(self, bar: Dict) -> float:
+        close = float(bar['close'])
+        if self._prev_close is not None:
+            direction = (close > self._prev_close) - (close < self._prev_close)
+            self._total += direction * float(bar['volume'])
+        self._prev_close = close
+        self.count += 1
+        self.value = self._total
+        return self.value
+
+    def seed(self, data: Dict[str, np.ndarray]) -> 'StreamingOBV':
+        close = np.asarray(data['close'], dtype=float)
+        if len(close) == 0:
+            return self
+        self._total = float(Indicators.obv(close, np.asarray(data['volume'], dtype=float))[-1])
+        self._prev_close = float(close[-1])
+        self.count = len(close)
+        self.value = self._total
+        return self
+
+
+class StreamingVWAP(StreamingIndicator):
+    """Volume Weighted Average Price (cumulative)"""
+
+    def __init__(self):
+        super().__init__()
+        self._tp_volume = 0.0
+        self._volume = 0.0
+
+    def update(self, bar: Dict) -> float:
+        tp = (float(bar['high']) + float(bar['low']) + float(bar['close'])) / 3
+        volume = float(bar['volume'])
+        self._tp_volume += tp * volume
+        self._volume += volume
+        self.count += 1
+        self.value = self._tp_volume / (self._volume + 1e-10)
+        return self.value
+
+    def seed(self, data: Dict[str, np.ndarray]) -> 'StreamingVWAP':
+        high, low, close, volume = (np.asarray(data[key], dtype=float) for key in ('high', 'low', 'close', 'volume'))
+        if len(close) == 0:
+            return self
+        self._tp_volume = float(np.cumsum((high + low + close) / 3 * volume)[-1])
+        self._volume = float(np.cumsum(volume)[-1])
+        self.count = len(close)
+        self.value = self._tp_volume / (self._volume + 1e-10)
+        return self
+
+
+# ==================== CUSTOM ====================
+
+class StreamingSuperTrend(StreamingIndicator):
+    """SuperTrend - returns (supertrend, direction)"""
+
+    def __init__(self, period: int = 10, multiplier: float = 3.0):
+        super().__init__()
+        self.period = period
+        self.multiplier = multiplier
+        self._atr = StreamingATR(period)
+        self._final_upper = NAN
+        self._final_lower = NAN
+        self._prev_close = None
+        self.value = (NAN, NAN)
+
+    def update(self, bar: Dict) -> Tuple[float, float]:
+        high, low, close = float(bar['high']), float(bar['low']), float(bar['close'])
+        atr = self._atr.update(bar)
+        hl_avg = (high + low) / 2
+        basic_upper = hl_avg + (self.multiplier * atr)
+        basic_lower = hl_avg - (self.multiplier * atr)
+
+        if self._prev_close is None:
+            final_upper, final_lower = basic_upper, basic_lower
+            supertrend, direction = final_upper, 1.0
+        else:
+            # Calculate final bands
+            if basic_upper < self._final_upper or self._prev_close > self._final_upper:
+                final_upper = basic_upper
+            else:
+                final_upper = self._final_upper
+
+            if basic_lower > self._final_lower or self._prev_close < self._final_lower:
+                final_lower = basic_lower
+            else:
+                final_lower = self._final_lower
+
+            # Determine trend direction
+            if close <= final_upper:
+                supertrend, direction = final_upper, -1.0
+            else:
+                supertrend, direction = final_lower, 1.0
+
+        self._final_upper, self._final_lower = final_upper, final_lower
+        self._prev_close = close
+        self.count += 1
+        self.value = (supertrend, direction)
+        return self.value
+
+
+# ==================== FACTORY / VERIFICATION ====================
+
+# Indicator name -> constructor from params, same names and defaults as calculate_indicator
+STREAMING_INDICATORS = {
+    'EMA': lambda p: StreamingEMA(p.get('period', 14)),
+    'SMA': lambda p: StreamingSMA(p.get('period', 14)),
+    'WMA': lambda p: StreamingWMA(p.get('period', 14)),
+    'RSI': lambda p: StreamingRSI(p.get('period', 14)),
+    'MACD': lambda p: StreamingMACD(p.get('fast', 12), p.get('slow', 26), p.get('signal', 9)),
+    'Stochastic': lambda p: StreamingStochastic(p.get('k_period', 14), p.get('d_period', 3)),
+    'BollingerBands': lambda p: StreamingBollingerBands(p.get('period', 20), p.get('std_dev', 2.0)),
+    'ATR': lambda p: StreamingATR(p.get('period', 14)),
+    'DonchianChannel': lambda p: StreamingDonchianChannel(p.get('period', 20)),
+    'OBV': lambda p: StreamingOBV(),
+    'VWAP': lambda p: StreamingVWAP(),
+    'SuperTrend': lambda p: StreamingSuperTrend(p.get('period', 10), p.get('multiplier', 3.0))
+}
+
+
+def create_streaming_indicator(indicator_name: str, params: Optional[dict] = None) -> StreamingIndicator:
+    """
+    Create a streaming indicator by calculate_indicator name
+
+    Args:
+        indicator_name: Name of indicator (e.g., 'EMA', 'RSI', 'MACD')
+        params: Dict with indicator parameters (same keys as calculate_indicator)
+    """
+    if indicator_name not in STREAMING_INDICATORS:
+        raise ValueError(f"No streaming implementation for indicator: {indicator_name}")
+    return STREAMING_INDICATORS[indicator_name](params or {})
+
+
+def verify_against_batch(indicator_name: str, data: Dict[str, np.ndarray], params: Optional[dict] = None,
+                         seed_bars: Optional[int] = None, n_checks: int = 200,
+                         rtol: float = 1e-7, atol: float = 1e-7) -> Dict:
+    """
+    Check a streaming indicator against its batch implementation
+
+    The indicator is seeded with the first `seed_bars` bars and updated bar by
+    bar with the rest. At up to `n_checks` bars after warm-up every output is
+    compared with calculate_indicator over the same history.
+
+    Args:
+        indicator_name: Name of indicator
+        data: Dict of OHLCV arrays
+        params: Indicator parameters
+        seed_bars: Bars used for seeding (default: half of the data)
+        n_checks: Number of bars compared
+        rtol, atol: Tolerances for np.isclose
+
+    Returns:
+        {'indicator', 'checked', 'mismatches', 'max_abs_diff', 'ok'}
+    """
+    params = params or {}
+    data = {key: np.asarray(values, dtype=float) for key, values in data.items()}
+    n_bars = len(data['close'])
+    seed_bars = n_bars // 2 if seed_bars is None else seed_bars
+
+    indicator = create_streaming_indicator(indicator_name, params)
+    indicator.seed({key: values[:seed_bars] for key, values in data.items()})
+
+    outputs = {}
+    if seed_bars > 0:
+        outputs[seed_bars - 1] = indicator.value
+    keys = list(data.keys())
+    for i in range(seed_bars, n_bars):
+        outputs[i] = indicator.update({key: data[key][i] for key in keys})
+
+    first_checked = max(seed_bars - 1, indicator.warmup - 1, 0)
+    checked = np.unique(np.linspace(first_checked, n_bars - 1, min(n_checks, n_bars - first_checked)).astype(int))
+
+    mismatches = 0
+    max_abs_diff = 0.0
+    for i in checked:
+        batch = calculate_indicator(indicator_name, {key: values[:i + 1] for key, values in data.items()},
+                                    params, cache=None)
+        expected = np.array([line[-1] for line in batch] if isinstance(batch, tuple) else [batch[-1]], dtype=float)
+        actual = np.array(outputs[i] if isinstance(outputs[i], tuple) else [outputs[i]], dtype=float)
+
+        if not np.all(np.isclose(actual, expected, rtol=rtol, atol=atol, equal_nan=True)):
+            mismatches += 1
+        both = np.isfinite(actual) & np.isfinite(expected)
+        if both.any():
+            max_abs_diff = max(max_abs_diff, float(np.max(np.abs(actual[both] - expected[both]))))
+
+    return {
+        'indicator': indicator_name,
+        'checked': len(checked),
+        'mismatches': mismatches,
+        'max_abs_diff': max_abs_diff,
+        'ok': mismatches == 0
+    }
@@ -1,17 +1,72 @@
 """
 Timeframe Resampler - Convert OHLCV data to different timeframes
 Similar to Amibroker's timeframe functionality
+- Works on int64 epoch-second arrays: bucket starts are computed per bar
+  (session lookup with np.searchsorted), OHLCV is aggregated per bucket
+  with ufunc.reduceat (no DataFrame round-trip)
+- Intraday buckets are anchored to the trading session starts (VN
+  derivatives: 09:00-11:30, 13:00-14:45), so a bucket never spans the lunch
+  break and no empty buckets are produced
+- Returns column arrays (call .tolist() only where JSON is produced)
+- resample_completed() maps every source bar to the last completed bucket,
+  so higher-timeframe values can be used on base bars without lookahead
+- TimeframePyramid keeps every standard timeframe of a base series; a level
+  is a dict lookup and new base bars only re-aggregate the last bucket
 """
 
-import pandas as pd
+import numpy as np
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence, Tuple
+
+SECONDS_PER_DAY = 86400
+
+# VN derivatives trading sessions (local time of the epoch values)
+VN_DERIVATIVES_SESSIONS = (('09:00', '11:30'), ('13:00', '14:45'))
+
+# Levels built at upload time
+PYRAMID_TIMEFRAMES = ('1m', '5m', '15m', '30m', '1H', '4H', '1D')
+
+# Processed-store column names -> resampler keys, and their dtypes
+PYRAMID_COLUMNS = {
+    'time': ('times', np.int64),
+    'open': ('opens', np.float64),
+    'high': ('highs', np.float64),
+    'low': ('lows', np.float64),
+    'close': ('closes', np.float64),
+    'volume': ('volumes', np.int64)
+}
+
+
+def _seconds_of_day(clock: str) -> int:
+    """'HH:MM' -> seconds after midnight"""
+    parsed = datetime.strptime(clock, '%H:%M')
+    return parsed.hour * 3600 + parsed.minute * 60
+
+
+def _epoch_seconds(values) -> np.ndarray:
+    """Epoch seconds (int64) of numeric, datetime64 or ISO string times"""
+    times = np.asarray(values)
+    if times.dtype.kind in 'iu':
+        return times.astype(np.int64)
+    if times.dtype.kind == 'f':
+        return np.floor(times).astype(np.int64)
+    return times.astype('datetime64[s]').astype(np.int64)
+
+
+def _causal_bar_seconds(times: np.ndarray) -> np.ndarray:
+    """Per bar: smallest positive step between the bars up to it (0 before the first step)"""
+    steps = np.diff(times)
+    steps = np.where(steps > 0, steps, np.iinfo(np.int64).max)
+    smallest = np.minimum.accumulate(steps) if len(steps) else steps
+    bar_seconds = np.zeros(len(times), dtype=np.int64)
+    bar_seconds[1:] = np.where(smallest == np.iinfo(np.int64).max, 0, smallest)
+    return bar_seconds
 
 
 class TimeframeResampler:
     """Resample OHLCV data to different timeframes"""
 
-    # Mapping of timeframe strings to pandas resample rules
+    # Supported timeframes (and the equivalent pandas resample rules)
     TIMEFRAME_MAP = {
         '1m': '1min',
         '5m': '5min',
@@ -25,14 +80,90 @@ class TimeframeResampler:
         '1M': '1M'
     }
 
-    def __init__(self, data: Dict):
+    # Fixed-length bucket sizes (seconds); '1W' and '1M' are calendar buckets
+    BUCKET_SECONDS = {
+        '1m': 60,
+        '5m': 300,
+        '15m': 900,
+        '30m': 1800,
+        '1H': 3600,
+        '2H': 7200,
+        '4H': 14400,
+        '1D': SECONDS_PER_DAY
+    }
+
+    def __init__(self, data: Dict, sessions: Optional[Sequence[Tuple[str, str]]] = VN_DERIVATIVES_SESSIONS):
         """
         Initialize resampler with OHLCV data
 
         Args:
             data: Dictionary with keys: 'times', 'opens', 'highs', 'lows', 'closes', 'volumes'
+                  (arrays or lists, times in epoch seconds)
+            sessions: ('HH:MM', 'HH:MM') trading sessions intraday buckets are
+                      anchored to; None aligns buckets to midnight
         """
         self.data = data
+        self.session_starts = np.array(sorted(_seconds_of_day(start) for start, _ in sessions or ()),
+                                       dtype=np.int64)
+
+    def bucket_starts(self, times: np.ndarray, timeframe: str) -> np.ndarray:
+        """
+        Start (label) of the bucket of every bar
+
+        Intraday buckets count from the latest session start of the day at
+        or before the bar (midnight before the first session); 1D/1W/1M
+        buckets are labelled like pandas resample (day, week-ending Sunday,
+        month end).
+
+        Args:
+            times: Epoch seconds (int64)
+            timeframe: Key of TIMEFRAME_MAP
+
+        Returns:
+            int64 epoch seconds, non-decreasing for sorted times
+        """
+        if timeframe in ('1W', '1M'):
+            days = times // SECONDS_PER_DAY
+            if timeframe == '1W':
+                # Epoch day 0 is a Thursday; Monday-Sunday weeks labelled by their Sunday
+                weekday = (days + 3) % 7
+                return (days + 6 - weekday) * SECONDS_PER_DAY
+            months = days.astype('datetime64[D]').astype('datetime64[M]')
+            month_end = (months + 1).astype('datetime64[D]') - np.timedelta64(1, 'D')
+            return month_end.astype(np.int64) * SECONDS_PER_DAY
+
+        size = self.BUCKET_SECONDS[timeframe]
+        second_of_day = times % SECONDS_PER_DAY
+        day_start = times - second_of_day
+        anchor = np.zeros_like(times)
+        if size < SECONDS_PER_DAY and len(self.session_starts):
+            session = np.searchsorted(self.session_starts, second_of_day, side='right') - 1
+            anchor = np.where(session >= 0, self.session_starts[np.maximum(session, 0)], 0)
+        return day_start + anchor + (second_of_day - anchor) // size * size
+
+    def aggregate(self, times: np.ndarray, opens: np.ndarray, highs: np.ndarray, lows: np.ndarray,
+                  closes: np.ndarray, volumes: np.ndarray, timeframe: str) -> Tuple[Dict, np.ndarray]:
+        """
+        OHLCV buckets of sorted, non-empty column arrays
+
+        Returns:
+            (resampled dict, index of the first bar of every bucket)
+        """
+        # Bucket boundaries: bars where the (sorted) bucket start changes
+        labels = self.bucket_starts(times, timeframe)
+        first = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1]])
+        last = np.append(first[1:], len(labels)) - 1
+
+        # OHLCV aggregation (first / max / min / last / sum, NaN skipped by max and min)
+        result = {
+            'times': labels[first],
+            'opens': opens[first],
+            'highs': np.fmax.reduceat(highs, first),
+            'lows': np.fmin.reduceat(lows, first),
+            'closes': closes[last],
+            'volumes': np.add.reduceat(volumes, first)
+        }
+        return result, first
 
     def resample(self, timeframe: str) -> Dict:
         """
@@ -42,49 +173,43 @@ class TimeframeResampler:
             timeframe: Target timeframe (e.g., '1H', '1D', '5m')
 
         Returns:
-            Resampled data dictionary with same structure as input
+            Resampled data dictionary with same keys as input (NumPy arrays)
         """
         # If timeframe not in map or is same as source, return original data
         if timeframe not in self.TIMEFRAME_MAP:
             return self.data
 
-        resample_rule = self.TIMEFRAME_MAP[timeframe]
-
         try:
-            # Convert to pandas DataFrame
-            df = pd.DataFrame({
-                'time': pd.to_datetime(self.data['times'], unit='s'),
-                'open': self.data['opens'],
-                'high': self.data['highs'],
-                'low': self.data['lows'],
-                'close': self.data['closes'],
-                'volume': self.data['volumes']
-            })
-
-            # Set time as index
-            df.set_index('time', inplace=True)
-
-            # Resample using OHLC aggregation rules
-            resampled = df.resample(resample_rule).agg({
-                'open': 'first',    # First value in period
-                'high': 'max',      # Maximum value
-                'low': 'min',       # Minimum value
-                'close': 'last',    # Last value in period
-                'volume': 'sum'     # Sum of volumes
-            })
-
-            # Drop rows with NaN (incomplete periods)
-            resampled.dropna(inplace=True)
-
-            # Convert back to dictionary format
-            result = {
-                'times': [int(ts.timestamp()) for ts in resampled.index],
-                'opens': resampled['open'].tolist(),
-                'highs': resampled['high'].tolist(),
-                'lows': resampled['low'].tolist(),
-                'closes': resampled['close'].tolist(),
-                'volumes': resampled['volume'].tolist()
-            }
+            times = np.asarray(self.data['times'])
+            opens = np.asarray(self.data['opens'], dtype=np.float64)
+            highs = np.asarray(self.data['highs'], dtype=np.float64)
+            lows = np.asarray(self.data['lows'], dtype=np.float64)
+            closes = np.asarray(self.data['closes'], dtype=np.float64)
+            volumes = np.asarray(self.data['volumes'])
+
+            if len(times) == 0:
+                return {
+                    'times': np.empty(0, dtype=np.int64),
+                    'opens': opens,
+                    'highs': highs,
+                    'lows': lows,
+                    'closes': closes,
+                    'volumes': volumes
+                }
+
+            times = _epoch_seconds(times)
+            if np.any(times[1:] < times[:-1]):
+                order = np.argsort(times, kind='stable')
+                times, opens, highs, lows, closes, volumes = (
+                    column[order] for column in (times, opens, highs, lows, closes, volumes))
+
+            result, _ = self.aggregate(times, opens, highs, lows, closes, volumes, timeframe)
+
+            # Drop buckets with a missing price (incomplete periods)
+            complete = ~(np.isnan(result['opens']) | np.isnan(result['highs'])
+                         | np.isnan(result['lows']) | np.isnan(result['closes']))
+            if not complete.all():
+                result = {key: values[complete] for key, values in result.items()}
 
             return result
 
@@ -93,6 +218,64 @@ class TimeframeResampler:
             # Return original data if resampling fails
             return self.data
 
+    def resample_completed(self, timeframe: str, bar_seconds: Optional[int] = None) -> Tuple[Dict, np.ndarray]:
+        """
+        Resample time-sorted data and map every source bar to the latest
+        completed bucket
+
+        A bucket becomes visible on the source bar whose close time (bar
+        time + bar length) reaches the bucket end (label + bucket size),
+        otherwise from the first bar of a later bucket (session or calendar
+        buckets ending early). The index of a bar depends only on the times
+        up to that bar, so values read through it never look ahead and
+        truncating the data never changes earlier entries.
+
+        Args:
+            timeframe: Key of TIMEFRAME_MAP
+            bar_seconds: Source bar length; when None, each bar uses the
+                         smallest positive time step seen up to it (0 on the
+                         first bar, so its bucket closes with the next one)
+
+        Returns:
+            (every bucket, NaN prices kept so indices stay aligned;
+             int64 bucket index per source bar, -1 before the first completed bucket)
+
+        Raises:
+            ValueError: unknown timeframe or unsorted times
+        """
+        if timeframe not in self.TIMEFRAME_MAP:
+            raise ValueError(f"Unknown timeframe: {timeframe}")
+
+        times = _epoch_seconds(self.data['times'])
+        if np.any(times[1:] < times[:-1]):
+            raise ValueError("Times must be sorted to align timeframes")
+        if len(times) == 0:
+            empty = {key: np.empty(0) for key in ('opens', 'highs', 'lows', 'closes', 'volumes')}
+            return dict(empty, times=np.empty(0, dtype=np.int64)), np.empty(0, dtype=np.int64)
+
+        result, first = self.aggregate(
+            times,
+            np.asarray(self.data['opens'], dtype=np.float64),
+            np.asarray(self.data['highs'], dtype=np.float64),
+            np.asarray(self.data['lows'], dtype=np.float64),
+            np.asarray(self.data['closes'], dtype=np.float64),
+            np.asarray(self.data['volumes']),
+            timeframe
+        )
+
+        bucket_start = np.zeros(len(times), dtype=np.int64)
+        bucket_start[first] = 1
+        bucket = np.cumsum(bucket_start) - 1
+
+        completed = bucket - 1
+        if timeframe in self.BUCKET_SECONDS:
+            if bar_seconds is None:
+                bar_seconds = _causal_bar_seconds(times)
+            bucket_end = result['times'][bucket] + self.BUCKET_SECONDS[timeframe]
+            completed += times + bar_seconds >= bucket_end
+
+        return result, completed
+
     @staticmethod
     def get_available_timeframes() -> List[str]:
         """Get list of available timeframes"""
@@ -104,16 +287,165 @@ class TimeframeResampler:
         return timeframe in TimeframeResampler.TIMEFRAME_MAP
 
 
-def resample_data(data: Dict, timeframe: str) -> Dict:
+def resample_data(data: Dict, timeframe: str,
+                  sessions: Optional[Sequence[Tuple[str, str]]] = VN_DERIVATIVES_SESSIONS) -> Dict:
     """
     Convenience function to resample data
 
     Args:
         data: OHLCV data dictionary
         timeframe: Target timeframe
+        sessions: Trading sessions intraday buckets are anchored to (None = midnight)
 
     Returns:
         Resampled data dictionary
     """
-    resampler = TimeframeResampler(data)
+    resampler = TimeframeResampler(data, sessions)
     return resampler.resample(timeframe)
+
+
+class TimeframePyramid:
+    """
+    Base series plus its resampled standard timeframes
+
+    Columns use the processed-store names ('time', 'open', ..., 'volume').
+    Levels are held in growable buffers: level() returns views, extend()
+    writes new base bars and rebuilds only the last bucket of every level
+    (buckets depend on the bar time alone, so earlier buckets never change).
+    """
+
+    def __init__(self, base: Dict, levels: Optional[Dict[str, Dict]] = None,
+                 timeframes: Sequence[str] = PYRAMID_TIMEFRAMES,
+                 sessions: Optional[Sequence[Tuple[str, str]]] = VN_DERIVATIVES_SESSIONS):
+        """
+        Args:
+            base: Sorted base column arrays (e.g. parse_csv_data columns)
+            levels: Already built levels {timeframe: columns} (e.g. memory-mapped
+                    from the processed store); missing ones are resampled
+            timeframes: Timeframes kept in the pyramid
+            sessions: Trading sessions intraday buckets are anchored to
+        """
+        self.resampler = TimeframeResampler({}, sessions)
+        self.timeframes = tuple(tf for tf in timeframes if tf in TimeframeResampler.TIMEFRAME_MAP)
+        self._columns = {}   # None (base) / timeframe -> column buffers
+        self._sizes = {}     # None (base) / timeframe -> number of rows in use
+
+        self._assign(None, base)
+        for timeframe in self.timeframes:
+            if levels is not None and timeframe in levels:
+                self._assign(timeframe, levels[timeframe])
+            else:
+                self._assign(timeframe, self._resample(self.base(), timeframe))
+
+    def __contains__(self, timeframe: str) -> bool:
+        return timeframe in self.timeframes
+
+    def __len__(self) -> int:
+        return self._sizes[None]
+
+    def base(self) -> Dict:
+        """Base column arrays (views)"""
+        return self._view(None)
+
+    def level(self, timeframe: str) -> Dict:
+        """
+        Column arrays of one timeframe (views, no copy)
+
+        Raises:
+            KeyError: timeframe is not part of the pyramid
+        """
+        if timeframe not in self.timeframes:
+            raise KeyError(timeframe)
+        return self._view(timeframe)
+
+    def levels(self) -> Dict[str, Dict]:
+        """All levels {timeframe: columns}"""
+        return {timeframe: self._view(timeframe) for timeframe in self.timeframes}
+
+    def extend(self, bars: Dict) -> int:
+        """
+        Append new base bars (e.g. live 1m candles) and update every level
+
+        A bar with the same time as the last base bar replaces it (a candle
+        that is still forming).
+
+        Args:
+            bars: Column arrays of the new bars, sorted by time
+
+        Returns:
+            Number of base bars after the update
+
+        Raises:
+            ValueError: a new bar is older than the last base bar
+        """
+        new_times = np.asarray(bars['time'], dtype=np.int64)
+        if len(new_times) == 0:
+            return len(self)
+        if np.any(new_times[1:] < new_times[:-1]):
+            raise ValueError("New bars must be sorted by time")
+
+        n_base = len(self)
+        base_times = self._view(None)['time']
+        if n_base and new_times[0] < base_times[-1]:
+            raise ValueError(f"Bar at {int(new_times[0])} is older than the last bar ({int(base_times[-1])})")
+
+        # Replace the forming bar, append the rest
+        at = n_base - 1 if n_base and new_times[0] == base_times[-1] else n_base
+        previous_last = base_times[-1:].copy()
+        self._write(None, at, bars)
+        base = self.base()
+
+        for timeframe in self.timeframes:
+            # Rebuild from the first base bar of the (previously) last bucket
+            if len(previous_last):
+                tail_label = self.resampler.bucket_starts(previous_last, timeframe)[0]
+                base_start = int(np.searchsorted(base['time'], tail_label, side='left'))
+                level_start = int(np.searchsorted(self._view(timeframe)['time'], tail_label, side='left'))
+            else:
+                base_start = level_start = 0
+            tail = {key: values[base_start:] for key, values in base.items()}
+            self._write(timeframe, level_start, self._resample(tail, timeframe))
+
+        return len(self)
+
+    def _resample(self, columns: Dict, timeframe: str) -> Dict:
+        """Resample store-named columns, dropping buckets with a missing price"""
+        arrays = [np.asarray(columns[key], dtype=dtype) for key, (_, dtype) in PYRAMID_COLUMNS.items()]
+        if len(arrays[0]) == 0:
+            return {key: values for key, values in zip(PYRAMID_COLUMNS, arrays)}
+
+        result, _ = self.resampler.aggregate(*arrays, timeframe)
+        complete = ~(np.isnan(result['opens']) | np.isnan(result['highs'])
+                     | np.isnan(result['lows']) | np.isnan(result['closes']))
+        return {
+            key: np.asarray(result[name][complete], dtype=dtype)
+            for key, (name, dtype) in PYRAMID_COLUMNS.items()
+        }
+
+    def _view(self, level: Optional[str]) -> Dict:
+        size = self._sizes[level]
+        return {key: values[:size] for key, values in self._columns[level].items()}
+
+    def _assign(self, level: Optional[str], columns: Dict):
+        """Adopt column arrays as they are (memory-maps stay memory-mapped until written)"""
+        self._columns[level] = {
+            key: np.asarray(columns[key], dtype=dtype) for key, (_, dtype) in PYRAMID_COLUMNS.items()
+        }
+        self._sizes[level] = len(self._columns[level]['time'])
+
+    def _write(self, level: Optional[str], at: int, columns: Dict):
+        """Overwrite rows from `at` on with new columns, growing the buffers by doubling"""
+        n_new = len(columns['time'])
+        size = at + n_new
+        buffers = self._columns[level]
+        capacity = len(buffers['time'])
+        if size > capacity or not buffers['time'].flags.writeable:
+            capacity = max(16, size * 2) if size > capacity else capacity
+            for key, values in buffers.items():
+                grown = np.empty(capacity, dtype=values.dtype)
+                grown[:at] = values[:at]
+                buffers[key] = grown
+
+        for key, (_, dtype) in PYRAMID_COLUMNS.items():
+            buffers[key][at:size] = np.asarray(columns[key], dtype=dtype)
+        self._sizes[level] = size
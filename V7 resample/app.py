@@ -3,6 +3,7 @@ from flask_cors import CORS
 import json
 import os
 from datetime import datetime
+import numpy as np
 from werkzeug.utils import secure_filename
 
 app = Flask(__name__)
@@ -377,7 +378,7 @@ def resample_data_api():
         
         return jsonify({
             'status': 'success',
-            'data': resampled,
+            'data': {key: np.asarray(values).tolist() for key, values in resampled.items()},
             'timeframe': target_timeframe,
             'message': f'Resampled to {target_timeframe}'
         }), 200
@@ -1,17 +1,35 @@
 """
 Timeframe Resampler - Convert OHLCV data to different timeframes
 Similar to Amibroker's timeframe functionality
+- Works on int64 epoch-second arrays: bucket starts are computed per bar
+  (session lookup with np.searchsorted), OHLCV is aggregated per bucket
+  with ufunc.reduceat (no DataFrame round-trip)
+- Intraday buckets are anchored to the trading session starts (VN
+  derivatives: 09:00-11:30, 13:00-14:45), so a bucket never spans the lunch
+  break and no empty buckets are produced
+- Returns column arrays (call .tolist() only where JSON is produced)
 """
 
-import pandas as pd
+import numpy as np
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence, Tuple
+
+SECONDS_PER_DAY = 86400
+
+# VN derivatives trading sessions (local time of the epoch values)
+VN_DERIVATIVES_SESSIONS = (('09:00', '11:30'), ('13:00', '14:45'))
+
+
+def _seconds_of_day(clock: str) -> int:
+    """'HH:MM' -> seconds after midnight"""
+    parsed = datetime.strptime(clock, '%H:%M')
+    return parsed.hour * 3600 + parsed.minute * 60
 
 
 class TimeframeResampler:
     """Resample OHLCV data to different timeframes"""
 
-    # Mapping of timeframe strings to pandas resample rules
+    # Supported timeframes (and the equivalent pandas resample rules)
     TIMEFRAME_MAP = {
         '1m': '1min',
         '5m': '5min',
@@ -25,14 +43,66 @@ class TimeframeResampler:
         '1M': '1M'
     }
 
-    def __init__(self, data: Dict):
+    # Fixed-length bucket sizes (seconds); '1W' and '1M' are calendar buckets
+    BUCKET_SECONDS = {
+        '1m': 60,
+        '5m': 300,
+        '15m': 900,
+        '30m': 1800,
+        '1H': 3600,
+        '2H': 7200,
+        '4H': 14400,
+        '1D': SECONDS_PER_DAY
+    }
+
+    def __init__(self, data: Dict, sessions: Optional[Sequence[Tuple[str, str]]] = VN_DERIVATIVES_SESSIONS):
         """
         Initialize resampler with OHLCV data
 
         Args:
             data: Dictionary with keys: 'times', 'opens', 'highs', 'lows', 'closes', 'volumes'
+                  (arrays or lists, times in epoch seconds)
+            sessions: ('HH:MM', 'HH:MM') trading sessions intraday buckets are
+                      anchored to; None aligns buckets to midnight
         """
         self.data = data
+        self.session_starts = np.array(sorted(_seconds_of_day(start) for start, _ in sessions or ()),
+                                       dtype=np.int64)
+
+    def bucket_starts(self, times: np.ndarray, timeframe: str) -> np.ndarray:
+        """
+        Start (label) of the bucket of every bar
+
+        Intraday buckets count from the latest session start of the day at
+        or before the bar (midnight before the first session); 1D/1W/1M
+        buckets are labelled like pandas resample (day, week-ending Sunday,
+        month end).
+
+        Args:
+            times: Epoch seconds (int64)
+            timeframe: Key of TIMEFRAME_MAP
+
+        Returns:
+            int64 epoch seconds, non-decreasing for sorted times
+        """
+        if timeframe in ('1W', '1M'):
+            days = times // SECONDS_PER_DAY
+            if timeframe == '1W':
+                # Epoch day 0 is a Thursday; Monday-Sunday weeks labelled by their Sunday
+                weekday = (days + 3) % 7
+                return (days + 6 - weekday) * SECONDS_PER_DAY
+            months = days.astype('datetime64[D]').astype('datetime64[M]')
+            month_end = (months + 1).astype('datetime64[D]') - np.timedelta64(1, 'D')
+            return month_end.astype(np.int64) * SECONDS_PER_DAY
+
+        size = self.BUCKET_SECONDS[timeframe]
+        second_of_day = times % SECONDS_PER_DAY
+        day_start = times - second_of_day
+        anchor = np.zeros_like(times)
+        if size < SECONDS_PER_DAY and len(self.session_starts):
+            session = np.searchsorted(self.session_starts, second_of_day, side='right') - 1
+            anchor = np.where(session >= 0, self.session_starts[np.maximum(session, 0)], 0)
+        return day_start + anchor + (second_of_day - anchor) // size * size
 
     def resample(self, timeframe: str) -> Dict:
         """
@@ -42,50 +112,58 @@ class TimeframeResampler:
             timeframe: Target timeframe (e.g., '1H', '1D', '5m')
 
         Returns:
-            Resampled data dictionary with same structure as input
+            Resampled data dictionary with same keys as input (NumPy arrays)
         """
         # If timeframe not in map or is same as source, return original data
         if timeframe not in self.TIMEFRAME_MAP:
             return self.data
 
-        resample_rule = self.TIMEFRAME_MAP[timeframe]
-
         try:
-            # Convert to pandas DataFrame
-            df = pd.DataFrame({
-                'time': pd.to_datetime(self.data['times'], unit='s'),
-                'open': self.data['opens'],
-                'high': self.data['highs'],
-                'low': self.data['lows'],
-                'close': self.data['closes'],
-                'volume': self.data['volumes']
-            })
-
-            # Set time as index
-            df.set_index('time', inplace=True)
-
-            # Resample using OHLC aggregation rules
-            resampled = df.resample(resample_rule).agg({
-                'open': 'first',    # First value in period
-                'high': 'max',      # Maximum value
-                'low': 'min',       # Minimum value
-                'close': 'last',    # Last value in period
-                'volume': 'sum'     # Sum of volumes
-            })
-
-            # Drop rows with NaN (incomplete periods)
-            resampled.dropna(inplace=True)
-
-            # Convert back to dictionary format
+            times = np.asarray(self.data['times'])
+            opens = np.asarray(self.data['opens'], dtype=np.float64)
+            highs = np.asarray(self.data['highs'], dtype=np.float64)
+            lows = np.asarray(self.data['lows'], dtype=np.float64)
+            closes = np.asarray(self.data['closes'], dtype=np.float64)
+            volumes = np.asarray(self.data['volumes'])
+
+            if len(times) == 0:
+                return {
+                    'times': np.empty(0, dtype=np.int64),
+                    'opens': opens,
+                    'highs': highs,
+                    'lows': lows,
+                    'closes': closes,
+                    'volumes': volumes
+                }
+
+            times = np.floor(times).astype(np.int64) if times.dtype.kind == 'f' else times.astype(np.int64)
+            if np.any(times[1:] < times[:-1]):
+                order = np.argsort(times, kind='stable')
+                times, opens, highs, lows, closes, volumes = (
+                    column[order] for column in (times, opens, highs, lows, closes, volumes))
+
+            # Bucket boundaries: bars where the (sorted) bucket start changes
+            labels = self.bucket_starts(times, timeframe)
+            first = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1]])
+            last = np.append(first[1:], len(labels)) - 1
+            bucket_times = labels[first]
+
+            # OHLCV aggregation (first / max / min / last / sum, NaN skipped by max and min)
             result = {
-                'times': [int(ts.timestamp()) for ts in resampled.index],
-                'opens': resampled['open'].tolist(),
-                'highs': resampled['high'].tolist(),
-                'lows': resampled['low'].tolist(),
-                'closes': resampled['close'].tolist(),
-                'volumes': resampled['volume'].tolist()
+                'times': bucket_times,
+                'opens': opens[first],
+                'highs': np.fmax.reduceat(highs, first),
+                'lows': np.fmin.reduceat(lows, first),
+                'closes': closes[last],
+                'volumes': np.add.reduceat(volumes, first)
             }
 
+            # Drop buckets with a missing price (incomplete periods)
+            complete = ~(np.isnan(result['opens']) | np.isnan(result['highs'])
+                         | np.isnan(result['lows']) | np.isnan(result['closes']))
+            if not complete.all():
+                result = {key: values[complete] for key, values in result.items()}
+
             return result
 
         except Exception as e:
@@ -104,16 +182,18 @@ class TimeframeResampler:
         return timeframe in TimeframeResampler.TIMEFRAME_MAP
 
 
-def resample_data(data: Dict, timeframe: str) -> Dict:
+def resample_data(data: Dict, timeframe: str,
+                  sessions: Optional[Sequence[Tuple[str, str]]] = VN_DERIVATIVES_SESSIONS) -> Dict:
     """
     Convenience function to resample data
 
     Args:
         data: OHLCV data dictionary
         timeframe: Target timeframe
+        sessions: Trading sessions intraday buckets are anchored to (None = midnight)
 
     Returns:
         Resampled data dictionary
     """
-    resampler = TimeframeResampler(data)
+    resampler = TimeframeResampler(data, sessions)
     return resampler.resample(timeframe)